@@ -0,0 +1,221 @@
+import numpy as np
+
+
+class ArbreBarnesHut:
+    """
+    Arbre de Barnes-Hut (quadtree dans le plan, octree si les z diffèrent) sur des
+    sources ponctuelles de positions pos (N, 3) et de charges q (N) : masses pour la
+    gravitation, charges électriques de signes quelconques.
+
+    Construction vectorisée, en O(N log N) : les sources sont triées par code de
+    Morton (bits des coordonnées entrelacés), si bien que chaque nœud de l'arbre est
+    une suite contiguë de sources, celles qui partagent le même préfixe de code. Les
+    nœuds sont créés niveau par niveau ; un nœud d'au plus `feuille` sources n'est
+    plus divisé. Charge et centre de charge de chaque nœud viennent de sommes
+    cumulées, séparément pour les charges positives et négatives (le centre d'une
+    charge totale presque nulle n'aurait pas de sens).
+    """
+
+    PROFONDEUR = 21             # Niveaux au plus (coordonnées entières sur 21 bits)
+
+    def __init__(self, pos, charges, feuille=8):
+        pos = np.asarray(pos, dtype=np.float64).reshape(-1, 3)
+        charges = np.asarray(charges, dtype=np.float64)
+        n = len(pos)
+        if n == 0:
+            raise ValueError("arbre sans source")
+        if feuille < 1:
+            raise ValueError("une feuille contient au moins une source")
+        d = self.dim = 3 if np.ptp(pos[:, 2]) > 0 else 2
+        L = self.PROFONDEUR
+
+        # Cube englobant et coordonnées entières (0 .. 2^L - 1)
+        bas = pos.min(axis=0)
+        cote = float(np.ptp(pos, axis=0).max()) or 1.0
+        cote *= 1 + 1e-9                                   # Les points du bord restent dedans
+        cases = np.minimum(((pos - bas) * ((1 << L) / cote)).astype(np.int64), (1 << L) - 1)
+
+        # Codes de Morton, puis tri
+        cle = np.zeros(n, dtype=np.int64)
+        for b in range(L):
+            for k in range(d):
+                cle |= ((cases[:, k] >> b) & 1) << (d * b + k)
+        ordre = np.argsort(cle, kind='stable')
+        self.ordre = ordre                                 # Indice d'origine de chaque source triée
+        self.pos = pos[ordre]
+        self.charges = charges[ordre]
+        cle, cases = cle[ordre], cases[ordre]
+
+        # Nœuds, niveau par niveau (la racine contient toutes les sources)
+        debut, fin, niveau, enfants = [np.array([0])], [np.array([n])], [np.array([0])], []
+        total = 1                                          # Nœuds déjà créés
+        ids, ad_debut, ad_fin = np.array([0]), debut[0], fin[0]
+        for l in range(1, L + 1):
+            grand = ad_fin - ad_debut > feuille            # Nœuds à diviser
+            ids, ad_debut, ad_fin = ids[grand], ad_debut[grand], ad_fin[grand]
+            if not len(ids):
+                break
+            # Sources de ces nœuds, dans l'ordre trié : un enfant par préfixe de niveau l
+            compte = ad_fin - ad_debut
+            idx = np.repeat(ad_debut, compte) + _rangs(compte)
+            parent = np.repeat(np.arange(len(ids)), compte)
+            prefixe = cle[idx] >> (d * (L - l))
+            coupe = np.flatnonzero((np.diff(prefixe) != 0) | (np.diff(parent) != 0)) + 1
+            premiers = np.concatenate(([0], coupe))
+            dbt = idx[premiers]
+            fn = idx[np.concatenate((coupe - 1, [len(idx) - 1]))] + 1
+            par = parent[premiers]
+            k = len(dbt)
+            nouveaux = total + np.arange(k)
+            # Enfants de chaque nœud divisé : contigus, dans l'ordre des nœuds
+            enfants.append((ids, nouveaux[np.searchsorted(par, np.arange(len(ids)))],
+                            np.bincount(par, minlength=len(ids))))
+            debut.append(dbt)
+            fin.append(fn)
+            niveau.append(np.full(k, l))
+            total += k
+            ids, ad_debut, ad_fin = nouveaux, dbt, fn
+
+        self.debut = np.concatenate(debut)
+        self.fin = np.concatenate(fin)
+        self.niveau = np.concatenate(niveau)
+        self.premier = np.zeros(total, dtype=np.int64)     # Premier enfant de chaque nœud
+        self.nombre = np.zeros(total, dtype=np.int64)      # Nombre d'enfants (0 : feuille)
+        for parents, p, c in enfants:
+            self.premier[parents] = p
+            self.nombre[parents] = c
+
+        # Taille et centre géométrique des nœuds
+        self.taille = cote / (1 << self.niveau).astype(np.float64)
+        milieu = bas + ((cases[self.debut] >> (L - self.niveau)[:, None]) + 0.5) * self.taille[:, None]
+        if d == 2:
+            milieu[:, 2] = bas[2]
+
+        # Moments : charge et centre de charge, un jeu par signe présent
+        self.moments = []
+        ecart = np.zeros(total)
+        for signe in (self.charges > 0, self.charges < 0):
+            if not signe.any():
+                continue
+            q = np.where(signe, self.charges, 0.0)
+            cq = np.concatenate(([0.0], np.cumsum(q)))
+            cqx = np.vstack((np.zeros(3), np.cumsum(self.pos * q[:, None], axis=0)))
+            Q = cq[self.fin] - cq[self.debut]
+            plein = Q != 0
+            C = milieu.copy()
+            C[plein] = (cqx[self.fin] - cqx[self.debut])[plein] / Q[plein, None]
+            ecart = np.maximum(ecart, np.sqrt(((C - milieu) ** 2).sum(axis=1)))
+            self.moments.append((Q, C))
+        # Point de référence du critère d'ouverture, et distance de ce point aux centres de charge
+        self.reference = self.moments[0][1] if len(self.moments) == 1 else milieu
+        self.ecart = ecart
+
+    def __len__(self):
+        return len(self.debut)
+
+    def champ(self, theta=0.5, softening=0.0, tranche=4096):
+        """
+        Champ en chaque source, dans l'ordre d'origine (N, 3) : somme sur les autres
+        sources j des q_j (x_j - x) / (r² + softening²)^(3/2) (à multiplier par la
+        constante du couplage et la charge de la source).
+
+        Parcours par groupes : les sources d'une même feuille descendent l'arbre
+        ensemble. Un nœud agit en bloc sur le groupe (par ses charges placées en leurs
+        centres) si, depuis la sphère englobant le groupe, il est à plus de
+        taille / theta + écart (écart : distance entre centres de charge et point de
+        référence du nœud) ; sinon il est ouvert : ses enfants, ou ses sources une à
+        une pour une feuille. Les groupes sont traités par tranches d'environ
+        `tranche` sources, pour borner la mémoire.
+        """
+        if theta <= 0:
+            raise ValueError("l'angle d'ouverture theta doit être positif")
+        n, d = len(self.pos), self.dim
+        X = [np.ascontiguousarray(self.pos[:, k]) for k in range(d)]
+        moments = [(Q, [np.ascontiguousarray(C[:, k]) for k in range(d)]) for Q, C in self.moments]
+        eps2 = softening * softening
+        seuil = self.taille / theta + self.ecart
+        feuille = self.nombre == 0
+
+        # Groupes : les feuilles, qui partagent les sources triées en suites contiguës
+        g_debut = np.sort(self.debut[feuille])
+        g_compte = np.diff(np.append(g_debut, n))
+        bas = np.minimum.reduceat(self.pos, g_debut)
+        haut = np.maximum.reduceat(self.pos, g_debut)
+        g_centre = (bas + haut) / 2
+        g_rayon = np.sqrt(((haut - bas) ** 2).sum(axis=1)) / 2
+        f_compte = self.fin - self.debut
+
+        out = np.zeros((n, 3))
+        coupes = np.unique(np.append(np.searchsorted(g_debut, np.arange(0, n, tranche)), len(g_debut)))
+        for ga, gb in zip(coupes[:-1], coupes[1:]):
+            a = g_debut[ga]
+            b = g_debut[gb] if gb < len(g_debut) else n
+            local = [np.zeros(b - a) for _ in range(d)]
+
+            # Descente : couples (groupe, nœud) lointains, et (groupe, feuille) proches
+            g = np.arange(ga, gb)
+            nd = np.zeros(len(g), dtype=np.int64)
+            loin_g, loin_n, pres_g, pres_n = [], [], [], []
+            while len(g):
+                dv = self.reference[nd] - g_centre[g]
+                r = np.sqrt(np.einsum('ij,ij->i', dv, dv)) - g_rayon[g]
+                bloc = r > seuil[nd]
+                loin_g.append(g[bloc])
+                loin_n.append(nd[bloc])
+                ouvert = ~bloc
+                f = ouvert & feuille[nd]
+                pres_g.append(g[f])
+                pres_n.append(nd[f])
+                o = ouvert & ~feuille[nd]
+                g, nd = g[o], nd[o]
+                compte = self.nombre[nd]
+                g = np.repeat(g, compte)
+                nd = np.repeat(self.premier[nd], compte) + _rangs(compte)
+
+            # Nœuds lointains : chaque source du groupe, pour chaque moment du nœud
+            g, nd = np.concatenate(loin_g), np.concatenate(loin_n)
+            for Q, C in moments:
+                garde = Q[nd] != 0
+                gq, nq = (g, nd) if garde.all() else (g[garde], nd[garde])
+                compte = g_compte[gq]
+                i = np.repeat(g_debut[gq], compte) + _rangs(compte)
+                _ajouter(local, i - a, [np.repeat(C[k][nq], compte) - X[k][i] for k in range(d)],
+                         np.repeat(Q[nq], compte), eps2)
+
+            # Feuilles proches : couples de sources (i, j), i != j
+            g, nd = np.concatenate(pres_g), np.concatenate(pres_n)
+            compte = g_compte[g]
+            i = np.repeat(g_debut[g], compte) + _rangs(compte)
+            nd = np.repeat(nd, compte)
+            compte = f_compte[nd]
+            j = np.repeat(self.debut[nd], compte) + _rangs(compte)
+            i = np.repeat(i, compte)
+            garde = i != j
+            i, j = i[garde], j[garde]
+            _ajouter(local, i - a, [X[k][j] - X[k][i] for k in range(d)], self.charges[j], eps2)
+
+            for k in range(d):
+                out[a:b, k] = local[k]
+
+        champ = np.empty_like(out)
+        champ[self.ordre] = out
+        return champ
+
+
+def _rangs(compte):
+    """Rang de chaque élément dans son bloc, pour des blocs de tailles `compte` mis bout à bout"""
+    return np.arange(int(compte.sum())) - np.repeat(np.cumsum(compte) - compte, compte)
+
+
+def _ajouter(local, i, dv, q, eps2):
+    """Ajoute à local[k][i] les termes q dv[k] / (r² + eps2)^(3/2) (termes de r nul ignorés)"""
+    r2 = dv[0] * dv[0] + eps2
+    for c in dv[1:]:
+        r2 += c * c
+    ok = r2 > 0
+    if not ok.all():
+        i, q, r2 = i[ok], q[ok], r2[ok]
+        dv = [c[ok] for c in dv]
+    w = q / (r2 * np.sqrt(r2))
+    for k, c in enumerate(dv):
+        local[k] += np.bincount(i, c * w, minlength=len(local[k]))
@@ -0,0 +1,107 @@
+import sys
+import time
+from itertools import product
+from math import ceil
+
+
+def grille(param_grid):
+    """
+    Liste des jeux de paramètres d'un balayage :
+    - dict nom -> valeurs : produit cartésien, dans l'ordre des clés puis des valeurs ;
+    - liste de dicts : utilisée telle quelle.
+    """
+    if isinstance(param_grid, dict):
+        noms = list(param_grid)
+        return [dict(zip(noms, valeurs)) for valeurs in product(*(param_grid[n] for n in noms))]
+    return [dict(p) for p in param_grid]
+
+
+class Echec:
+    """
+    Case du résultat d'une tâche arrêtée par le délai de sweep (timeout) : ni réduction
+    ni exception, mais un marqueur explicite (paramètres du scénario et raison).
+    """
+
+    def __init__(self, params, raison):
+        self.params = params
+        self.raison = raison
+
+    def __repr__(self):
+        return 'Echec(%r, %r)' % (self.params, self.raison)
+
+
+def _executer(build_fn, params, duration, collect, timeout):
+    """Un scénario (dans un processus du pool) : construit, simule, ne renvoie que la réduction"""
+    debut = time.perf_counter()
+    univers = build_fn(**params)
+    n = ceil(duration / univers.step - 1e-9)
+    if timeout is None:
+        univers.simulateSteps(n)
+        return collect(univers)
+    # Simulation par tranches pour vérifier le temps écoulé (délai par tâche) : la taille
+    # des tranches suit la vitesse mesurée, pour un contrôle environ tous les 1/20 du
+    # délai et au plus tard à son échéance
+    tranche = 1
+    while n > 0:
+        m = min(n, tranche)
+        t = time.perf_counter()
+        univers.simulateSteps(m)
+        n -= m
+        maintenant = time.perf_counter()
+        reste = timeout - (maintenant - debut)
+        if reste < 0:
+            return Echec(params, 'délai de %g s dépassé' % timeout)
+        duree = maintenant - t
+        cible = min(timeout / 20, reste)
+        tranche = 2 * m if duree <= 0 else max(1, min(2 * m, int(m * cible / duree)))
+    return collect(univers)
+
+
+def _afficher(fait, total):
+    print('\rbalayage : %d/%d' % (fait, total), end='\n' if fait == total else '', file=sys.stderr, flush=True)
+
+
+def sweep(build_fn, param_grid, duration, collect, workers=None, timeout=None, progress=None):
+    """
+    Exécute un scénario par jeu de paramètres, en parallèle sur un pool de processus.
+
+    - build_fn(**params) construit un Univers ; il est simulé pendant `duration` secondes ;
+    - collect(univers) renvoie la réduction utile (distance finale, Omega...) : seule
+      cette valeur revient du processus, pas l'univers ;
+    - param_grid : voir grille ;
+    - workers : nombre de processus (None : un par cœur ; 1 : exécution dans ce processus) ;
+    - timeout : durée maximale (secondes, temps réel) d'une tâche ; une tâche trop longue
+      est arrêtée et sa case contient un marqueur Echec (voir cette classe) ;
+    - progress : True pour afficher l'avancement, ou fonction (faites, total).
+
+    Renvoie la liste des réductions dans l'ordre de la grille, quel que soit l'ordre
+    de fin des tâches. build_fn et collect doivent être des fonctions de module
+    (transmises aux processus par pickle). Une exception d'une tâche est relancée.
+    """
+    jeux = grille(param_grid)
+    total = len(jeux)
+    if progress is True:
+        progress = _afficher
+    resultats = [None] * total
+
+    if workers == 1:
+        for i, params in enumerate(jeux):
+            resultats[i] = _executer(build_fn, params, duration, collect, timeout)
+            if progress:
+                progress(i + 1, total)
+        return resultats
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        taches = {pool.submit(_executer, build_fn, params, duration, collect, timeout): i
+                  for i, params in enumerate(jeux)}
+        try:
+            for fait, tache in enumerate(as_completed(taches), 1):
+                resultats[taches[tache]] = tache.result()
+                if progress:
+                    progress(fait, total)
+        except BaseException:
+            for tache in taches:
+                tache.cancel()                    # Tâches pas encore démarrées
+            raise
+    return resultats
@@ -1,7 +1,6 @@
-import numpy as np
-from vector3D import Vector3D as V3D
-import matplotlib.pyplot as plt
-from Forces import *
+from math import cos, sin
+from vector3D import Vector3D as V3D, ZERO
+from Historique import Historique, HistoriqueV3D
 
 class Barre:
     """
@@ -9,31 +8,34 @@ class Barre:
     pouvant se déplacer et tourner librement sauf si fixée.
     """
 
-    def __init__(self, mass=1, p0=V3D(), v0=V3D(), a0=V3D(), t0=0.0, o0=0.0, alpha0=0.0, long=10, fix=False, name="barre", color='red'):
+    def __init__(self, mass=1, p0=ZERO, v0=ZERO, a0=ZERO, t0=0.0, o0=0.0, alpha0=0.0, long=10, fix=False, name="barre", color='red', history=None):
         # Paramètres physiques
         self.mass = mass              # kg
         self.L = long                 # Longueur de la barre (unités simulation)
         self.name = name
         self.color = color
         self.fix = fix                # Si True, la barre est immobile
+        self.history = history        # Politique d'historique (None : celle de l'univers)
 
         # Initialisation de la position centrale
         angle = t0
-        dir_barre = V3D(np.cos(angle), np.sin(angle), 0)
-        p_centre = p0 + (self.L / 2) * dir_barre
-        self.position = [p_centre]
+        p_centre = V3D(p0.x + (self.L / 2) * cos(angle), p0.y + (self.L / 2) * sin(angle), p0.z)
+        self.position = HistoriqueV3D(p_centre, policy=history)
 
-        # État de translation (vecteurs par pas de temps)
-        self.speed = [v0]            # Vitesse (m/s)
-        self.acceleration = [a0]     # Accélération (m/s²)
+        # État de translation (historiques vectoriels, un élément par pas de temps)
+        self.speed = HistoriqueV3D(v0, policy=history)         # Vitesse (m/s)
+        self.acceleration = HistoriqueV3D(a0, policy=history)  # Accélération (m/s²)
 
-        # État de rotation (scalaires par pas de temps)
-        self.theta = [t0]            # Orientation (rad)
-        self.omega = [o0]            # Vitesse angulaire (rad/s)
-        self.alpha = [alpha0]        # Accélération angulaire (rad/s²)
+        # État de rotation (historiques scalaires, un élément par pas de temps)
+        self.theta = Historique(t0, policy=history)            # Orientation (rad)
+        self.omega = Historique(o0, policy=history)            # Vitesse angulaire (rad/s)
+        self.alpha = Historique(alpha0, policy=history)        # Accélération angulaire (rad/s²)
 
-        # Forces externes appliquées : liste de tuples (force, point)
-        self.forces = []
+        # Forces externes appliquées, accumulées en place :
+        # - forces : résultante
+        # - forces_pts : somme des point * force (le moment en découle, linéaire en point)
+        self.forces = V3D()
+        self.forces_pts = V3D()
 
     def applyForce(self, force, point):
         """
@@ -43,7 +45,19 @@ class Barre:
             raise ValueError("force doit être un V3D")
         if not -1 <= point <= 1:
             raise ValueError("point doit être dans [-1, 1]")
-        self.forces.append((force, point))
+        self.forces += force
+        if point:
+            self.forces_pts.add_scaled(force, point)
+
+    def applyScaledForce(self, force, s, point):
+        """
+        Applique s * force au point relatif donné, sans créer de vecteur temporaire.
+        """
+        if not -1 <= point <= 1:
+            raise ValueError("point doit être dans [-1, 1]")
+        self.forces.add_scaled(force, s)
+        if point:
+            self.forces_pts.add_scaled(force, s * point)
 
     def getInertia(self):
         """
@@ -55,20 +69,56 @@ class Barre:
         """
         Renvoie la position réelle d'un point sur la barre donné par alpha ∈ [-1, 1].
         """
-        return self.position[-1] + V3D(alpha * self.L / 2, 0).rotZ(self.theta[-1])
+        r = alpha * self.L / 2
+        theta = self.theta.last
+        pos = self.position.last
+        return V3D(pos.x + r * cos(theta), pos.y + r * sin(theta), pos.z)
 
     # Accesseurs (état courant)
     def getPosition(self): 
-        return self.position[-1]
+        return self.position.last
     
     def getSpeed(self): 
-        return self.speed[-1]
+        return self.speed.last
     
     def getAngle(self): 
-        return self.theta[-1]
+        return self.theta.last
     
     def getAngularSpeed(self): 
-        return self.omega[-1]
+        return self.omega.last
+
+    # Trajectoires complètes sous forme de tableaux NumPy, sans copie
+    @property
+    def positions(self):
+        return self.position.array
+
+    @property
+    def speeds(self):
+        return self.speed.array
+
+    @property
+    def accelerations(self):
+        return self.acceleration.array
+
+    @property
+    def thetas(self):
+        return self.theta.array
+
+    @property
+    def omegas(self):
+        return self.omega.array
+
+    @property
+    def alphas(self):
+        return self.alpha.array
+
+    def setHistory(self, policy):
+        """
+        Change la politique d'historique : 'all', 'none', 'every=N' ou 'last=K'.
+        """
+        self.history = policy
+        for h in (self.position, self.speed, self.acceleration, self.theta, self.omega, self.alpha):
+            h.setPolicy(policy)
 
     def simulate(self, step):
         """
@@ -84,29 +134,28 @@ class Barre:
 
         if self.fix:
             # Si la barre est fixée : aucun mouvement
-            self.acceleration.append(V3D())
-            self.speed.append(V3D())
-            self.position.append(self.position[-1])
+            self.acceleration.append(ZERO)
+            self.speed.append(ZERO)
+            self.position.append(self.position.last)
             self.alpha.append(0.0)
             self.omega.append(0.0)
-            self.theta.append(self.theta[-1])
+            self.theta.append(self.theta.last)
+            self.forces.set(0, 0, 0)
+            self.forces_pts.set(0, 0, 0)
             return
 
-        total_force = V3D()
-        total_moment = 0.0
-        dir_barre = V3D(np.cos(self.theta[-1]), np.sin(self.theta[-1]), 0)
-
-        # Somme des forces et moments
-        for (f, p_rel) in self.forces:
-            total_force += f
-            r = (p_rel * self.L / 2) * dir_barre
-            moment = r.x * f.y - r.y * f.x  # produit vectoriel 2D
-            total_moment += moment
+        # Moment résultant : somme des r x f avec r = (point * L/2) * dir_barre
+        theta_old = self.theta.last
+        fp = self.forces_pts
+        total_moment = (self.L / 2) * (cos(theta_old) * fp.y - sin(theta_old) * fp.x)
 
         # Translation : position et vitesse linéaire
-        a = total_force * (1 / self.mass)
-        v = self.speed[-1] + a * step
-        p = self.position[-1] + self.speed[-1] * step + 0.5 * a * step**2
+        v_old = self.speed.last
+        a = self.forces * (1 / self.mass)
+        v = v_old.copy().add_scaled(a, step)
+        p = self.position.last.copy()
+        p.add_scaled(v_old, step)
+        p.add_scaled(a, 0.5 * step**2)
 
         self.acceleration.append(a)
         self.speed.append(v)
@@ -114,24 +163,25 @@ class Barre:
 
         # Rotation : angle et vitesse angulaire
         alpha = total_moment / self.getInertia()
-        omega = self.omega[-1] + alpha * step
-        theta = self.theta[-1] + self.omega[-1] * step + 0.5 * alpha * step**2
+        omega_old = self.omega.last
+        omega = omega_old + alpha * step
+        theta = theta_old + omega_old * step + 0.5 * alpha * step**2
 
         self.alpha.append(alpha)
         self.omega.append(omega)
         self.theta.append(theta)
 
-        # Nettoyage des forces pour le prochain pas
-        self.forces = []
+        # Remise à zéro en place des accumulateurs pour le prochain pas
+        self.forces.set(0, 0, 0)
+        self.forces_pts.set(0, 0, 0)
 
     def plot(self):
         """
         Trace la trajectoire du centre de la barre (matplotlib).
         """
         from pylab import plot
-        X = [pos.x for pos in self.position]
-        Y = [pos.y for pos in self.position]
-        return plot(X, Y, color=self.color, label=self.name) + plot(X[-1], Y[-1], 'o', color=self.color)
+        P = self.positions
+        return plot(P[:, 0], P[:, 1], color=self.color, label=self.name) + plot(P[-1, 0], P[-1, 1], 'o', color=self.color)
 
     def gameDraw(self, scale, screen):
         """
@@ -142,24 +192,24 @@ class Barre:
             return
 
         angle = self.getAngle()
-        dir_barre = V3D(np.cos(angle), np.sin(angle), 0)
-        
-        # Calcul des extrémités
-        pos_left = self.getPosition() - (self.L / 2) * dir_barre
-        pos_right = self.getPosition() + (self.L / 2) * dir_barre
+        pos, v = self.getPosition(), self.getSpeed()
+        hx, hy = (self.L / 2) * cos(angle), (self.L / 2) * sin(angle)   # Demi-barre
 
-        x1 = int(pos_left.x * scale)
-        y1 = int(pos_left.y * scale)
-        x2 = int(pos_right.x * scale)
-        y2 = int(pos_right.y * scale)
+        # Calcul des extrémités
+        x1 = int((pos.x - hx) * scale)
+        y1 = int((pos.y - hy) * scale)
+        x2 = int((pos.x + hx) * scale)
+        y2 = int((pos.y + hy) * scale)
 
         # Vecteur vitesse au centre
-        VX = int(scale * self.getSpeed().x)
-        VY = int(scale * self.getSpeed().y)
-        Xc = int(self.getPosition().x * scale)
-        Yc = int(self.getPosition().y * scale)
-
-        # Dessin
-        pygame.draw.line(screen, pygame.Color(self.color), (x1, y1), (x2, y2), width=4)
-        pygame.draw.circle(screen, pygame.Color(self.color), (Xc, Yc), 5)
-        pygame.draw.line(screen, 'blue', (Xc, Yc), (Xc + VX, Yc + VY), 3)
+        VX = int(scale * v.x)
+        VY = int(scale * v.y)
+        Xc = int(pos.x * scale)
+        Yc = int(pos.y * scale)
+
+        # Dessin (renvoie la zone dessinée, voir Rendu ; Rendu.dessinerEtat dessine
+        # de même toutes les barres en un lot)
+        zone = pygame.draw.line(screen, pygame.Color(self.color), (x1, y1), (x2, y2), width=4)
+        zone.union_ip(pygame.draw.circle(screen, pygame.Color(self.color), (Xc, Yc), 5))
+        zone.union_ip(pygame.draw.line(screen, 'blue', (Xc, Yc), (Xc + VX, Yc + VY), 3))
+        return zone
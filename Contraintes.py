@@ -0,0 +1,514 @@
+import numpy as np
+from math import cos, sin, sqrt
+from vector3D import Vector3D as V3D
+from GrilleSpatiale import GrilleSpatiale
+
+
+class Contrainte:
+    """
+    Liaison rigide entre deux entités, imposée exactement (et non par un ressort raide).
+
+    Après le pas non contraint, l'univers projette l'état sur les liaisons (voir resoudre) :
+    - positions : corrections successives (Gauss-Seidel, à la SHAKE) jusqu'à la tolérance ;
+    - vitesses : la correction de position divisée par le pas, puis suppression de la
+      vitesse relative le long des directions contraintes (à la RATTLE).
+    La raideur des liaisons ne limite donc plus le pas de temps.
+
+    Les classes filles définissent `lignes(d)` : les contraintes scalaires (n, écart)
+    sur d = point1 - point0, où n est une direction (tuple de 3 flottants) et
+    l'écart vaut 0 quand la liaison est respectée.
+
+    Une extrémité absente de l'univers (point d'ancrage d'un Pivot jamais ajouté par
+    addEntity) est un point fixe : sa position est lue sur l'entité (getPosition) et
+    elle n'est jamais corrigée (masse infinie).
+    """
+
+    def __init__(self, e0, e1, point0=0.0, point1=0.0, name='contrainte', active=True):
+        self.e0 = e0                # Première entité (particule ou barre)
+        self.e1 = e1                # Seconde entité
+        self.point0 = point0        # Point d'attache sur e0 si c'est une barre (entre -1 et 1)
+        self.point1 = point1        # Point d'attache sur e1
+        self.name = name
+        self.active = active
+
+    def __str__(self):
+        return f"{type(self).__name__} ({self.name})"
+
+    def __repr__(self):
+        return str(self)
+
+    def getSubjects(self):
+        return (self.e0, self.e1)
+
+    def getPoints(self):
+        return (self.point0, self.point1)
+
+    def lignes(self, d):
+        raise NotImplementedError
+
+
+class ContrainteDistance(Contrainte):
+    """
+    Distance constante l0 entre deux points (liaison rigide, pivot décalé).
+    Avec l0 nul, les deux points sont confondus (voir ContraintePivot).
+    """
+
+    def __init__(self, e0, e1, l0=0.0, point0=0.0, point1=0.0, name='distance', active=True):
+        super().__init__(e0, e1, point0, point1, name=name, active=active)
+        self.l0 = l0
+
+    def lignes(self, d):
+        dx, dy, dz = d
+        if self.l0 <= 1e-12:
+            return [((1.0, 0.0, 0.0), dx), ((0.0, 1.0, 0.0), dy), ((0.0, 0.0, 1.0), dz)]
+        m = sqrt(dx * dx + dy * dy + dz * dz)
+        if m == 0:
+            return []                           # Direction indéfinie : rien à corriger
+        return [((dx / m, dy / m, dz / m), m - self.l0)]
+
+
+class ContraintePivot(ContrainteDistance):
+    """Pivot : les deux points d'attache restent confondus"""
+
+    def __init__(self, e0, point0, e1, point1, name='pivot', active=True):
+        super().__init__(e0, e1, 0.0, point0, point1, name=name, active=active)
+
+
+class ContrainteGlissiere(Contrainte):
+    """
+    Glissière : le déplacement relatif se fait le long de `axis` (repère global) ;
+    la composante perpendiculaire de d garde sa valeur initiale.
+    """
+
+    def __init__(self, e0, e1, axis, d0, point0=0.0, point1=0.0, name='glissiere', active=True):
+        super().__init__(e0, e1, point0, point1, name=name, active=active)
+        a = np.array([axis.x, axis.y, axis.z], dtype=np.float64)
+        if not np.linalg.norm(a):
+            raise ValueError("l'axe de la glissière doit être non nul")
+        a /= np.linalg.norm(a)
+        # Base orthonormée du plan perpendiculaire à l'axe
+        u = np.cross(a, (1.0, 0.0, 0.0) if abs(a[0]) < 0.9 else (0.0, 1.0, 0.0))
+        u /= np.linalg.norm(u)
+        w = np.cross(a, u)
+        d0 = np.array([d0.x, d0.y, d0.z], dtype=np.float64)
+        self._normales = [(tuple(n.tolist()), float(n @ d0)) for n in (u, w)]
+
+    def lignes(self, d):
+        dx, dy, dz = d
+        return [(n, n[0] * dx + n[1] * dy + n[2] * dz - c) for n, c in self._normales]
+
+
+class Planes:
+    """
+    Parois planes pour les particules (disques de rayon `radius`, ou de leur attribut
+    `radius`), imposées après chaque pas comme les liaisons (voir resoudre), en une
+    passe vectorisée sur toute la population.
+
+    Une particule qui a franchi une paroi y est renvoyée par réflexion : sa position
+    est symétrisée (le dépassement devient restitution * dépassement du bon côté) et
+    sa vitesse normale sortante devient -restitution * v_n ; la vitesse tangentielle
+    est réduite d'au plus friction * (1 + restitution) * |v_n| (frottement de Coulomb).
+    Le rebond ne dépend pas du pas de temps (contrairement à Bounce_x et Bounce_y).
+
+    - planes : liste de couples (point, normale) (V3D), la normale dirigée vers le côté permis
+    - particles : particules concernées (None : toutes celles de l'univers)
+
+    S'ajoute par Univers.addGenerators ou addConstraints.
+    """
+
+    def __init__(self, planes, restitution=1, friction=0, radius=0, particles=None, name='planes', active=True):
+        if not 0 <= restitution <= 1:
+            raise ValueError("la restitution doit être comprise entre 0 et 1")
+        if friction < 0:
+            raise ValueError("le coefficient de frottement doit être positif")
+        self._setPlanes(planes)
+        self.restitution = restitution
+        self.friction = friction
+        self.radius = radius
+        self.particles = None if particles is None else list(particles)
+        self.name = name
+        self.active = active
+        self._cache = (None, None, None)            # (système, indices des particules, rayons)
+
+    def __str__(self):
+        return f"{type(self).__name__} ({self.name})"
+
+    def __repr__(self):
+        return str(self)
+
+    def getSubjects(self):
+        return None if self.particles is None else tuple(self.particles)
+
+    def _setPlanes(self, planes):
+        # Points et normales unitaires des parois, en tableaux (P, 3)
+        points, normales = [], []
+        for point, normale in planes:
+            n = np.array([normale.x, normale.y, normale.z], dtype=np.float64)
+            if not np.linalg.norm(n):
+                raise ValueError("la normale d'une paroi doit être non nulle")
+            points.append((point.x, point.y, point.z))
+            normales.append(n / np.linalg.norm(n))
+        self.points = np.array(points, dtype=np.float64).reshape(-1, 3)
+        self.normales = np.array(normales, dtype=np.float64).reshape(-1, 3)
+        self._decalages = np.einsum('ij,ij->i', self.points, self.normales)   # n.a de chaque paroi
+
+    def _viser(self, systeme):
+        # Indices (dans les particules du système) et rayons des particules concernées
+        idx = _particulesVisees(self, systeme)
+        idx = idx[~systeme.fix[3 * idx]]           # Les particules fixes ne rebondissent pas
+        P = systeme.particules
+        rayons = np.array([getattr(P[i], 'radius', self.radius) for i in idx.tolist()], dtype=np.float64)
+        lignes = idx
+        if len(idx) and idx[-1] - idx[0] == len(idx) - 1:
+            lignes = slice(int(idx[0]), int(idx[-1]) + 1)   # Indices consécutifs : vue sans copie
+        self._cache = (systeme, (idx, lignes), rayons)
+
+    def projeter(self, systeme, step):
+        """Renvoie dans le domaine les particules sorties pendant le dernier pas"""
+        if self._cache[0] is not systeme:
+            self._viser(systeme)
+        _, (idx, lignes), rayons = self._cache
+        if not len(idx):
+            return
+        soa = hasattr(systeme, 'p_pos')
+        if soa:                                       # Moteur SoA : tableaux modifiés en place
+            pos, vel = systeme.p_pos, systeme.p_vel
+        else:
+            q, v = systeme.getState()
+            pos = q[:systeme.i_barres].reshape(-1, 3)     # Vues sur q et v
+            vel = v[:systeme.i_barres].reshape(-1, 3)
+
+        # Distances signées à toutes les parois en un produit (< 0 : dehors) ;
+        # seules les particules sorties d'au moins une paroi sont traitées
+        D = pos[lignes] @ self.normales.T - self._decalages - rayons[:, None]
+        k = np.flatnonzero((D < 0).any(axis=1))
+        if not len(k):
+            return
+        sortis = idx[k]
+        P, V, r = pos[sortis], vel[sortis], rayons[k]
+        e = self.restitution
+        for a, n in zip(self.points, self.normales):
+            s = (P - a) @ n - r
+            dehors = s < 0
+            if not dehors.any():
+                continue
+            P[dehors] -= np.outer((1 + e) * s[dehors], n)
+            Vd = V[dehors]
+            vn = Vd @ n
+            sort = vn < 0
+            if self.friction:
+                vt = Vd - np.outer(vn, n)
+                nt = np.sqrt(np.einsum('ij,ij->i', vt, vt))
+                reduction = np.minimum(self.friction * (1 + e) * np.maximum(-vn, 0.0), nt)
+                garde = sort & (nt > 0)
+                Vd[garde] -= vt[garde] * (reduction[garde] / nt[garde])[:, None]
+            Vd[sort] -= np.outer((1 + e) * vn[sort], n)
+            V[dehors] = Vd
+        pos[sortis] = P
+        vel[sortis] = V
+        if soa:
+            systeme.amendParticules()
+        else:
+            systeme.amend(q, v)
+
+
+class BoundaryBox(Planes):
+    """
+    Les parois du domaine de l'univers : x = 0, x = largeur, y = 0, y = hauteur
+    (et z = 0, z = profondeur si `dimensions` a trois composantes).
+    dimensions=None : celles de l'univers (fixées par Univers.addGenerators).
+    """
+
+    def __init__(self, dimensions=None, restitution=1, friction=0, radius=0, particles=None,
+                 name='boundary', active=True):
+        super().__init__([], restitution, friction, radius, particles, name, active)
+        self.dimensions = None
+        if dimensions is not None:
+            self.setDimensions(dimensions)
+
+    def setDimensions(self, dimensions):
+        """Place les parois sur les bords du domaine `dimensions`"""
+        planes = []
+        for k, L in enumerate(dimensions):
+            axe = [0.0, 0.0, 0.0]
+            axe[k] = 1.0
+            fin = [0.0, 0.0, 0.0]
+            fin[k] = L
+            planes.append((V3D(0, 0, 0), V3D(*axe)))
+            planes.append((V3D(*fin), V3D(*(-c for c in axe))))
+        self._setPlanes(planes)
+        self.dimensions = tuple(dimensions)
+
+    def projeter(self, systeme, step):
+        if self.dimensions is None:
+            raise ValueError("BoundaryBox sans dimensions : l'ajouter à un univers ou passer dimensions=...")
+        super().projeter(systeme, step)
+
+
+class Collisions:
+    """
+    Collisions entre particules, vues comme des disques (sphères) de rayon `radius`
+    (ou de leur attribut `radius` s'il existe), résolues après chaque pas comme les
+    parois (Planes) : une fois par pas accepté, quels que soient le schéma
+    d'intégration et le pas (pas adaptatif compris).
+
+    Phase large : grille uniforme sur le domaine (GrilleSpatiale), refaite à chaque
+    pas ; seuls les couples de cellules voisines sont comparés, en O(N). Phase étroite
+    vectorisée, pour chaque couple qui se recouvre (toutes les collisions d'un pas
+    sont calculées sur le même état) :
+    - choc : impulsion normale qui donne à la vitesse relative normale la valeur
+      -restitution * v_n, et impulsion tangentielle (frottement de Coulomb, au plus
+      friction * impulsion normale) qui freine le glissement ;
+    - recouvrement : les deux particules sont écartées de `correction` fois leur
+      recouvrement, en proportion de l'inverse de leurs masses. Seules les positions
+      changent : la correction ne donne pas d'énergie (tas au repos, particules
+      créées l'une dans l'autre).
+
+    Détection discrète : deux particules qui se traversent en un seul pas ne se voient
+    pas. Avec le pas adaptatif, borner max_step en conséquence.
+
+    - dimensions : domaine (largeur, hauteur) de la grille ; None : celui de l'univers
+      (fixé par Univers.addGenerators)
+    - particles : particules concernées (None : toutes celles de l'univers)
+
+    S'ajoute par Univers.addGenerators ou addConstraints.
+    """
+
+    def __init__(self, radius=1, restitution=1, friction=0, dimensions=None, particles=None, correction=0.2,
+                 name='collisions', active=True):
+        if radius <= 0:
+            raise ValueError("le rayon des particules doit être positif")
+        if not 0 <= restitution <= 1:
+            raise ValueError("la restitution doit être comprise entre 0 et 1")
+        if friction < 0:
+            raise ValueError("le coefficient de frottement doit être positif")
+        if not 0 <= correction <= 1:
+            raise ValueError("la correction doit être comprise entre 0 et 1")
+        self.radius = radius                  # Rayon des particules sans attribut `radius`
+        self.restitution = restitution        # 1 : chocs élastiques, 0 : chocs mous
+        self.friction = friction              # Coefficient de frottement de Coulomb
+        self.correction = correction          # Part du recouvrement corrigée par pas
+        self.particles = None if particles is None else list(particles)
+        self.name = name
+        self.active = active
+        self.dimensions = None
+        self.grille = None
+        if dimensions is not None:
+            self.setDimensions(dimensions)
+        self._cache = (None, None, None)      # (système, indices des particules, (rayons, inverses des masses))
+
+    def __str__(self):
+        return f"{type(self).__name__} ({self.name})"
+
+    def __repr__(self):
+        return str(self)
+
+    def getSubjects(self):
+        return None if self.particles is None else tuple(self.particles)
+
+    def setDimensions(self, dimensions):
+        """Domaine (largeur, hauteur) de la grille"""
+        self.grille = GrilleSpatiale(dimensions)
+        self.dimensions = tuple(dimensions)
+
+    def _viser(self, systeme):
+        # Particules concernées (les fixes comprises : obstacles de masse infinie)
+        idx = _particulesVisees(self, systeme)
+        P = systeme.particules
+        rayons = np.array([getattr(P[i], 'radius', self.radius) for i in idx.tolist()], dtype=np.float64)
+        inv = np.where(systeme.fix[3 * idx], 0.0, 1 / systeme.mass[3 * idx])
+        self._cache = (systeme, idx, (rayons, inv))
+
+    def projeter(self, systeme, step):
+        """Résout les chocs et recouvrements entre particules à la fin du dernier pas"""
+        if self.grille is None:
+            raise ValueError("Collisions sans dimensions : l'ajouter à un univers ou passer dimensions=...")
+        if self._cache[0] is not systeme:
+            self._viser(systeme)
+        _, idx, (rayons, inv) = self._cache
+        if len(idx) < 2:
+            return
+        soa = hasattr(systeme, 'p_pos')
+        if soa:                                       # Moteur SoA : tableaux modifiés en place
+            pos, vel = systeme.p_pos, systeme.p_vel
+        else:
+            q, v = systeme.getState()
+            pos = q[:systeme.i_barres].reshape(-1, 3)     # Vues sur q et v
+            vel = v[:systeme.i_barres].reshape(-1, 3)
+        x, u = pos[idx], vel[idx]
+        if not self._resoudre(x, u, inv, rayons):
+            return
+        pos[idx] = x
+        vel[idx] = u
+        if soa:
+            systeme.amendParticules()
+        else:
+            systeme.amend(q, v)
+
+    def _resoudre(self, x, u, inv, rayons):
+        """
+        Collisions des particules de positions x, vitesses u (N, 3, modifiées en place),
+        inverses de masse inv (0 : particule fixe) et rayons donnés ; False sans contact.
+        """
+        i, j = self.grille.paires(x, 2 * rayons.max())
+        if len(i):
+            # Phase étroite : couples qui se recouvrent, avec au moins une particule mobile
+            d = x[j] - x[i]
+            d2 = np.einsum('ij,ij->i', d, d)
+            contact = rayons[i] + rayons[j]
+            w = inv[i] + inv[j]
+            garde = (d2 < contact * contact) & (d2 > 0) & (w > 0)
+            i, j, d, d2, contact, w = i[garde], j[garde], d[garde], d2[garde], contact[garde], w[garde]
+        if not len(i):
+            return False
+        dist = np.sqrt(d2)
+        n = d / dist[:, None]                 # Normale de i vers j
+
+        # Choc : impulsion normale (sur j ; i reçoit l'opposée)
+        vrel = u[j] - u[i]
+        vn = np.einsum('ij,ij->i', vrel, n)
+        jn = np.maximum(-(1 + self.restitution) * vn, 0.0) / w
+        J = n * jn[:, None]
+
+        # Frottement : impulsion tangentielle bornée par friction * jn
+        if self.friction:
+            vt = vrel - n * vn[:, None]
+            nt = np.sqrt(np.einsum('ij,ij->i', vt, vt))
+            glisse = nt > 0
+            jt = np.minimum(self.friction * jn, nt / w)
+            jt[glisse] /= nt[glisse]
+            J -= vt * jt[:, None]
+
+        # Recouvrement : déplacement (pondéré par les masses) de la part corrigée
+        C = n * (self.correction * (contact - dist) / w)[:, None]
+        N = len(x)
+        for k in range(3):
+            u[:, k] += inv * (np.bincount(j, J[:, k], minlength=N) - np.bincount(i, J[:, k], minlength=N))
+            x[:, k] += inv * (np.bincount(j, C[:, k], minlength=N) - np.bincount(i, C[:, k], minlength=N))
+        return True
+
+
+def _particulesVisees(source, systeme):
+    """Indices, dans les particules du système, des particules visées par une paroi ou des collisions"""
+    if source.particles is None:
+        portee = systeme.portee(source)[0] if hasattr(systeme, 'portee') else slice(None)
+        return np.arange(systeme.i_barres // 3)[portee]
+    idx = []
+    for p in source.particles:
+        try:
+            d = systeme.dofs(p)
+        except KeyError:                        # Pas dans l'univers
+            continue
+        if len(d) == 3:
+            idx.append(d[0] // 3)
+    return np.array(idx, dtype=np.intp)
+
+
+# === Résolution (opère sur l'état généralisé d'un système, voir Integrateurs.py) ===
+
+def _dofs(systeme, e):
+    # Degrés de liberté d'une extrémité, [] si elle est hors du système (point fixe)
+    try:
+        return systeme.dofs(e).tolist()
+    except KeyError:
+        return []
+
+
+def _ancre(e, idx, point, q):
+    """Point d'attache : (position, bras dérivé par rapport à l'angle ou None)"""
+    if not idx:                                 # Hors du système : point fixe
+        p = e.getPosition()
+        if hasattr(e, 'getAngle'):
+            h = point * e.L / 2
+            theta = e.getAngle()
+            return (p.x + h * cos(theta), p.y + h * sin(theta), p.z), None
+        return (p.x, p.y, p.z), None
+    x, y, z = q[idx[0]], q[idx[1]], q[idx[2]]
+    if len(idx) == 3:
+        return (x, y, z), None
+    h = point * e.L / 2
+    theta = q[idx[3]]
+    rx, ry = h * cos(theta), h * sin(theta)
+    return (x + rx, y + ry, z), (-ry, rx)
+
+
+def _jacobien(n, idx, bras, s):
+    # Dérivées de s * n.d par rapport aux degrés de liberté de l'entité (aucun si fixe)
+    if not idx:
+        return []
+    j = [s * n[0], s * n[1], s * n[2]]
+    if bras is not None:
+        j.append(s * (n[0] * bras[0] + n[1] * bras[1]))
+    return j
+
+
+def _lignes(c, i0, i1, q):
+    """Contraintes scalaires de c dans l'état q : (indices0, j0, indices1, j1, écart)"""
+    p0, p1 = c.getPoints()
+    x0, r0 = _ancre(c.e0, i0, p0, q)
+    x1, r1 = _ancre(c.e1, i1, p1, q)
+    d = (x1[0] - x0[0], x1[1] - x0[1], x1[2] - x0[2])
+    for n, ecart in c.lignes(d):
+        yield i0, _jacobien(n, i0, r0, -1.0), i1, _jacobien(n, i1, r1, 1.0), ecart
+
+
+def _corriger(x, inv, i0, j0, i1, j1, valeur):
+    # Correction de masse minimale annulant j0.x[i0] + j1.x[i1] + valeur
+    w = sum(inv[k] * j * j for k, j in zip(i0, j0)) + sum(inv[k] * j * j for k, j in zip(i1, j1))
+    if w == 0:
+        return                                  # Deux extrémités fixes
+    lam = -valeur / w
+    for k, j in zip(i0, j0):
+        x[k] += inv[k] * j * lam
+    for k, j in zip(i1, j1):
+        x[k] += inv[k] * j * lam
+
+
+def resoudre(systeme, contraintes, step, iterations=20, tolerance=1e-9):
+    """
+    Projette l'état courant du système sur les contraintes actives et l'enregistre
+    à la place du dernier pas (systeme.amend), puis renvoie dans le domaine les
+    particules sorties des parois (Planes.projeter). Renvoie le plus grand écart restant.
+    """
+    # Contraintes actives et indices de leurs extrémités dans l'état généralisé
+    actives = [(c, _dofs(systeme, c.e0), _dofs(systeme, c.e1))
+               for c in contraintes if c.active and not hasattr(c, 'projeter')]
+    ecart = _lier(systeme, actives, step, iterations, tolerance) if actives else 0.0
+    for c in contraintes:
+        if c.active and hasattr(c, 'projeter'):
+            c.projeter(systeme, step)
+    return ecart
+
+
+def _lier(systeme, actives, step, iterations, tolerance):
+    # Liaisons à deux extrémités : SHAKE puis RATTLE
+    q, v = systeme.getState()
+    inv = np.where(systeme.fix, 0.0, 1.0 / systeme.mass).tolist()
+    q0 = q
+    q = q.tolist()                              # Listes : accès élément par élément rapides
+
+    # Positions : SHAKE (les directions sont recalculées à chaque passe)
+    ecart = 0.0
+    for _ in range(iterations):
+        ecart = 0.0
+        for c, d0, d1 in actives:
+            for i0, j0, i1, j1, e in _lignes(c, d0, d1, q):
+                ecart = max(ecart, abs(e))
+                _corriger(q, inv, i0, j0, i1, j1, e)
+        if ecart <= tolerance:
+            break
+    v = (v + (np.array(q) - q0) / step).tolist()
+
+    # Vitesses : RATTLE (vitesse relative nulle le long des directions contraintes)
+    for _ in range(iterations):
+        residu = 0.0
+        for c, d0, d1 in actives:
+            for i0, j0, i1, j1, _e in _lignes(c, d0, d1, q):
+                vn = sum(j * v[k] for k, j in zip(i0, j0)) + sum(j * v[k] for k, j in zip(i1, j1))
+                residu = max(residu, abs(vn))
+                _corriger(v, inv, i0, j0, i1, j1, vn)
+        if residu <= tolerance:
+            break
+
+    systeme.amend(np.array(q), np.array(v))
+    return ecart
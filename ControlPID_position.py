@@ -1,4 +1,3 @@
-import pygame
 import numpy as np
 from MoteurCC import MoteurCC
 from vector3D import Vector3D as V3D
@@ -0,0 +1,96 @@
+from Univers_Officiel import Univers
+from SoA import SimulationSoA
+from Balayage import grille
+
+
+class Ensemble:
+    """
+    M variantes d'une même scène (même topologie, paramètres différents) simulées
+    ensemble : chaque pas fait avancer les M membres en un seul pas NumPy.
+
+    build_fn(**params) construit un univers par jeu de paramètres (voir Balayage.grille).
+    Les entités et générateurs des M univers sont réunis dans un univers commun au
+    moteur SoA : les noyaux vectorisés (Force.soaGroup) traitent alors les forces d'une
+    même classe de tous les membres en un appel. Les tableaux d'état ont un axe de lot
+    en tête : state('p_pos') est (M, N, 3), history('p_pos') est (T, M, N, 3).
+
+    Les univers membres restent lisibles (leurs entités sont celles de l'univers commun,
+    leur temps est le sien) mais ne doivent plus être simulés séparément.
+    """
+
+    def __init__(self, build_fn, param_grid, history=None):
+        self.params = grille(param_grid)
+        self.membres = [build_fn(**p) for p in self.params]
+        if not self.membres:
+            raise ValueError("ensemble vide : aucun jeu de paramètres")
+        premier = self.membres[0]
+        for m in self.membres[1:]:
+            if self._topologie(m) != self._topologie(premier):
+                raise ValueError("les membres d'un ensemble doivent avoir la même topologie")
+
+        U = self.univers = Univers(name='ensemble', t0=premier.time[-1], step=premier.step,
+                                   history=premier.history if history is None else history,
+                                   engine='soa', integrator=premier.integrator)
+        for m in self.membres:
+            U.addEntity(*m.population, *m.barres, *m.motors)
+            # Déjà convertis (joints='constraints') ; une force partagée par plusieurs membres n'est ajoutée qu'une fois
+            U.generators.extend(f for f in m.generators if f not in U.generators)
+            U.addConstraints(*m.contraintes)
+        for m in self.membres:
+            m.time = U.time                              # Le temps des membres est celui de l'ensemble
+        self.M = len(self.membres)                       # Nombre de membres (axe de lot)
+        self.N = len(premier.population)                 # Particules par membre
+        self.B = len(premier.barres)                     # Barres par membre
+
+        # Tableaux (M x N, ...) de tous les membres ; les champs globaux (gravité, sol...)
+        # d'un membre ne visent que ses propres entités
+        soa = U._soa = SimulationSoA(U)
+        for j, m in enumerate(self.membres):
+            tranches = (slice(j * self.N, (j + 1) * self.N), slice(j * self.B, (j + 1) * self.B))
+            for g in list(m.generators) + m.contraintes:
+                if g.getSubjects() is None:
+                    soa.portees[g] = tranches
+
+    @staticmethod
+    def _topologie(u):
+        # Ce qui doit être identique d'un membre à l'autre
+        return (len(u.population), len(u.barres), len(u.motors), u.step, u.integrator,
+                [type(g) for g in u.generators], [type(c) for c in u.contraintes])
+
+    def __len__(self):
+        return self.M
+
+    def __repr__(self):
+        return 'Ensemble(%d membres, %d particules, %d barres)' % (self.M, self.N, self.B)
+
+    @property
+    def time(self):
+        return self.univers.time
+
+    def simulateSteps(self, n):
+        self.univers.simulateSteps(n)
+
+    def simulateFor(self, duration):
+        self.univers.simulateFor(duration)
+
+    def _lot(self, nom):
+        # Nombre d'entités par membre pour un tableau du moteur SoA ('p_...' ou 'b_...')
+        if nom[:2] not in ('p_', 'b_'):
+            raise ValueError("grandeur inconnue : %r (attendu 'p_pos', 'b_theta'...)" % (nom,))
+        return self.N if nom[0] == 'p' else self.B
+
+    def state(self, nom):
+        """État courant de tous les membres, (M, n, ...) : 'p_pos', 'p_vel', 'b_theta'..."""
+        n = self._lot(nom)
+        a = getattr(self.univers._soa, nom)
+        return a.reshape((self.M, n) + a.shape[1:])
+
+    def history(self, nom):
+        """Trajectoires de tous les membres, (T, M, n, ...)"""
+        n = self._lot(nom)
+        a = self.univers._soa.historiques[nom].array
+        return a.reshape((len(a), self.M, n) + a.shape[2:])
+
+    def collect(self, fn):
+        """Liste des fn(univers membre), dans l'ordre des paramètres"""
+        return [fn(m) for m in self.membres]
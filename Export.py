@@ -0,0 +1,150 @@
+import os
+import queue
+import subprocess
+import threading
+from math import ceil
+import numpy as np
+import pygame
+from TempsReel import Instantane
+from Rendu import Rendu, police, texte
+
+
+class Ecrivain(threading.Thread):
+    """
+    Thread d'écriture des images rendues hors écran.
+
+    Les images (octets RGB, lignes de haut en bas) arrivent par une file bornée
+    (`max_queue` images) : si l'écriture est plus lente que la simulation et le
+    rendu, ajouter attend qu'une place se libère au lieu d'accumuler les images
+    en mémoire. Destinations (`output`) :
+    - chaîne : suite de fichiers PNG, motif contenant le numéro d'image
+      ('images/img_%05d.png') ou dossier (image_00000.png, image_00001.png...) ;
+    - liste d'arguments : commande lancée avec les images brutes (rgb24) sur son
+      entrée standard, par exemple ffmpeg. '{size}' (LxH) et '{fps}' y sont remplacés ;
+    - objet binaire ayant write (fichier, tube...) : images brutes rgb24 à la suite ;
+    - fonction (numéro, temps, image) : reçoit chaque image en tableau NumPy
+      (H, W, 3) uint8.
+    """
+
+    def __init__(self, output, taille, fps, max_queue=8):
+        super().__init__(name='export', daemon=True)
+        if max_queue < 1:
+            raise ValueError("max_queue doit être au moins 1")
+        self.taille = tuple(taille)
+        self.erreur = None                        # Exception du thread, relancée par fermer
+        self._file = queue.Queue(max_queue)
+        self._processus = None
+        self._flux = None
+        self._motif = None
+        self._fonction = None
+        if isinstance(output, (str, os.PathLike)):
+            output = os.fspath(output)
+            if '%' not in output:
+                output = os.path.join(output, 'image_%05d.png')
+            dossier = os.path.dirname(output)
+            if dossier:
+                os.makedirs(dossier, exist_ok=True)
+            self._motif = output
+        elif isinstance(output, (list, tuple)):
+            W, H = self.taille
+            args = [str(a).replace('{size}', '%dx%d' % (W, H)).replace('{fps}', '%g' % fps) for a in output]
+            self._processus = subprocess.Popen(args, stdin=subprocess.PIPE)
+            self._flux = self._processus.stdin
+        elif hasattr(output, 'write'):
+            self._flux = output
+        elif callable(output):
+            self._fonction = output
+        else:
+            raise ValueError("destination inconnue : %r (attendu motif PNG, commande, fichier ou fonction)" % (output,))
+
+    def ajouter(self, numero, t, donnees):
+        """Image suivante (octets RGB) ; attend si la file est pleine"""
+        while self.erreur is None:
+            try:
+                self._file.put((numero, t, donnees), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise self.erreur
+
+    def fermer(self):
+        """Écrit les images en attente, ferme la destination et relance une erreur d'écriture"""
+        if self.is_alive():
+            while self.erreur is None:
+                try:
+                    self._file.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            self.join()
+        try:
+            if self._processus is not None:
+                try:
+                    self._flux.close()
+                except BrokenPipeError:
+                    pass
+                code = self._processus.wait()
+                if code and (self.erreur is None or isinstance(self.erreur, BrokenPipeError)):
+                    self.erreur = RuntimeError("la commande d'export s'est terminée avec le code %d" % code)
+        finally:
+            if self.erreur is not None:
+                raise self.erreur
+
+    def run(self):
+        W, H = self.taille
+        try:
+            while True:
+                element = self._file.get()
+                if element is None:
+                    return
+                numero, t, donnees = element
+                if self._motif is not None:
+                    pygame.image.save(pygame.image.frombuffer(donnees, (W, H), 'RGB'), self._motif % numero)
+                elif self._flux is not None:
+                    self._flux.write(donnees)
+                else:
+                    self._fonction(numero, t, np.frombuffer(donnees, dtype=np.uint8).reshape(H, W, 3))
+        except BaseException as e:
+            self.erreur = e
+
+
+def exporter(univers, duration, output, every=1, size=None, label=True, max_queue=8):
+    """
+    Simule `duration` secondes à pleine vitesse sans affichage et rend l'état tous
+    les `every` pas dans une surface hors écran (même rendu que simulateRealTime).
+    Les images sont écrites par un thread (Ecrivain) pendant que la simulation
+    continue. Renvoie le nombre d'images ; la première est l'état initial.
+    """
+    if every < 1:
+        raise ValueError("every doit être un nombre de pas positif")
+    W, H = univers.gameDimensions if size is None else size
+    fps = 1 / (every * univers.step)              # Une image tous les `every` pas : temps simulé
+    screen = pygame.Surface((W, H))               # Aucune fenêtre : ni display, ni pilote vidéo
+    rendu = Rendu(screen, univers.scale)
+    font_obj = police(12, 'freesansbold.ttf') if label else None
+    moteurs = [m for m in univers.motors if hasattr(m, 'gameDraw')]
+    ecrivain = Ecrivain(output, (W, H), fps, max_queue)
+
+    def image(numero):
+        etat = Instantane.capturer(univers)
+        rendu.image()
+        rendu.dessinerEtat(etat, univers)
+        rendu.dessiner(moteurs)
+        if font_obj is not None:
+            rendu.blit(texte('time: %.2f' % etat.t, font_obj, 'black', (255, 255, 255)), (0, 0))
+        rendu.terminer()
+        ecrivain.ajouter(numero, etat.t, pygame.image.tobytes(screen, 'RGB'))
+
+    n = ceil(duration / univers.step - 1e-9)
+    numero = 0
+    ecrivain.start()
+    try:
+        image(numero)
+        while n > 0:
+            univers.simulateSteps(min(every, n))
+            n -= every
+            numero += 1
+            image(numero)
+    finally:
+        ecrivain.fermer()
+    return numero + 1
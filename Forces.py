@@ -1,7 +1,10 @@
 from Particule import Particule
 from Barre2D import Barre
-from vector3D import Vector3D as V3D
+from vector3D import Vector3D as V3D, Vector3DArray, ZERO
+from math import sqrt, cos, sin
 import numpy as np
+from Contraintes import ContrainteDistance, ContraintePivot, ContrainteGlissiere, Planes, BoundaryBox, Collisions
+from ArbreBarnesHut import ArbreBarnesHut
 
 class Force:
     """
@@ -14,10 +17,42 @@ class Force:
     - active : Booléen pour activer ou désactiver dynamiquement la force
     """
 
-    def __init__(self, force=V3D(), name='force', active=True):
+    def __init__(self, force=ZERO, name='force', active=True):
         self.force = force         # Force par défaut (vecteur nul)
         self.name = name           # Nom de la force
         self.active = active       # Si False, la force ne sera pas appliquée
+        self._f = V3D()            # Vecteur de travail réutilisé à chaque appel (évite les allocations)
+
+    # Noyau vectorisé du moteur SoA (voir SoA.py) : fonction (soa, forces) appelée une fois
+    # par pas pour toutes les forces de la classe, qui renvoie celles qu'elle ne sait pas
+    # traiter. None : la force est appliquée par le chemin objet (setForce / applyPair).
+    soaGroup = None
+
+    # Force « impulsionnelle » (rebonds) : calibrée pour un pas fixe. Le pas adaptatif
+    # (Univers.simulateFor(..., adaptive=True)) réduit le pas jusqu'au contact (touches)
+    # puis l'applique comme un saut de vitesse (applyImpulse) au lieu d'une force.
+    impulsive = False
+
+    # Force de rappel raide (ressort, liaison, pivot) : linéarisée par l'intégrateur
+    # implicite (integrator='implicit_euler'), les autres forces restant explicites.
+    stiff = False
+
+    # Générateur raide équivalent à un ressort-amortisseur entre deux points : ressort()
+    # renvoie (A, point A, B, point B, k, c, l0) et l'intégrateur implicite en calcule les
+    # jacobiennes analytiques (voir Integrateurs.jacobiennes). A et B sont des entités (point
+    # normalisé sur une barre) ou des points fixes (V3D) ; l0 None : ressort de longueur
+    # nulle (F = k Δ + c Δv). None : jacobiennes par différences finies.
+    ressort = None
+
+    # Attributs d'état (scalaires) enregistrés par Univers.checkpoint, en plus de `active`
+    checkpointFields = ()
+
+    # Générateur à état interne (intégrale d'un PID...) : beginStep() est appelé une fois
+    # par pas, avant l'évaluation des forces du pas, et met cet état à jour. setForce ne
+    # le modifie pas : les schémas qui évaluent les forces plusieurs fois par pas (verlet,
+    # rk4, pas adaptatif et ses essais refusés) lui donnent le même sens qu'explicit.
+    # None : générateur sans état.
+    beginStep = None
 
     def __str__(self):
         # Représentation lisible de la force pour le debug
@@ -26,6 +61,14 @@ class Force:
     def __repr__(self):
         return str(self)
 
+    def getSubjects(self):
+        """
+        Entités sur lesquelles la force peut agir, ou None si elle agit sur toutes
+        (champ global : gravité, sol...). L'univers s'en sert pour n'appeler setForce
+        que sur ces entités ; la liste est lue lors de l'ajout du générateur.
+        """
+        return None
+
     def setForce(self, entity):
         """
         Applique la force à l'entité si la force est active.
@@ -35,6 +78,69 @@ class Force:
             entity.applyForce(self.force)
 
 
+class Interaction(Force):
+    """
+    Force d'interaction entre deux entités (ressort, liaison...).
+
+    La force n'est évaluée qu'une fois par pas (evaluate) puis appliquée aux deux
+    extrémités : +F sur la première, -F sur la seconde (applyPair). L'univers appelle
+    applyPair une fois par pas au lieu de setForce pour chaque extrémité.
+
+    Les classes filles définissent :
+    - getSubjects : les deux extrémités (première, seconde)
+    - evaluate : la force sur la première extrémité, ou None si elle est nulle
+    - getPoints : les points d'application sur des barres (centre par défaut)
+    """
+
+    def getPoints(self):
+        return (0.0, 0.0)
+
+    def evaluate(self):
+        raise NotImplementedError
+
+    def _push(self, entity, force, s, point):
+        # Ajoute s * force à l'entité (au point donné pour une barre)
+        if isinstance(entity, Barre):
+            entity.applyScaledForce(force, s, point)
+        else:
+            entity.applyScaledForce(force, s)
+
+    def applyPair(self, entities=None):
+        """
+        Évalue la force une seule fois et l'applique aux deux extrémités.
+        Si `entities` est donné, seules les extrémités qui en font partie la reçoivent.
+        """
+        if not self.active:
+            return
+        force = self.evaluate()
+        if force is None:
+            return
+        e0, e1 = self.getSubjects()
+        p0, p1 = self.getPoints()
+        if entities is None or e0 in entities:
+            self._push(e0, force, 1, p0)
+        if entities is None or e1 in entities:
+            self._push(e1, force, -1, p1)
+
+    def setForce(self, entity):
+        """
+        Applique à l'entité sa part de la force (évaluée à chaque appel).
+        """
+        if not self.active:
+            return
+        e0, e1 = self.getSubjects()
+        if entity is not e0 and entity is not e1:
+            return
+        force = self.evaluate()
+        if force is None:
+            return
+        p0, p1 = self.getPoints()
+        if entity is e0:
+            self._push(e0, force, 1, p0)
+        else:
+            self._push(e1, force, -1, p1)
+
+
 class Gravity(Force):
     """
     Force gravitationnelle appliquée à tous les objets soumis à une masse.
@@ -47,9 +153,8 @@ class Gravity(Force):
     """
 
     def __init__(self, g=V3D(0, -9.8), name='gravity', active=True):
+        super().__init__(ZERO, name, active)  # Nom, activation (utilisés pour debug ou affichage)
         self.g = g             # Accélération gravitationnelle (m/s²)
-        self.name = name       # Nom de la force (utilisé pour debug ou affichage)
-        self.active = active   # Si False, la force ne s’applique pas
 
     def setForce(self, entity):
         """
@@ -62,11 +167,39 @@ class Gravity(Force):
 
         if isinstance(entity, Particule):
             # Gravité appliquée au centre de masse d’une particule
-            entity.applyForce(-self.g * entity.mass)
+            entity.applyScaledForce(self.g, -entity.mass)
 
         elif isinstance(entity, Barre):
             # Gravité appliquée au centre géométrique de la barre (point = 0.0)
-            entity.applyForce(-self.g * entity.mass, 0.0)
+            entity.applyScaledForce(self.g, -entity.mass, 0.0)
+
+    def batchForces(self, masses):
+        """
+        Forces de gravité de N masses en un seul appel NumPy.
+        Renvoie un Vector3DArray (N, 3) : F = -m * g pour chaque masse.
+        """
+        g = np.array((self.g.x, self.g.y, self.g.z), dtype=np.float64)
+        return Vector3DArray(np.multiply.outer(-np.asarray(masses, dtype=np.float64), g))
+
+    @staticmethod
+    def soaGroup(soa, forces):
+        """
+        Noyau SoA : ajoute -m * g aux particules et barres du moteur (de sa portée).
+        Les champs de toutes les forces sont sommés entité par entité, puis appliqués
+        en une multiplication.
+        """
+        gp = np.zeros_like(soa.p_F)
+        gb = np.zeros_like(soa.b_F)
+        for f in forces:
+            if not f.active:
+                continue
+            g = (f.g.x, f.g.y, f.g.z)
+            ip, ib = soa.portee(f)
+            gp[ip] += g
+            gb[ib] += g
+        soa.p_F -= soa.p_mass[:, None] * gp
+        soa.b_F -= soa.b_mass[:, None] * gb
+        return []
 
 
 class ForceSelect(Force):
@@ -81,13 +214,16 @@ class ForceSelect(Force):
     - active : Booléen indiquant si la force est active ou non
     """
 
-    def __init__(self, force=V3D(), subject=None, name='force', active=True):
+    def __init__(self, force=ZERO, subject=None, name='force', active=True):
         self.force = force                            # Vecteur de force à appliquer
         self.name = name                              # Nom de la force
         self.active = active                          # Activation dynamique
         self.subjects = subject if isinstance(subject, list) else [subject]  
         # Si un seul objet est passé, on le met dans une liste pour unifier le traitement
 
+    def getSubjects(self):
+        return tuple(self.subjects)
+
     def setForce(self, particule):
         """
         Applique la force uniquement si :
@@ -109,12 +245,18 @@ class Bounce_y(Force):
     - step : pas de temps utilisé dans le calcul de la force (influence la réactivité)
     - name : nom pour affichage ou debug
     - active : booléen pour activer/désactiver la force
+
+    Pour toutes les parois du domaine, sans force dépendant du pas : BoundaryBox
+    (Contraintes.py).
     """
 
+    impulsive = True           # Rebond appliqué comme un saut de vitesse en pas adaptatif
+
     def __init__(self, k=1, step=0.1, name="boing", active=True):
-        self.name = name       # Nom de la force (utile pour logs ou debug)
+        super().__init__(ZERO, name, active)  # Nom (utile pour logs ou debug), activation
         self.k = k             # Coefficient de rebond (élasticité)
         self.step = step       # Pas de temps utilisé pour évaluer la réaction
+        self._f = V3D()        # Vecteur de travail réutilisé
 
     def setForce(self, entity):
         """
@@ -125,9 +267,24 @@ class Bounce_y(Force):
         if isinstance(entity, Particule):
             if entity.getPosition().y < 0 and entity.getSpeed().y < 0:
                 # Force appliquée vers le haut pour simuler le rebond
-                force_rebond = -2 * (self.k / self.step) * V3D(0, entity.getSpeed().y * entity.mass)
+                force_rebond = self._f.set(0, -2 * (self.k / self.step) * (entity.getSpeed().y * entity.mass))
                 entity.applyForce(force_rebond)
 
+    def touches(self, entity):
+        """
+        True si la particule est sous le sol en descendant (le rebond doit s'appliquer).
+        """
+        return self.active and isinstance(entity, Particule) and entity.getPosition().y < 0 and entity.getSpeed().y < 0
+
+    def applyImpulse(self, entity):
+        """
+        Rebond instantané : même saut de vitesse que la force appliquée pendant un pas
+        (v.y devient (1 - 2k) * v.y).
+        """
+        if self.touches(entity):
+            v = entity.getSpeed()
+            entity.speed[-1] = V3D(v.x, (1 - 2 * self.k) * v.y, v.z)
+
         
 class Bounce_x(Force):
     """
@@ -139,10 +296,14 @@ class Bounce_x(Force):
     - step : pas de temps utilisé pour l'intensité de la force
     - name : nom de la force (pour affichage ou debug)
     - active : booléen pour activer ou désactiver dynamiquement la force
+
+    Voir aussi BoundaryBox (Contraintes.py).
     """
 
+    impulsive = True           # Rebond appliqué comme un saut de vitesse en pas adaptatif
+
     def __init__(self, k=1, step=0.1, name="boing", active=True):
-        self.name = name       # Nom de la force
+        super().__init__(ZERO, name, active)  # Nom, activation, vecteur de travail réutilisé
         self.k = k             # Coefficient de rebond (réactivité à l’impact)
         self.step = step       # Pas de temps pour le calcul de la réaction
 
@@ -155,11 +316,25 @@ class Bounce_x(Force):
         if isinstance(entity, Particule):
             if entity.getPosition().x < 0 and entity.getSpeed().x < 0:
                 # Force de rebond appliquée horizontalement vers la droite
-                force_rebond = -2 * (self.k / self.step) * V3D(entity.getSpeed().x * entity.mass)
+                force_rebond = self._f.set(-2 * (self.k / self.step) * (entity.getSpeed().x * entity.mass))
                 entity.applyForce(force_rebond)
 
+    def touches(self, entity):
+        """
+        True si la particule a franchi le mur en s'en approchant.
+        """
+        return self.active and isinstance(entity, Particule) and entity.getPosition().x < 0 and entity.getSpeed().x < 0
+
+    def applyImpulse(self, entity):
+        """
+        Rebond instantané : v.x devient (1 - 2k) * v.x (voir Bounce_y.applyImpulse).
+        """
+        if self.touches(entity):
+            v = entity.getSpeed()
+            entity.speed[-1] = V3D((1 - 2 * self.k) * v.x, v.y, v.z)
+
         
-class SpringDamper(Force):
+class SpringDamper(Interaction):
     """
     Simule une liaison de type ressort-amortisseur entre deux particules.
     La force est proportionnelle à l'allongement du ressort et à la vitesse relative.
@@ -171,17 +346,25 @@ class SpringDamper(Force):
     - l0 : longueur à l'équilibre (distance sans contrainte)
     """
 
+    stiff = True                # Linéarisée par l'intégrateur implicite
+
     def __init__(self, P0, P1, k=0, c=0, l0=0, active=True, name="spring_and_damper"):
-        super().__init__(V3D(), name, active)
+        super().__init__(ZERO, name, active)
         self.k = k             # Constante de raideur
         self.c = c             # Amortissement visqueux
         self.P0 = P0           # Première particule
         self.P1 = P1           # Seconde particule
         self.l0 = l0           # Longueur au repos (sans déformation)
 
-    def setForce(self, entity):
+    def getSubjects(self):
+        return (self.P0, self.P1)
+
+    def ressort(self):
+        return (self.P0, 0.0, self.P1, 0.0, self.k, self.c, self.l0)
+
+    def evaluate(self):
         """
-        Applique la force de ressort + amortisseur à la particule concernée (P0 ou P1).
+        Force de ressort + amortisseur sur P0 (P1 reçoit l'opposée).
 
         Le ressort agit selon :
             F = -k * (||P1 - P0|| - l0)
@@ -189,26 +372,70 @@ class SpringDamper(Force):
             F = -c * projection_vitesse_relative
         """
 
-        if not self.active or entity not in [self.P0, self.P1]:
-            return
-
-        # === Direction entre les deux particules
-        vec_dir = self.P1.getPosition() - self.P0.getPosition()
-        v_n = vec_dir.norm()                    # direction unitaire
-        flex = vec_dir.mod() - self.l0          # allongement (déformation scalaire)
+        # === Direction entre les deux particules (calculée en place dans le vecteur de travail)
+        pos0 = self.P0.getPosition()
+        pos1 = self.P1.getPosition()
+        v_n = self._f.set(pos1.x - pos0.x, pos1.y - pos0.y, pos1.z - pos0.z)
+        d = v_n.mod()
+        if d != 0:
+            v_n *= 1 / d                        # direction unitaire
+        flex = d - self.l0                      # allongement (déformation scalaire)
 
         # === Vitesse relative projetée dans la direction du ressort
-        vit = self.P1.getSpeed() - self.P0.getSpeed()
-        vit_n = vit ** v_n * self.c             # projection scalaire amortie
+        vit_n = (v_n.dot(self.P1.getSpeed()) - v_n.dot(self.P0.getSpeed())) * self.c
 
         # === Force résultante totale
-        force = (self.k * flex + vit_n) * v_n   # ressort + amortisseur
+        force = v_n
+        force *= self.k * flex + vit_n          # ressort + amortisseur
+        return force
 
-        # === Application de la force à la bonne particule
-        if entity == self.P0:
-            entity.applyForce(force)
-        elif entity == self.P1:
-            entity.applyForce(-force)
+    @staticmethod
+    def batchForces(pos0, pos1, vel0, vel1, k, c, l0):
+        """
+        Forces de N ressorts-amortisseurs en un seul appel NumPy.
+
+        pos0, pos1, vel0, vel1 : Vector3DArray (N, 3) des extrémités
+        k, c, l0 : scalaires ou tableaux (N,)
+        Renvoie la force appliquée sur P0 (P1 reçoit l'opposée).
+        """
+        vec_dir = pos1 - pos0
+        flex = vec_dir.mod() - l0               # allongements
+        v_n = vec_dir.norm()                    # directions unitaires
+        vit_n = ((vel1 - vel0) ** v_n) * c      # projections amorties
+        return v_n * (k * flex + vit_n)
+
+    @staticmethod
+    def soaGroup(soa, forces):
+        """
+        Noyau SoA : tous les ressorts entre deux particules du moteur en un appel
+        (force sur P0, opposée sur P1). Les autres liaisons sont renvoyées.
+        """
+        index = soa.p_index
+        autres = []
+        i0, i1, k, c, l0 = [], [], [], [], []
+        for f in forces:
+            if not f.active:
+                continue
+            j0 = index.get(id(f.P0))
+            j1 = index.get(id(f.P1))
+            if j0 is None or j1 is None:
+                autres.append(f)
+                continue
+            i0.append(j0)
+            i1.append(j1)
+            k.append(f.k)
+            c.append(f.c)
+            l0.append(f.l0)
+        if i0:
+            i0 = np.array(i0)
+            i1 = np.array(i1)
+            F = SpringDamper.batchForces(Vector3DArray(soa.p_pos[i0]), Vector3DArray(soa.p_pos[i1]),
+                                         Vector3DArray(soa.p_vel[i0]), Vector3DArray(soa.p_vel[i1]),
+                                         np.array(k, dtype=np.float64), np.array(c, dtype=np.float64),
+                                         np.array(l0, dtype=np.float64)).data
+            np.add.at(soa.p_F, i0, F)
+            np.subtract.at(soa.p_F, i1, F)
+        return autres
 
             
 class Link(SpringDamper):
@@ -236,6 +463,10 @@ class Link(SpringDamper):
             name=name
         )
 
+    def contrainte(self):
+        """Liaison exacte équivalente (Univers(joints='constraints'))"""
+        return ContrainteDistance(self.P0, self.P1, l0=self.l0, name=self.name, active=self.active)
+
 
 class SpringDamperMoteur(Force):
     """
@@ -254,37 +485,81 @@ class SpringDamperMoteur(Force):
         l0 : longueur au repos (initialisée automatiquement à la distance initiale)
     """
 
-    def __init__(self, moteur, particule, k=10, c=1, name="spring damper moteur"):
+    stiff = True                # Linéarisée par l'intégrateur implicite
+
+    def __init__(self, moteur, particule, k=10, c=1, name="spring damper moteur", active=True):
+        super().__init__(ZERO, name, active)
         self.moteur = moteur               # Point fixe (position moteur.p)
         self.particule = particule         # Particule mobile attachée au ressort
         self.k = k                         # Raideur du ressort
         self.c = c                         # Amortissement visqueux
-        self.name = name                   # Nom de la force
         # Longueur à l'équilibre mesurée à l'initialisation
         self.l0 = (self.particule.getPosition() - self.moteur.p).mod()
 
+    def getSubjects(self):
+        return (self.particule,)
+
+    def ressort(self):
+        return (self.particule, 0.0, self.moteur.p, 0.0, self.k, self.c, self.l0)
+
     def setForce(self, p):
-        if p != self.particule:
-            return  # n'agit que sur la particule concernée
+        if not self.active or p is not self.particule:
+            return  # n'agit que sur la particule concernée, si la force est active
 
         # Récupération des positions
         pos_m = self.moteur.p
         pos_p = p.getPosition()
 
         # Vecteur entre moteur et particule
-        vec_dir = pos_p - pos_m
-        unit = vec_dir.norm()        # direction normalisée
-        distance = vec_dir.mod()     # longueur actuelle du ressort
+        unit = self._f.set(pos_p.x - pos_m.x, pos_p.y - pos_m.y, pos_p.z - pos_m.z)
+        distance = unit.mod()        # longueur actuelle du ressort
+        if distance != 0:
+            unit *= 1 / distance     # direction normalisée
 
         # Vitesse relative projetée sur la direction du ressort
-        v_r = self.particule.getSpeed()
-        v_n = v_r ** unit            # composante normale (scalaire)
+        v_n = unit.dot(p.getSpeed())  # composante normale (scalaire)
 
         # Formule de la force ressort + amortissement
-        force = (-self.k * (distance - self.l0) - self.c * v_n) * unit
+        force = unit
+        force *= -self.k * (distance - self.l0) - self.c * v_n
 
         # Application à la particule
-        self.particule.applyForce(force)
+        p.applyForce(force)
+
+    @staticmethod
+    def soaGroup(soa, forces):
+        """
+        Noyau SoA : tous les ressorts moteur-particule du moteur en un appel.
+        Les forces dont la particule n'est pas dans le moteur sont renvoyées.
+        """
+        index = soa.p_index
+        autres = []
+        i, pm, k, c, l0 = [], [], [], [], []
+        for f in forces:
+            if not f.active:
+                continue
+            j = index.get(id(f.particule))
+            if j is None:
+                autres.append(f)
+                continue
+            i.append(j)
+            pm.append((f.moteur.p.x, f.moteur.p.y, f.moteur.p.z))
+            k.append(f.k)
+            c.append(f.c)
+            l0.append(f.l0)
+        if i:
+            i = np.array(i)
+            unit = soa.p_pos[i] - np.array(pm, dtype=np.float64)
+            x, y, z = unit.T
+            distance = np.sqrt(x * x + y * y + z * z)
+            inv = np.ones_like(distance)
+            inv[distance != 0] = 1 / distance[distance != 0]
+            unit *= inv[:, None]                    # Directions normalisées (nulles si distance nulle)
+            vel = soa.p_vel[i]
+            v_n = unit[:, 0] * vel[:, 0] + unit[:, 1] * vel[:, 1] + unit[:, 2] * vel[:, 2]
+            F = unit * (-np.array(k) * (distance - np.array(l0)) - np.array(c) * v_n)[:, None]
+            np.add.at(soa.p_F, i, F)
+        return autres
 
 
 class ForceMoteur(Force):
@@ -302,33 +577,75 @@ class ForceMoteur(Force):
     """
 
     def __init__(self, moteur, particule, active=True, name="force_moteur"):
-        super().__init__(V3D(), name, active)
+        super().__init__(ZERO, name, active)
         self.moteur = moteur            # Moteur fixe
         self.particule = particule      # Particule ciblée par la force tangentielle
 
+    def getSubjects(self):
+        return (self.particule,)
+
     def setForce(self, particule):
         # Appliquer la force uniquement si elle est active et que la particule est celle prévue
-        if not self.active or particule != self.particule:
+        if not self.active or particule is not self.particule:
             return
 
         # Vecteur entre le moteur (fixe) et la particule
-        vecteur = particule.getPosition() - V3D(self.moteur.x, self.moteur.y, 0)
-        rayon = vecteur.mod()
+        pos = particule.getPosition()
+        rx = pos.x - self.moteur.x
+        ry = pos.y - self.moteur.y
+        rayon = sqrt(rx * rx + ry * ry + pos.z * pos.z)
         if rayon == 0:
             return  # Évite une division par zéro (la particule est "sur" le moteur)
 
-        # Calcul de la direction tangentielle au rayon
-        tangente = V3D(-vecteur.y, vecteur.x, 0).norm()
+        # Direction tangentielle au rayon (non normalisée) : (-y, x, 0)
+        tangente = self._f.set(-ry, rx, 0)
+        t = tangente.mod()
 
         # Récupération du couple produit par le moteur
         torque = self.moteur.getTorque()
 
-        # Calcul de la force tangentielle F = τ / r
-        force_moteur = (torque / rayon) * tangente
+        # Calcul de la force tangentielle F = τ / r, appliquée selon la tangente unitaire
+        force_moteur = tangente
+        force_moteur *= (torque / rayon) / t if t != 0 else 0
 
         # Application de la force à la particule
         particule.applyForce(force_moteur)
 
+    @staticmethod
+    def soaGroup(soa, forces):
+        """
+        Noyau SoA : forces tangentielles de tous les moteurs en un appel.
+        Les forces dont la particule n'est pas dans le moteur sont renvoyées.
+        """
+        index = soa.p_index
+        autres = []
+        i, centre, torque = [], [], []
+        for f in forces:
+            if not f.active:
+                continue
+            j = index.get(id(f.particule))
+            if j is None:
+                autres.append(f)
+                continue
+            i.append(j)
+            centre.append((f.moteur.x, f.moteur.y))
+            torque.append(f.moteur.getTorque())
+        if i:
+            i = np.array(i)
+            pos = soa.p_pos[i]
+            r = pos[:, :2] - np.array(centre, dtype=np.float64)
+            t = np.sqrt(r[:, 0] * r[:, 0] + r[:, 1] * r[:, 1])
+            rayon = np.sqrt(r[:, 0] * r[:, 0] + r[:, 1] * r[:, 1] + pos[:, 2] * pos[:, 2])
+            # F = (torque / rayon) / t selon la tangente (-ry, rx, 0) ; nulle si rayon ou t est nul
+            ok = (rayon != 0) & (t != 0)
+            s = np.zeros(len(i))
+            s[ok] = (np.array(torque, dtype=np.float64)[ok] / rayon[ok]) / t[ok]
+            F = np.zeros((len(i), 3))
+            F[:, 0] = -r[:, 1] * s
+            F[:, 1] = r[:, 0] * s
+            np.add.at(soa.p_F, i, F)
+        return autres
+
 
 class Pivot(Force):
     """
@@ -336,8 +653,10 @@ class Pivot(Force):
     La liaison est modélisée comme un ressort amortisseur agissant sur le point spécifié de la barre.
     """
 
+    stiff = True                # Linéarisée par l'intégrateur implicite
+
     def __init__(self, barre, point_fix, point=0.0, k=1000, c=25, name="pivot", active=True):
-        super().__init__(V3D(), name=name, active=active)
+        super().__init__(ZERO, name=name, active=active)
         self.barre = barre
         self.point_fix = point_fix  # Doit être une Particule
         self.point = point          # Position normalisée sur la barre [-1, 1]
@@ -346,51 +665,123 @@ class Pivot(Force):
 
         # Initialisation de la distance à l'équilibre (l0)
         theta0 = self.barre.getAngle()
-        dir_barre = V3D(np.cos(theta0), np.sin(theta0), 0)
+        dir_barre = V3D(cos(theta0), sin(theta0), 0)
         P0 = self.barre.getPosition() + (self.point * self.barre.L / 2) * dir_barre
         self.l0 = (self.point_fix.getPosition() - P0).mod()  # distance initiale
 
+    def getSubjects(self):
+        return (self.barre,)
+
+    def ressort(self):
+        return (self.barre, self.point, self.point_fix.getPosition(), 0.0, self.k, self.c, self.l0)
+
+    def contrainte(self):
+        """Liaison exacte équivalente : le point d'attache reste à l0 du point fixe"""
+        return ContrainteDistance(self.point_fix, self.barre, l0=self.l0, point1=self.point,
+                                  name=self.name, active=self.active)
+
     def setForce(self, obj):
-        if not self.active or obj != self.barre:
+        if not self.active or obj is not self.barre:
             return
 
-        # Position actuelle du point d'attache
+        # Bras de levier r = (point * L/2) * dir_barre, du centre au point d'attache
         pos = self.barre.getPosition()
         theta = self.barre.getAngle()
-        dir_barre = V3D(np.cos(theta), np.sin(theta), 0)
-        P = pos + (self.point * self.barre.L / 2) * dir_barre
-
-        # Vecteur distance vers la particule fixe
-        delta = self.point_fix.getPosition() - P
-        d = delta.mod()
+        h = self.point * self.barre.L / 2
+        rx = h * cos(theta)
+        ry = h * sin(theta)
+
+        # Vecteur distance du point d'attache vers la particule fixe
+        fix = self.point_fix.getPosition()
+        n = self._f.set(fix.x - (pos.x + rx), fix.y - (pos.y + ry), fix.z - pos.z)
+        d = n.mod()
         if d == 0:
             return  # Évite division par 0
 
-        n = delta.norm()  # direction normalisée
+        n *= 1 / d  # direction normalisée
 
-        # Vitesse du point
-        r = (self.point * self.barre.L / 2) * dir_barre
+        # Vitesse du point (translation + rotation), projetée sur n
         omega = self.barre.getAngularSpeed()
-        v_translation = self.barre.getSpeed()
-        v_rotation = V3D(-omega * r.y, omega * r.x, 0)
-        v_point = v_translation + v_rotation
-
-    
-        v_proj = v_point ** n
+        v = self.barre.getSpeed()
+        v_proj = (v.x - omega * ry) * n.x + (v.y + omega * rx) * n.y + v.z * n.z
 
-        force = self.k * (d - self.l0) * n - self.c * v_proj * n
+        force = n
+        force *= self.k * (d - self.l0) - self.c * v_proj
 
         self.barre.applyForce(force, self.point)
 
+    @staticmethod
+    def batchForces(pos, theta, vel, omega, L, point, fix, k, c, l0):
+        """
+        Forces de N pivots barre / point fixe en un seul appel NumPy.
+
+        pos, vel, fix : Vector3DArray (N, 3) (centres, vitesses, points fixes)
+        theta, omega, L, point, k, c, l0 : scalaires ou tableaux (N,)
+        Renvoie la force à appliquer au point `point` de chaque barre.
+        """
+        h = np.asarray(point * L / 2, dtype=np.float64)
+        r = Vector3DArray(len(pos))                         # bras de levier
+        r.x[:] = h * np.cos(theta)
+        r.y[:] = h * np.sin(theta)
+
+        delta = fix - (pos + r)
+        d = delta.mod()
+        n = delta.norm()
+
+        v_point = vel.copy()                                # translation + rotation (omega ^ r)
+        v_point.x[:] -= omega * r.y
+        v_point.y[:] += omega * r.x
+        v_proj = v_point ** n
+        return n * (k * (d - l0) - c * v_proj)
 
-class SpringDamperBarre(Force):
+    @staticmethod
+    def soaGroup(soa, forces):
+        """
+        Noyau SoA : tous les pivots barre / point fixe en un appel.
+        Les pivots dont la barre n'est pas dans l'univers n'ont aucun effet.
+        """
+        index, p_index = soa.b_index, soa.p_index
+        ib, jf, hors, point, k, c, l0 = [], [], [], [], [], [], []
+        for f in forces:
+            i = index.get(id(f.barre))
+            if not f.active or i is None:
+                continue
+            j = p_index.get(id(f.point_fix))
+            if j is None:                           # Point fixe hors du moteur : lu sur l'objet
+                p = f.point_fix.getPosition()
+                hors.append((len(ib), (p.x, p.y, p.z)))
+                j = 0
+            ib.append(i)
+            jf.append(j)
+            point.append(f.point)
+            k.append(f.k)
+            c.append(f.c)
+            l0.append(f.l0)
+        if ib:
+            ib = np.array(ib)
+            point = np.array(point, dtype=np.float64)
+            fix = soa.p_pos[jf] if len(soa.p_pos) else np.zeros((len(ib), 3))
+            for n, p in hors:
+                fix[n] = p
+            F = Pivot.batchForces(Vector3DArray(soa.b_pos[ib]), soa.b_theta[ib], Vector3DArray(soa.b_vel[ib]),
+                                  soa.b_omega[ib], soa.b_L[ib], point, Vector3DArray(fix),
+                                  np.array(k, dtype=np.float64), np.array(c, dtype=np.float64),
+                                  np.array(l0, dtype=np.float64)).data
+            np.add.at(soa.b_F, ib, F)
+            np.add.at(soa.b_FP, ib, F * point[:, None])
+        return []
+
+
+class SpringDamperBarre(Interaction):
     """
     Ressort-amortisseur entre deux barres rigides, appliqué à deux points spécifiques (définis en position normalisée).
     Modélise un lien souple (type ressort) entre deux barres avec amortissement visqueux.
     """
 
+    stiff = True                # Linéarisée par l'intégrateur implicite
+
     def __init__(self, B0, point0, B1, point1, k=100, c=10, name="spring_barre", active=True):
-        super().__init__(V3D(), name, active)
+        super().__init__(ZERO, name, active)
 
         self.B0 = B0                  # Première barre
         self.B1 = B1                  # Deuxième barre
@@ -410,8 +801,9 @@ class SpringDamperBarre(Force):
         Calcule la position absolue d'un point donné sur une barre (dans le repère global).
         """
         angle = barre.getAngle()
-        dir_barre = V3D(np.cos(angle), np.sin(angle), 0)  # direction de la barre
-        return barre.getPosition() + (point * barre.L / 2) * dir_barre
+        h = point * barre.L / 2
+        pos = barre.getPosition()
+        return V3D(pos.x + h * cos(angle), pos.y + h * sin(angle), pos.z)
 
     def _get_global_speed(self, barre, point):
         """
@@ -419,42 +811,111 @@ class SpringDamperBarre(Force):
         """
         angle = barre.getAngle()
         omega = barre.getAngularSpeed()
-        dir_barre = V3D(np.cos(angle), np.sin(angle), 0)
-        r = (point * barre.L / 2) * dir_barre              # vecteur du centre au point
-        v_translation = barre.getSpeed()
-        v_rotation = V3D(-omega * r.y, omega * r.x, 0)     # rotation autour du centre
-        return v_translation + v_rotation
+        h = point * barre.L / 2                            # vecteur du centre au point : h * dir_barre
+        v = barre.getSpeed()
+        return V3D(v.x - omega * h * sin(angle), v.y + omega * h * cos(angle), v.z)
 
-    def setForce(self, entity):
-        """
-        Applique la force sur l'une ou l'autre des barres selon l'entité concernée.
-        """
-        if not self.active or entity not in [self.B0, self.B1]:
-            return
+    def getSubjects(self):
+        return (self.B0, self.B1)
 
-        # Positions et vitesses des deux extrémités
-        P0 = self._get_global_position(self.B0, self.p0)
-        P1 = self._get_global_position(self.B1, self.p1)
-        V0 = self._get_global_speed(self.B0, self.p0)
-        V1 = self._get_global_speed(self.B1, self.p1)
+    def getPoints(self):
+        return (self.p0, self.p1)
 
-        delta = P1 - P0                     # vecteur entre les deux extrémités
-        d = delta.mod()                    # distance actuelle
+    def ressort(self):
+        return (self.B0, self.p0, self.B1, self.p1, self.k, self.c, self.l0)
+
+    def evaluate(self):
+        """
+        Force sur le point p0 de B0 (B1 reçoit l'opposée en p1), None si les points coïncident.
+        """
+        # Bras de levier (centre -> point d'attache) de chaque barre
+        B0, B1 = self.B0, self.B1
+        t0, t1 = B0.getAngle(), B1.getAngle()
+        h0 = self.p0 * B0.L / 2
+        h1 = self.p1 * B1.L / 2
+        r0x, r0y = h0 * cos(t0), h0 * sin(t0)
+        r1x, r1y = h1 * cos(t1), h1 * sin(t1)
+
+        # Vecteur entre les deux extrémités, calculé dans le vecteur de travail
+        C0, C1 = B0.getPosition(), B1.getPosition()
+        n = self._f.set(C1.x + r1x - (C0.x + r0x), C1.y + r1y - (C0.y + r0y), C1.z - C0.z)
+        d = n.mod()                        # distance actuelle
         if d == 0:
-            return                         # évite les divisions par 0
+            return None                    # évite les divisions par 0
 
-        n = delta.norm()                   # vecteur direction normalisée
+        n *= 1 / d                         # vecteur direction normalisée
 
-        v_rel = (V1 - V0) ** n             # composante normale de la vitesse relative
+        # Composante normale de la vitesse relative des extrémités (translation + rotation)
+        V0, V1 = B0.getSpeed(), B1.getSpeed()
+        w0, w1 = B0.getAngularSpeed(), B1.getAngularSpeed()
+        v_rel = ((V1.x - w1 * r1y - (V0.x - w0 * r0y)) * n.x
+                 + (V1.y + w1 * r1x - (V0.y + w0 * r0x)) * n.y
+                 + (V1.z - V0.z) * n.z)
 
         # Force totale = ressort + amortisseur
-        force = (self.k * (d - self.l0) + self.c * v_rel) * n
+        force = n
+        force *= self.k * (d - self.l0) + self.c * v_rel
+        return force
 
-        # Application de la force à la bonne extrémité
-        if entity == self.B0:
-            self.B0.applyForce(force, self.p0)
-        elif entity == self.B1:
-            self.B1.applyForce(-force, self.p1)
+    @staticmethod
+    def soaGroup(soa, forces):
+        """
+        Noyau SoA : tous les ressorts entre deux barres du moteur en un appel
+        (force en p0 sur B0, opposée en p1 sur B1). Les autres sont renvoyés.
+        """
+        index = soa.b_index
+        autres = []
+        i0, i1, p0, p1, k, c, l0 = [], [], [], [], [], [], []
+        for f in forces:
+            if not f.active:
+                continue
+            j0 = index.get(id(f.B0))
+            j1 = index.get(id(f.B1))
+            if j0 is None or j1 is None:
+                autres.append(f)
+                continue
+            i0.append(j0)
+            i1.append(j1)
+            p0.append(f.p0)
+            p1.append(f.p1)
+            k.append(f.k)
+            c.append(f.c)
+            l0.append(f.l0)
+        if i0:
+            i0 = np.array(i0)
+            i1 = np.array(i1)
+            p0 = np.array(p0, dtype=np.float64)
+            p1 = np.array(p1, dtype=np.float64)
+            # Bras de levier (centre -> point d'attache) de chaque barre
+            h0 = p0 * soa.b_L[i0] / 2
+            h1 = p1 * soa.b_L[i1] / 2
+            t0, t1 = soa.b_theta[i0], soa.b_theta[i1]
+            r0x, r0y = h0 * np.cos(t0), h0 * np.sin(t0)
+            r1x, r1y = h1 * np.cos(t1), h1 * np.sin(t1)
+
+            C0, C1 = soa.b_pos[i0], soa.b_pos[i1]
+            dx = C1[:, 0] + r1x - (C0[:, 0] + r0x)
+            dy = C1[:, 1] + r1y - (C0[:, 1] + r0y)
+            dz = C1[:, 2] - C0[:, 2]
+            d = np.sqrt(dx * dx + dy * dy + dz * dz)
+            inv = np.zeros_like(d)
+            inv[d != 0] = 1 / d[d != 0]             # Points confondus : force nulle
+            nx, ny, nz = dx * inv, dy * inv, dz * inv
+
+            V0, V1 = soa.b_vel[i0], soa.b_vel[i1]
+            w0, w1 = soa.b_omega[i0], soa.b_omega[i1]
+            v_rel = ((V1[:, 0] - w1 * r1y - (V0[:, 0] - w0 * r0y)) * nx
+                     + (V1[:, 1] + w1 * r1x - (V0[:, 1] + w0 * r0x)) * ny
+                     + (V1[:, 2] - V0[:, 2]) * nz)
+
+            s = np.array(k, dtype=np.float64) * (d - np.array(l0, dtype=np.float64)) \
+                + np.array(c, dtype=np.float64) * v_rel
+            F = np.stack((nx * s, ny * s, nz * s), axis=1)
+            np.add.at(soa.b_F, i0, F)
+            np.add.at(soa.b_FP, i0, F * p0[:, None])
+            np.subtract.at(soa.b_F, i1, F)
+            np.subtract.at(soa.b_FP, i1, F * p1[:, None])
+        return autres
 
 
 class ForceSelectBarre(Force):
@@ -464,12 +925,17 @@ class ForceSelectBarre(Force):
     Idéale pour simuler une "pichenette" ou un effet déclenché par l'utilisateur.
     """
 
-    def __init__(self, force=V3D(), barre=None, point=0.0, name='force_select_barre', active=True):
+    checkpointFields = ('justActivated',)
+
+    def __init__(self, force=ZERO, barre=None, point=0.0, name='force_select_barre', active=True):
         super().__init__(force, name, active)
         self.barre = barre                  # Barre cible de l'effort
         self.point = point                  # Position sur la barre (normalisée entre -1 et 1)
         self.justActivated = False          # Permet de désactiver automatiquement la force au pas suivant
 
+    def getSubjects(self):
+        return (self.barre,)
+
     def setForce(self, entity):
         """
         Applique la force à la barre spécifiée si elle est active.
@@ -496,6 +962,9 @@ class GlissiereBarreParticule(SpringDamper):
     en utilisant un ressort-amortisseur virtuel uniquement hors de l'axe.
     """
 
+    soaGroup = None             # Pas de noyau vectorisé : appliquée via applyPair
+    ressort = None              # Force projetée : jacobiennes par différences finies
+
     def __init__(self, barre: Barre, particule: Particule, axis=V3D(1, 0, 0), k=1000, c=100, name="glissiere_barre_particule"):
         # Longueur initiale entre la barre et la particule (au repos)
         l0 = (barre.getPosition() - particule.getPosition()).mod()
@@ -505,44 +974,41 @@ class GlissiereBarreParticule(SpringDamper):
 
         self.axis = axis.norm()  # Axe de la glissière (normalisé)
 
-    def setForce(self, obj):
+    def contrainte(self):
+        """Liaison exacte équivalente : la particule glisse le long de l'axe passant par le centre de la barre"""
+        return ContrainteGlissiere(self.P0, self.P1, self.axis, self.P1.getPosition() - self.P0.getPosition(),
+                                   name=self.name, active=self.active)
+
+    def evaluate(self):
         """
-        Applique une force de rappel perpendiculaire à l'axe de la glissière
-        pour contraindre le mouvement à rester sur l'axe.
+        Force de rappel perpendiculaire à l'axe de la glissière (sur la barre P0,
+        appliquée en son centre ; la particule P1 reçoit l'opposée).
         """
-
         # Calcul du vecteur déplacement entre la barre et la particule
-        vec_dir = self.P1.getPosition() - self.P0.getPosition()
+        pos0 = self.P0.getPosition()
+        pos1 = self.P1.getPosition()
+        vec_dir = self._f.set(pos1.x - pos0.x, pos1.y - pos0.y, pos1.z - pos0.z)
 
         # Supprime la composante le long de l'axe de glissement autorisé
-        vec_dir -= (vec_dir ** self.axis) * self.axis
+        vec_dir.add_scaled(self.axis, -vec_dir.dot(self.axis))
 
         # Si aucune déviation (déjà sur le rail), ne rien faire
-        if vec_dir.mod() < 1e-8:
-            return
+        m = vec_dir.mod()
+        if m < 1e-8:
+            return None
 
         # Vecteur normal à l’axe (direction de correction)
-        v_n = vec_dir.norm()
-        flex = vec_dir.mod() - self.l0  # Élongation hors axe
+        v_n = vec_dir
+        v_n *= 1 / m
+        flex = m - self.l0  # Élongation hors axe
 
-        # Vitesse relative des deux objets
-        vit = self.P1.getSpeed() - self.P0.getSpeed()
-        vit_n = (vit ** v_n) * self.c  # Projection selon la direction de correction
+        # Vitesse relative des deux objets, projetée selon la direction de correction
+        vit_n = (v_n.dot(self.P1.getSpeed()) - v_n.dot(self.P0.getSpeed())) * self.c
 
         # Force résultante (ressort + amortisseur)
-        force = (self.k * flex + vit_n) * v_n
-
-        # Application de la force à l'objet concerné
-        if obj == self.P0:
-            if isinstance(self.P0, Barre):
-                self.P0.applyForce(force, point=0)  # Appliqué au centre de la barre
-            else:
-                self.P0.applyForce(force)
-        elif obj == self.P1:
-            if isinstance(self.P1, Barre):
-                self.P1.applyForce(-force, point=0)
-            else:
-                self.P1.applyForce(-force)
+        force = v_n
+        force *= self.k * flex + vit_n
+        return force
 
 
 class Prism(SpringDamper):
@@ -553,7 +1019,10 @@ class Prism(SpringDamper):
     Hérite de SpringDamper (ressort + amortisseur).
     """
 
-    def __init__(self, P0, P1, axis=V3D(), name="prism"):
+    soaGroup = None             # Pas de noyau vectorisé : appliquée via applyPair
+    ressort = None              # Force projetée : jacobiennes par différences finies
+
+    def __init__(self, P0, P1, axis=ZERO, name="prism"):
         # Longueur à l'équilibre initiale (distance entre les deux particules)
         l0 = (P0.getPosition() - P1.getPosition()).mod()
         
@@ -563,36 +1032,41 @@ class Prism(SpringDamper):
         # Direction de glissement autorisée (doit être normalisée)
         self.axis = axis.norm()
 
-    def setForce(self, particule):
+    def contrainte(self):
+        """Liaison exacte équivalente : déplacement relatif le long de l'axe seulement"""
+        return ContrainteGlissiere(self.P0, self.P1, self.axis, self.P1.getPosition() - self.P0.getPosition(),
+                                   name=self.name, active=self.active)
+
+    def evaluate(self):
         # === Vecteur de liaison (P1 - P0)
-        vec_dir = self.P1.getPosition() - self.P0.getPosition()
-        
+        pos0 = self.P0.getPosition()
+        pos1 = self.P1.getPosition()
+        vec_dir = self._f.set(pos1.x - pos0.x, pos1.y - pos0.y, pos1.z - pos0.z)
+
         # === Supprime la composante le long de l'axe autorisé
         # Ce qui reste est la composante perpendiculaire : c'est ce que l'on "corrige"
-        vec_dir -= (vec_dir ** self.axis) * self.axis
+        vec_dir.add_scaled(self.axis, -vec_dir.dot(self.axis))
 
         # === Direction normalisée de la force correctrice (perpendiculaire à l'axe)
-        v_n = vec_dir.norm()
+        m = vec_dir.mod()
+        if m == 0:
+            return None  # déjà sur l'axe : force nulle
+        v_n = vec_dir
+        v_n *= 1 / m
 
         # === Allongement par rapport à la longueur à l’équilibre
-        flex = vec_dir.mod() - self.l0
+        flex = m - self.l0
 
         # === Vitesse relative entre les deux particules
-        vit = self.P1.getSpeed() - self.P0.getSpeed()
-        vit_n = vit ** v_n * self.c
-
-        # === Force de rappel (ressort + amortisseur)
-        force = (self.k * flex + vit_n) * v_n
+        vit_n = (v_n.dot(self.P1.getSpeed()) - v_n.dot(self.P0.getSpeed())) * self.c
 
-        # === Appliquer la force à la bonne particule
-        if particule == self.P0:
-            particule.applyForce(force)
-        elif particule == self.P1:
-            particule.applyForce(-force)
-        # Sinon, ne rien faire (force non applicable)
+        # === Force de rappel (ressort + amortisseur), sur P0 ; P1 reçoit l'opposée
+        force = v_n
+        force *= self.k * flex + vit_n
+        return force
 
 
-class PivotBarre(Force):
+class PivotBarre(Interaction):
     """
     Simule une liaison de type pivot entre deux barres.
     Elle applique une force de rappel (ressort + amortissement) reliant deux points donnés sur deux barres distinctes.
@@ -606,8 +1080,10 @@ class PivotBarre(Force):
         active : permet d'activer/désactiver la force
     """
 
+    stiff = True                # Linéarisée par l'intégrateur implicite
+
     def __init__(self, b1, point1, b2, point2, k=1000, c=25, name="pivot", active=True):
-        super().__init__(V3D(), name=name, active=active)
+        super().__init__(ZERO, name=name, active=active)
         self.b1 = b1        # Première barre
         self.p1 = point1    # Position sur la première barre (normalisée)
         self.b2 = b2        # Deuxième barre
@@ -615,36 +1091,44 @@ class PivotBarre(Force):
         self.k = k          # Raideur du ressort
         self.c = c          # Amortissement
 
-    def setForce(self, obj):
-        if not self.active or (obj != self.b1 and obj != self.b2):
-            return
+    def getSubjects(self):
+        return (self.b1, self.b2)
 
-        # === Calcul des directions locales de chaque barre ===
-        dir1 = V3D(np.cos(self.b1.getAngle()), np.sin(self.b1.getAngle()), 0)
-        dir2 = V3D(np.cos(self.b2.getAngle()), np.sin(self.b2.getAngle()), 0)
+    def getPoints(self):
+        return (self.p1, self.p2)
 
-        # === Calcul des positions globales des deux points de liaison ===
-        pos1 = self.b1.getPosition() + (self.p1 * self.b1.L / 2) * dir1
-        pos2 = self.b2.getPosition() + (self.p2 * self.b2.L / 2) * dir2
+    def ressort(self):
+        return (self.b1, self.p1, self.b2, self.p2, self.k, self.c, None)
 
-        # === Vecteur de liaison (de la barre 1 à la barre 2) ===
-        d = pos2 - pos1
+    def contrainte(self):
+        """Liaison exacte équivalente : les deux points d'attache restent confondus"""
+        return ContraintePivot(self.b1, self.p1, self.b2, self.p2, name=self.name, active=self.active)
 
-        # === Vitesse absolue des points de liaison ===
-        v1 = self.b1.getSpeed() + self.b1.getAngularSpeed() * V3D(-dir1.y, dir1.x, 0) * (self.p1 * self.b1.L / 2)
-        v2 = self.b2.getSpeed() + self.b2.getAngularSpeed() * V3D(-dir2.y, dir2.x, 0) * (self.p2 * self.b2.L / 2)
+    def evaluate(self):
+        # === Bras de levier (centre -> point de liaison) de chaque barre ===
+        b1, b2 = self.b1, self.b2
+        t1, t2 = b1.getAngle(), b2.getAngle()
+        h1 = self.p1 * b1.L / 2
+        h2 = self.p2 * b2.L / 2
+        r1x, r1y = h1 * cos(t1), h1 * sin(t1)
+        r2x, r2y = h2 * cos(t2), h2 * sin(t2)
 
-        # === Vitesse relative entre les deux points ===
-        dv = v2 - v1
+        # === Vecteur de liaison (de la barre 1 à la barre 2) ===
+        C1, C2 = b1.getPosition(), b2.getPosition()
+        dx = C2.x + r2x - (C1.x + r1x)
+        dy = C2.y + r2y - (C1.y + r1y)
+        dz = C2.z - C1.z
+
+        # === Vitesse relative entre les deux points (translation + rotation) ===
+        V1, V2 = b1.getSpeed(), b2.getSpeed()
+        w1, w2 = b1.getAngularSpeed(), b2.getAngularSpeed()
+        dvx = V2.x - w2 * r2y - (V1.x - w1 * r1y)
+        dvy = V2.y + w2 * r2x - (V1.y + w1 * r1x)
+        dvz = V2.z - V1.z
 
         # === Force de type ressort amortisseur ===
-        force = self.k * d + self.c * dv
-
-        # === Application de la force sur la bonne barre ===
-        if obj == self.b1:
-            self.b1.applyForce(force, self.p1)
-        elif obj == self.b2:
-            self.b2.applyForce(-force, self.p2)
+        force = self._f.set(self.k * dx + self.c * dvx, self.k * dy + self.c * dvy, self.k * dz + self.c * dvz)
+        return force                            # sur b1 au point p1 ; b2 reçoit l'opposée en p2
 
 
 class ForceCorrecteur(Force):
@@ -658,8 +1142,10 @@ class ForceCorrecteur(Force):
     - Ki : intégrale de l'erreur (pour compenser le biais)
     """
 
+    checkpointFields = ('integral_error',)
+
     def __init__(self, pendule, base, Kp=1000, Kd=100, Ki=0.0, max_force=2000, name="force_correcteur", active=True):
-        super().__init__(V3D(), name=name, active=active)
+        super().__init__(ZERO, name=name, active=active)
         self.pendule = pendule            # Barre verticale représentant le pendule
         self.base = base                  # Barre horizontale (base mobile)
         self.Kp = Kp                      # Gain proportionnel
@@ -668,22 +1154,26 @@ class ForceCorrecteur(Force):
         self.max_force = max_force        # Force maximale autorisée
         self.integral_error = 0.0         # Intégrale de l'erreur (initialisée à 0)
 
+    def getSubjects(self):
+        return (self.base,)
+
+    def beginStep(self):
+        """Intégrale de l'erreur, une fois par pas (état du début du pas, anti-windup)"""
+        if self.active:
+            self.integral_error = max(min(self.integral_error + self.pendule.getAngle(), 1), -1)
+
     def setForce(self, obj):
         """
         Applique la force de correction sur la base uniquement si active.
         Utilise un correcteur PID basé sur l'orientation et la vitesse angulaire du pendule.
         """
-        if not self.active or obj != self.base:
+        if not self.active or obj is not self.base:
             return  # Ne s’applique que sur la base mobile et si la force est active
 
         # Lecture de l’état du pendule
         theta = self.pendule.getAngle()              # Angle d’inclinaison (en radian)
         omega = self.pendule.getAngularSpeed()       # Vitesse angulaire (rad/s)
 
-        # Intégrale de l’erreur (limitation anti-windup)
-        self.integral_error += theta
-        self.integral_error = max(min(self.integral_error, 1), -1)
-
         # Calcul du PID : fx est la force horizontale à appliquer
         fx = -self.Kp * theta - self.Kd * omega - self.Ki * self.integral_error
 
@@ -691,4 +1181,100 @@ class ForceCorrecteur(Force):
         fx = max(min(fx, self.max_force), -self.max_force)
 
         # Application de la force horizontale au centre de la base
-        self.base.applyForce(V3D(fx, 0, 0), 0)
+        self.base.applyForce(self._f.set(fx, 0, 0), 0)
+
+
+class NBodyForce(Force):
+    """
+    Forces à longue portée entre toutes les paires de particules (gravitation
+    mutuelle, électrostatique) :
+        F_i = G q_i somme_j q_j (x_j - x_i) / (r² + softening²)^(3/2)
+    où q est l'attribut `charge` des particules : 'mass' pour la gravitation (G > 0,
+    attractive), un attribut de charge électrique pour l'électrostatique (G = -k :
+    les charges de même signe se repoussent).
+
+    Les N² couples ne sont pas parcourus : un arbre de Barnes-Hut (ArbreBarnesHut,
+    quadtree dans le plan, octree en 3D) est reconstruit à chaque pas et les forces
+    de toutes les particules sont obtenues en O(N log N). Un groupe de particules
+    lointain agit par sa charge totale placée en son centre de charge, dès que
+    taille du groupe / distance < theta : theta petit, plus précis et plus lent
+    (erreur relative typique de l'ordre de 1 % à theta = 0.5). softening adoucit
+    les rencontres proches (évite les forces infinies). L'approximation n'étant pas
+    symétrique, la quantité de mouvement n'est conservée qu'à sa précision près.
+    Les charges sont relues à chaque pas : modifier la masse ou la charge d'une
+    particule en cours de simulation est pris en compte au pas suivant.
+
+    - particles : particules concernées (None : toutes celles de l'univers)
+    - leaf_size : particules au plus par feuille de l'arbre
+    """
+
+    def __init__(self, G=1.0, theta=0.5, softening=0.01, charge='mass', particles=None, leaf_size=8,
+                 name='nbody', active=True):
+        super().__init__(ZERO, name, active)
+        if theta <= 0:
+            raise ValueError("l'angle d'ouverture theta doit être positif")
+        if softening < 0:
+            raise ValueError("l'adoucissement doit être positif ou nul")
+        if leaf_size < 1:
+            raise ValueError("une feuille contient au moins une particule")
+        self.G = G                            # Constante du couplage (G, ou -k pour des charges)
+        self.theta = theta                    # Angle d'ouverture de Barnes-Hut
+        self.softening = softening            # Longueur d'adoucissement
+        self.charge = charge                  # Attribut des particules qui porte la charge
+        self.leaf_size = leaf_size
+        self.particles = None if particles is None else list(particles)
+        self._cache = (None, None)            # (clé, particules) des particules visées
+
+    def getSubjects(self):
+        return None if self.particles is None else tuple(self.particles)
+
+    def _charges(self, particules):
+        try:
+            return np.array([getattr(p, self.charge) for p in particules], dtype=np.float64)
+        except AttributeError:
+            raise ValueError("particule sans attribut de charge %r" % self.charge) from None
+
+    def _forces(self, pos, charges):
+        """Forces (N, 3) des particules de positions pos (N, 3), ou None si nulles"""
+        if len(pos) < 2 or not charges.any():
+            return None
+        arbre = ArbreBarnesHut(pos, charges, self.leaf_size)
+        return arbre.champ(self.theta, self.softening) * (self.G * charges)[:, None]
+
+    def applyPair(self, entities=None):
+        """Chemin objet : forces entre les particules visées faisant partie de `entities`"""
+        if not self.active:
+            return
+        cle = (entities, len(entities or ()))    # Membres de l'univers : liste refaite s'ils changent
+        if self._cache[0] is None or self._cache[0][0] is not entities or self._cache[0][1] != cle[1]:
+            sujets = self.particles if self.particles is not None else entities or ()
+            P = [e for e in sujets if isinstance(e, Particule) and (entities is None or e in entities)]
+            self._cache = (cle, P)
+        P = self._cache[1]
+        pos = np.array([(q.x, q.y, q.z) for q in (p.getPosition() for p in P)], dtype=np.float64)
+        F = self._forces(pos, self._charges(P))
+        if F is None:
+            return
+        for p, f in zip(P, F.tolist()):
+            p.applyForce(V3D(*f))
+
+    @staticmethod
+    def soaGroup(soa, forces):
+        """
+        Noyau SoA : positions lues et forces écrites directement dans les tableaux
+        des particules du moteur (de sa portée, voir Ensemble).
+        """
+        for f in forces:
+            if not f.active:
+                continue
+            if f._cache[0] is not soa:
+                if f.particles is None:
+                    idx = np.arange(len(soa.particules))[soa.portee(f)[0]]
+                else:
+                    idx = np.array([soa.p_index[id(p)] for p in f.particles if id(p) in soa.p_index], dtype=np.intp)
+                f._cache = (soa, (idx, [soa.particules[k] for k in idx.tolist()]))
+            idx, P = f._cache[1]
+            F = f._forces(soa.p_pos[idx], f._charges(P))
+            if F is not None:
+                soa.p_F[idx] += F
+        return []
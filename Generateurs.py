@@ -0,0 +1,98 @@
+class Generateurs:
+    """
+    Liste des générateurs de force d'un univers, indexée par entité.
+
+    Chaque force déclare ses sujets (Force.getSubjects) :
+    - None : force globale (gravité, sol...), appliquée à toutes les entités ;
+    - sinon : la force n'est appliquée qu'aux entités listées ;
+    - les interactions entre deux entités (méthode applyPair) sont rangées à part :
+      elles sont évaluées une fois par pas et agissent sur leurs deux extrémités.
+
+    L'univers n'appelle donc setForce que pour les couples (entité, force) utiles :
+    un pas coûte O(forces) au lieu de O(forces x entités). Ajout, retrait et test
+    d'appartenance sont en O(1) (dictionnaires ordonnés par ordre d'ajout).
+
+    S'utilise comme une liste : append, extend, remove, `in`, len, itération (ordre d'ajout).
+    Les sujets sont lus à l'ajout : retirer puis rajouter la force après les avoir changés.
+    Une force n'y figure qu'une fois : l'ajouter de nouveau lève une ValueError.
+    """
+
+    def __init__(self, forces=()):
+        self._forces = {}          # Forces (ensemble ordonné par ordre d'ajout)
+        self.broadcast = {}        # Forces globales (ensemble ordonné)
+        self.parSujet = {}         # entité -> {force: None} des forces qui la visent
+        self.paires = {}           # Interactions à deux corps (ensemble ordonné)
+        self._sujets = {}          # force -> sujets lus à l'ajout (pour le retrait)
+        self.etats = {}            # Forces à état interne (Force.beginStep), mises à jour une fois par pas
+        self.version = 0           # Incrémenté à chaque modification (caches des moteurs)
+        self.extend(forces)
+
+    def __repr__(self):
+        return 'Generateurs(%r)' % list(self)
+
+    def __len__(self):
+        return len(self._forces)
+
+    def __iter__(self):
+        return iter(list(self._forces))
+
+    def __contains__(self, force):
+        return force in self._forces
+
+    def __getitem__(self, i):
+        return list(self)[i]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def append(self, force):
+        """Ajoute une force et l'indexe par sujet (ValueError si elle y est déjà)"""
+        if force in self._forces:
+            raise ValueError('%r déjà présente dans les générateurs' % (force,))
+        self._forces[force] = None
+        self.version += 1
+        if getattr(force, 'beginStep', None) is not None:
+            self.etats[force] = None
+        subjects = force.getSubjects()
+        if hasattr(force, 'applyPair'):
+            self.paires[force] = None
+        elif subjects is None:
+            self.broadcast[force] = None
+        else:
+            subjects = tuple(dict.fromkeys(subjects))  # Un sujet cité deux fois n'est indexé qu'une fois
+            self._sujets[force] = subjects
+            for e in subjects:
+                self.parSujet.setdefault(e, {})[force] = None
+
+    def extend(self, forces):
+        for f in forces:
+            self.append(f)
+
+    def remove(self, force):
+        """Retire la force (ValueError si absente, comme list.remove)"""
+        if force not in self._forces:
+            raise ValueError('%r absente des générateurs' % (force,))
+        self.version += 1
+        del self._forces[force]
+        self.etats.pop(force, None)
+        if force in self.broadcast:
+            del self.broadcast[force]
+            return
+        if force in self.paires:
+            del self.paires[force]
+            return
+        for e in self._sujets.pop(force):
+            forces = self.parSujet.get(e)
+            if forces is not None:
+                forces.pop(force, None)
+                if not forces:
+                    del self.parSujet[e]
+
+    def clear(self):
+        self.version += 1
+        self._sujets.clear()
+        self._forces.clear()
+        self.broadcast.clear()
+        self.parSujet.clear()
+        self.paires.clear()
+        self.etats.clear()
@@ -0,0 +1,90 @@
+import numpy as np
+from math import sqrt
+
+
+# Cellules voisines à examiner depuis une cellule (demi-voisinage : chaque couple de
+# cellules voisines n'est parcouru qu'une fois), en (dx, dy)
+_DEMI_VOISINAGE = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+class GrilleSpatiale:
+    """
+    Phase large des collisions : grille uniforme (plan x, y) couvrant le domaine
+    `dimensions` de l'univers, (0, 0) - (largeur, hauteur).
+
+    Les particules sont rangées par cellule (tri par numéro de cellule) ; deux
+    particules en contact sont dans la même cellule ou dans deux cellules voisines
+    dès que les cellules sont plus larges que le plus grand diamètre. Les couples
+    candidats s'obtiennent donc en O(N) au lieu de comparer les N² couples.
+
+    La grille est refaite à chaque pas, de façon incrémentale : le tri repart de
+    l'ordre du pas précédent, presque trié puisque les particules changent peu de
+    cellule d'un pas à l'autre (tri stable en temps quasi linéaire).
+
+    Taille des cellules : au moins le plus grand diamètre, et assez grande pour
+    qu'il n'y ait pas plus de cellules que de particules. Les particules sorties du
+    domaine sont rangées dans les cellules du bord (résultat exact, plus lent si
+    elles y sont nombreuses).
+    """
+
+    def __init__(self, dimensions=(100, 100)):
+        self.dimensions = (float(dimensions[0]), float(dimensions[1]))
+        if self.dimensions[0] <= 0 or self.dimensions[1] <= 0:
+            raise ValueError("dimensions de la grille invalides : %r" % (dimensions,))
+        self._ordre = None              # Tri du pas précédent (indices des particules)
+
+    def taille(self, n, diametre):
+        """(nx, ny) cellules pour n particules de diamètre maximal `diametre`"""
+        W, H = self.dimensions
+        cote = max(diametre, sqrt(W * H / max(n, 1)))
+        return max(1, int(W / cote)), max(1, int(H / cote))
+
+    def paires(self, pos, diametre):
+        """
+        Couples candidats (i, j), i != j, chacun une seule fois : tableaux d'indices
+        dans pos (N, 2 ou 3). `diametre` : plus grande distance de contact.
+        """
+        n = len(pos)
+        vide = np.zeros(0, dtype=np.intp)
+        if n < 2:
+            return vide, vide
+        W, H = self.dimensions
+        nx, ny = self.taille(n, diametre)
+        cx = np.clip((pos[:, 0] * (nx / W)).astype(np.intp), 0, nx - 1)
+        cy = np.clip((pos[:, 1] * (ny / H)).astype(np.intp), 0, ny - 1)
+        cle = cx + nx * cy
+
+        # Tri incrémental : ordre du pas précédent, retrié (stable) par cellule
+        ordre = self._ordre
+        if ordre is None or len(ordre) != n:
+            ordre = np.arange(n)
+        ordre = ordre[np.argsort(cle[ordre], kind='stable')]
+        self._ordre = ordre
+        cle, cx, cy = cle[ordre], cx[ordre], cy[ordre]
+        compte = np.bincount(cle, minlength=nx * ny)
+        debut = np.cumsum(compte) - compte
+
+        rang = np.arange(n)
+        I, J = [], []
+        for dx, dy in _DEMI_VOISINAGE:
+            vx, vy = cx + dx, cy + dy
+            ok = (vx >= 0) & (vx < nx) & (vy < ny)
+            s = rang[ok]
+            c = vx[ok] + nx * vy[ok]
+            if dx == 0 and dy == 0:
+                premier = s + 1                   # Même cellule : les suivants seulement
+                nombre = debut[c] + compte[c] - premier
+            else:
+                premier = debut[c]
+                nombre = compte[c]
+            garde = nombre > 0
+            s, premier, nombre = s[garde], premier[garde], nombre[garde]
+            if not len(s):
+                continue
+            total = int(nombre.sum())
+            decalage = np.repeat(premier - (np.cumsum(nombre) - nombre), nombre)
+            I.append(np.repeat(s, nombre))
+            J.append(decalage + np.arange(total))
+        if not I:
+            return vide, vide
+        return ordre[np.concatenate(I)], ordre[np.concatenate(J)]
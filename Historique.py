@@ -0,0 +1,389 @@
+import numpy as np
+from copy import copy
+from vector3D import Vector3D as V3D
+
+
+def parsePolicy(policy):
+    """
+    Interprète une politique d'historique et renvoie (mode, n) :
+    - None ou 'all' : tout est enregistré
+    - 'none'        : seule la valeur courante est conservée
+    - 'every=N'     : une valeur enregistrée tous les N pas (décimation)
+    - 'last=K'      : les K dernières valeurs seulement (tampon circulaire)
+    """
+    if policy is None or policy == 'all':
+        return 'all', 1
+    if policy == 'none':
+        return 'none', 1
+    if isinstance(policy, str) and '=' in policy:
+        mode, _, n = policy.partition('=')
+        if mode in ('every', 'last') and n.strip().isdigit() and int(n) > 0:
+            return mode, int(n)
+    raise ValueError("politique d'historique inconnue : %r (attendu 'all', 'none', 'every=N' ou 'last=K')" % (policy,))
+
+
+class Historique:
+    """
+    Historique d'une grandeur scalaire (angle, vitesse angulaire, temps...).
+
+    Les valeurs sont rangées dans un tableau NumPy préalloué (8 octets par valeur)
+    dont la capacité double lorsqu'il est plein. La valeur courante est gardée à part
+    (attribut `last`) : la lecture de l'état courant ne touche pas au tableau.
+
+    S'utilise comme une liste : append, extend, h[-1], h[-1] = v, len(h), itération.
+    L'attribut `array` donne une vue NumPy (sans copie) des valeurs enregistrées.
+
+    La politique (voir parsePolicy) limite ce qui est enregistré ; h[-1] et `last`
+    renvoient toujours la valeur courante, enregistrée ou non.
+
+    fork() renvoie une copie indépendante qui partage les valeurs déjà enregistrées
+    (copie à l'écriture) : les deux historiques gardent ce préfixe commun en lecture
+    seule et enregistrent la suite dans leur propre buffer. Le préfixe est une chaîne
+    de segments figés : un nouveau fork ne fige que la suite enregistrée depuis le
+    précédent, sans recopier le reste. Il n'est recopié (_materialiser) que lors d'un
+    accès à une valeur autre que la courante.
+    """
+
+    width = 1                       # Nombre de flottants par élément
+
+    def __init__(self, first=None, capacity=16, policy=None):
+        self.last = None                               # Valeur courante (dernier élément)
+        self._reset(policy, capacity)
+        if first is not None:
+            self.append(first)
+
+    def _reset(self, policy, capacity=16):
+        """Vide l'historique et prépare les buffers pour la politique donnée"""
+        self.policy = policy
+        self._mode, self._k = parsePolicy(policy)
+        if self._mode == 'none':
+            capacity = 1
+        elif self._mode == 'last':
+            capacity = 2 * self._k                     # Chaque valeur est écrite deux fois
+        self._data = np.empty(capacity * self.width)   # Buffer préalloué
+        self._mv = memoryview(self._data)              # Écriture rapide élément par élément
+        self._cap = capacity                           # Capacité (en éléments)
+        self._n = 0                                    # Nombre d'éléments enregistrés
+        self._offset = 0                               # Premier élément (tampon circulaire)
+        self._count = 0                                # Nombre total d'appels à append
+        self._current = True                           # La valeur courante est-elle enregistrée ?
+        self._bases = ()                               # Segments du préfixe partagé après fork (lecture seule)
+        self._nb = 0                                   # Nombre d'éléments du préfixe partagé
+        # Méthode d'ajout propre à la politique (évite un test par appel)
+        self.append = {'all': self._appendAll, 'none': self._appendNone,
+                       'every': self._appendEvery, 'last': self._appendLast}[self._mode]
+
+    def setPolicy(self, policy):
+        """Change la politique en réenregistrant les valeurs déjà présentes"""
+        values = list(self)
+        last = self.last
+        self._reset(policy)
+        for v in values:
+            self.append(v)
+        if values:
+            self.last = last
+
+    def __len__(self):
+        return self._nb + self._n
+
+    def __repr__(self):
+        return '%s(%d)' % (type(self).__name__, len(self))
+
+    # === Copie à l'écriture ===
+
+    def fork(self):
+        """Copie indépendante, en O(1) : les valeurs enregistrées sont partagées"""
+        clone = copy(self)
+        clone.last = copy(self.last)
+        if self._mode in ('none', 'last'):
+            clone._data = self._data.copy()            # Tampons bornés : copie directe
+            clone._mv = memoryview(clone._data)
+        else:
+            if self._n:                                # Fige la suite : un segment de plus
+                segment = self._data[:self._n * self.width]
+                segment.flags.writeable = False
+                self._bases += (segment,)
+                self._nb += self._n
+                self._nouveauBuffer()
+            clone._bases, clone._nb = self._bases, self._nb
+            clone._nouveauBuffer()
+        # Méthode d'ajout liée au clone (et non à l'original)
+        clone.append = {'all': clone._appendAll, 'none': clone._appendNone,
+                        'every': clone._appendEvery, 'last': clone._appendLast}[clone._mode]
+        return clone
+
+    def __deepcopy__(self, memo):
+        # copy.deepcopy (Univers.fork) : copie à l'écriture plutôt que copie complète
+        return self.fork()
+
+    def _nouveauBuffer(self):
+        # Buffer vide pour les valeurs enregistrées après le préfixe partagé
+        self._data = np.empty(16 * self.width)
+        self._mv = memoryview(self._data)
+        self._cap = 16
+        self._n = 0
+
+    def _materialiser(self):
+        """Recopie préfixe partagé et suite dans un buffer propre (après fork)"""
+        if not self._bases:
+            return
+        w, nb, n = self.width, self._nb, self._n
+        cap = max(16, 2 * (nb + n))
+        data = np.empty(cap * w)
+        i = 0
+        for segment in self._bases:
+            data[i:i + len(segment)] = segment
+            i += len(segment)
+        data[nb * w:(nb + n) * w] = self._data[:n * w]
+        self._data = data
+        self._mv = memoryview(data)
+        self._cap = cap                           # (w peut être nul : bloc sans entité)
+        self._n = nb + n
+        self._bases = ()
+        self._nb = 0
+
+    def _grow(self):
+        """Double la capacité du buffer (croissance géométrique, coût amorti O(1))"""
+        self._cap = 2 * self._cap or 1
+        data = np.empty(self._cap * self.width)
+        data[:len(self._data)] = self._data
+        self._data = data
+        self._mv = memoryview(data)
+
+    def _write(self, n, value):
+        self._mv[n] = value
+
+    def _read(self, n):
+        return float(self._data[n])
+
+    # === Ajout selon la politique ===
+
+    def _appendAll(self, value):
+        """Enregistre toutes les valeurs"""
+        n = self._n
+        if n == self._cap:
+            self._grow()
+        self._write(n, value)
+        self._n = n + 1
+        self.last = value
+
+    def _appendNone(self, value):
+        """Ne conserve que la valeur courante (ligne unique)"""
+        self._write(0, value)
+        self._n = 1
+        self.last = value
+
+    def _appendEvery(self, value):
+        """Enregistre une valeur tous les k appels (la première est toujours gardée)"""
+        if self._count % self._k == 0:
+            self._appendAll(value)
+            self._current = True
+        else:
+            self.last = value
+            self._current = False
+        self._count += 1
+
+    def _appendLast(self, value):
+        """
+        Tampon circulaire de k valeurs. Chaque valeur est écrite aux cases j et j + k :
+        les k dernières valeurs forment toujours une fenêtre contiguë (vue sans copie).
+        """
+        k = self._k
+        j = self._count % k
+        self._write(j, value)
+        self._write(j + k, value)
+        self._count += 1
+        if self._count >= k:
+            self._offset = self._count % k
+            self._n = k
+        else:
+            self._n = self._count
+        self.last = value
+
+    def extend(self, values):
+        """Ajoute plusieurs valeurs, en une seule copie quand tout est enregistré"""
+        if self._mode == 'none':
+            if len(values):
+                self.append(values[-1])                # Seule la dernière valeur compte
+            return
+        if self._mode != 'all' or self.width != 1:
+            for v in values:
+                self.append(v)
+            return
+        m = len(values)
+        if not m:
+            return
+        while self._n + m > self._cap:
+            self._grow()
+        self._data[self._n:self._n + m] = values
+        self._n += m
+        self.last = float(values[-1])
+
+    def setArray(self, values, count=None):
+        """
+        Remplace les valeurs enregistrées par le tableau values ((T,) ou (T, ...), par
+        exemple un ancien `array`) ; sa dernière ligne devient la valeur courante.
+
+        count ('every=N') : nombre d'appels à append qui ont produit ces valeurs. La
+        décimation reprend alors au même point, et si le dernier appel n'a pas été
+        enregistré, h[-1] = v remplace la valeur courante sans toucher aux valeurs.
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.width)
+        T = len(values)
+        self._reset(self.policy, max(16, T))
+        if not T:
+            self.last = None
+            return
+        if self._mode in ('all', 'every'):
+            self._data[:T * self.width] = values.ravel()   # Déjà décimées : copiées telles quelles
+            self._n = T
+            self._count = (T - 1) * self._k + 1 if count is None else int(count)
+            self._current = (self._count - 1) % self._k == 0
+        else:
+            for row in values[-self._k:] if self._mode == 'last' else values[-1:]:
+                self.append(self._depuisLigne(row))
+        self.last = self._depuisLigne(values[-1])
+
+    @staticmethod
+    def _depuisLigne(row):
+        return float(row[0])
+
+    # === Accès de type liste ===
+
+    def _index(self, i):
+        self._materialiser()
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError('indice hors de l\'historique')
+        return i
+
+    def __getitem__(self, i):
+        """h[-1] renvoie la valeur courante ; une tranche renvoie une vue NumPy"""
+        if isinstance(i, slice):
+            return self.array[i]
+        if i == -1 and len(self):
+            return self.last
+        return self._read(self._offset + self._index(i))
+
+    def __setitem__(self, i, value):
+        """Remplace une valeur (h[-1] = v modifie la valeur courante)"""
+        if i == -1:
+            self.last = value
+            if not self._current:
+                return                      # Valeur courante non enregistrée (décimation)
+            if self._bases and self._n:
+                self._write(self._n - 1, value)     # Dans le buffer propre : préfixe partagé intact
+                return
+        i = self._offset + self._index(i)
+        if self._mode == 'last':
+            i %= self._k
+            self._write(i + self._k, value)
+        self._write(i, value)
+
+    def __iter__(self):
+        self._materialiser()
+        for i in range(self._n):
+            yield self._read(self._offset + i)
+
+    @property
+    def array(self):
+        """Vue NumPy (T,) des valeurs enregistrées (invalidée si le buffer grandit)"""
+        self._materialiser()
+        return self._data[self._offset:self._offset + self._n]
+
+
+class HistoriqueV3D(Historique):
+    """
+    Historique d'une grandeur vectorielle (position, vitesse, accélération).
+
+    Stockage colonne : 3 flottants contigus par pas (24 octets au lieu d'un objet
+    Vector3D complet). `array` est une vue (T, 3) ; h[i] renvoie un Vector3D.
+    """
+
+    width = 3
+
+    def _write(self, n, v):
+        j = 3 * n
+        mv = self._mv
+        mv[j] = v.x
+        mv[j + 1] = v.y
+        mv[j + 2] = v.z
+
+    def _read(self, n):
+        x, y, z = self._data[3 * n:3 * n + 3].tolist()
+        return V3D(x, y, z)
+
+    @staticmethod
+    def _depuisLigne(row):
+        x, y, z = row.tolist()
+        return V3D(x, y, z)
+
+    @property
+    def array(self):
+        """Vue NumPy (T, 3) des valeurs enregistrées (invalidée si le buffer grandit)"""
+        self._materialiser()
+        return self._data[3 * self._offset:3 * (self._offset + self._n)].reshape(self._n, 3)
+
+
+class HistoriqueBloc(Historique):
+    """
+    Historique d'un bloc NumPy de forme fixe (par exemple les positions (N, 3) de toutes
+    les particules d'un univers). Un seul tableau (T, ...) pour l'ensemble des entités :
+    `array[:, i]` est la trajectoire de l'entité i, sans copie.
+    """
+
+    def __init__(self, shape, first=None, policy=None):
+        self.shape = tuple(shape)
+        self.width = int(np.prod(self.shape))      # Nombre de flottants par bloc
+        super().__init__(first, policy=policy)
+
+    def _write(self, n, block):
+        w = self.width
+        self._data[n * w:(n + 1) * w] = np.ravel(block)
+
+    def _read(self, n):
+        w = self.width
+        return self._data[n * w:(n + 1) * w].reshape(self.shape).copy()
+
+    def _depuisLigne(self, row):
+        return row.reshape(self.shape).copy()
+
+    def reprendre(self, shape, colonnes, courant):
+        """
+        Nouveau bloc de forme `shape` qui continue cet historique (moteur SoA reconstruit
+        après un ajout d'entités) : son entité j reprend la trajectoire de l'entité
+        colonnes[j] de ce bloc, -1 pour une entité nouvelle (NaN avant son ajout).
+        `courant` est la valeur courante. Position dans la décimation ('every=N') et
+        dans le tampon circulaire ('last=K') conservées : la suite est enregistrée
+        aux mêmes pas que sans reconstruction.
+        """
+        colonnes = np.asarray(colonnes, dtype=np.intp).reshape(-1)
+        nouveau = HistoriqueBloc(shape, policy=self.policy)
+        anciennes = self.array                         # (T, n, ...) dans l'ordre chronologique
+        T = len(anciennes)
+        valeurs = np.full((T,) + nouveau.shape, np.nan)
+        garde = colonnes >= 0
+        valeurs[:, garde] = anciennes[:, colonnes[garde]]
+        if T and self._current:
+            valeurs[-1] = courant                      # Dernier enregistrement : l'état courant
+        if self._mode == 'last':
+            k = self._k
+            for r, ligne in enumerate(valeurs):        # Mêmes cases j et j + k qu'avant
+                nouveau._write((self._offset + r) % k, ligne)
+                nouveau._write((self._offset + r) % k + k, ligne)
+        else:
+            while nouveau._cap < T:
+                nouveau._grow()
+            nouveau._data[:T * nouveau.width] = valeurs.ravel()
+        nouveau._n, nouveau._offset = T, self._offset
+        nouveau._count, nouveau._current = self._count, self._current
+        nouveau.last = np.array(courant, dtype=np.float64).reshape(nouveau.shape)
+        return nouveau
+
+    @property
+    def array(self):
+        """Vue NumPy (T, *shape) des blocs enregistrés (invalidée si le buffer grandit)"""
+        self._materialiser()
+        w = self.width
+        return self._data[self._offset * w:(self._offset + self._n) * w].reshape((self._n,) + self.shape)
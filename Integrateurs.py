@@ -0,0 +1,481 @@
+import numpy as np
+from math import cos, sin
+from vector3D import Vector3D as V3D
+
+
+# === Schémas d'intégration ===
+# Chaque schéma avance le système d'un pas. Le système expose :
+# - getState() -> (q, v) : positions et vitesses généralisées (tableaux plats, copies)
+# - accelerations(q, v) -> a : place le système dans l'état (q, v), évalue les générateurs
+#   et renvoie les accélérations (nulles pour les entités fixes)
+# - commit(q, v, a) : enregistre le nouvel état (historiques)
+# Les générateurs sont réévalués à chaque étage du schéma ; leur état interne (intégrale
+# d'un PID...) n'avance qu'une fois par pas, avant le schéma (Force.beginStep).
+
+def symplecticEuler(systeme, step):
+    """Euler semi-implicite : v(t+h) = v + a h, puis q(t+h) = q + v(t+h) h (1 évaluation)"""
+    q, v = systeme.getState()
+    a = systeme.accelerations(q, v)
+    v = v + a * step
+    q = q + v * step
+    systeme.commit(q, v, a)
+
+
+def verlet(systeme, step):
+    """Verlet vitesse : demi-pas de vitesse, position, nouvelle force, demi-pas (2 évaluations)"""
+    q, v = systeme.getState()
+    a = systeme.accelerations(q, v)
+    v_demi = v + a * (0.5 * step)
+    q = q + v_demi * step
+    a1 = systeme.accelerations(q, v_demi)
+    v = v_demi + a1 * (0.5 * step)
+    systeme.commit(q, v, a1)
+
+
+def rk4(systeme, step):
+    """Runge-Kutta classique d'ordre 4 (4 évaluations)"""
+    q, v = systeme.getState()
+    h = step
+    k1q, k1v = v, systeme.accelerations(q, v)
+    k2q = v + k1v * (h / 2)
+    k2v = systeme.accelerations(q + k1q * (h / 2), k2q)
+    k3q = v + k2v * (h / 2)
+    k3v = systeme.accelerations(q + k2q * (h / 2), k3q)
+    k4q = v + k3v * h
+    k4v = systeme.accelerations(q + k3q * h, k4q)
+    q = q + (k1q + 2 * k2q + 2 * k3q + k4q) * (h / 6)
+    v = v + (k1v + 2 * k2v + 2 * k3v + k4v) * (h / 6)
+    systeme.commit(q, v, k1v)
+
+
+# === Euler implicite linéarisé pour les réseaux de ressorts raides ===
+# Les générateurs marqués `stiff` (ressorts, liaisons, pivots) sont linéarisés : leurs
+# jacobiennes K = dF/dq et C = dF/dv sont assemblées sur les seuls degrés de liberté de
+# leurs sujets. Les autres forces restent explicites. Un système linéaire par pas :
+#     (M - h C - h² K) dv = h (F + h K v),   v(t+h) = v + dv,   q(t+h) = q + h v(t+h)
+# Le système expose en plus : entites, dofs(e), setEntity(e, qe, ve), forceLocale(g, sujets).
+#
+# Les générateurs qui se décrivent comme un ressort-amortisseur entre deux points
+# (Force.ressort) ont des jacobiennes analytiques, calculées pour tous à la fois ; les
+# autres générateurs raides sont dérivés par différences finies locales.
+
+def _ressorts(systeme, q, v, ressorts, termes):
+    """
+    Blocs analytiques de K et C pour des ressorts-amortisseurs entre deux points A et B.
+
+    Un point est une particule, un point d'une barre (C + h (cos θ, sin θ, 0), h = point L/2)
+    ou un point fixe (V3D, sans degré de liberté). La force sur A vaut, avec Δ = B - A,
+    Δv = vB - vA, d = |Δ| et n = Δ / d :
+    - l0 donné : F = n (k (d - l0) + c Δv.n)  (B reçoit -F)
+    - l0 None  : F = k Δ + c Δv               (ressort de longueur nulle, PivotBarre)
+    Les forces généralisées d'une barre sont (F, r⊥.F), r⊥ = dA/dθ = h (-sin θ, cos θ, 0).
+    """
+    N = len(ressorts)
+    idx = np.full((N, 8), -1)                     # Degrés de liberté de A puis B (-1 : aucun)
+    h = np.zeros((N, 2))
+    fixe = np.zeros((N, 2, 3))
+    for s, (A, pA, B, pB, _, _, _) in enumerate(ressorts):
+        for j, (e, p) in enumerate(((A, pA), (B, pB))):
+            if isinstance(e, V3D):
+                fixe[s, j] = (e.x, e.y, e.z)
+                continue
+            d = systeme.dofs(e)
+            idx[s, 4 * j:4 * j + len(d)] = d
+            if len(d) == 4:
+                h[s, j] = p * e.L / 2
+    k, c = np.array([r[4:6] for r in ressorts], dtype=np.float64).T
+    vectoriel = np.array([r[6] is None for r in ressorts])
+    l0 = np.array([0.0 if r[6] is None else r[6] for r in ressorts])
+
+    # Positions et vitesses des deux points, bras de levier r et r⊥ (N, 2, 3)
+    it = idx[:, 3::4]
+    barre = it >= 0
+    theta = np.where(barre, q[it], 0.0)
+    omega = np.where(barre, v[it], 0.0)
+    hc, hs = h * np.cos(theta), h * np.sin(theta)
+    r = np.zeros((N, 2, 3))
+    rp = np.zeros((N, 2, 3))
+    r[:, :, 0], r[:, :, 1] = hc, hs
+    rp[:, :, 0], rp[:, :, 1] = -hs, hc
+    i3 = idx.reshape(N, 2, 4)[:, :, :3]
+    mobile = i3[:, :, :1] >= 0
+    P = np.where(mobile, q[i3] + r, fixe)
+    V = np.where(mobile, v[i3] + omega[:, :, None] * rp, 0.0)
+    D = P[:, 1] - P[:, 0]
+    Dv = V[:, 1] - V[:, 0]
+
+    # dF/dΔ (Gx), dF/dΔv (Gv) et F
+    I = np.eye(3)
+    d = np.sqrt(np.einsum('ij,ij->i', D, D))
+    nul = d < 1e-12
+    ds = np.where(nul, 1.0, d)
+    n = D / ds[:, None]
+    nn = n[:, :, None] * n[:, None, :]
+    proj = (I - nn) / ds[:, None, None]
+    vn = np.einsum('ij,ij->i', Dv, n)
+    s = k * (d - l0) + c * vn
+    Gx = (k[:, None, None] * nn + s[:, None, None] * proj
+          + c[:, None, None] * n[:, :, None] * np.einsum('ij,ijk->ik', Dv, proj)[:, None, :])
+    Gv = c[:, None, None] * nn
+    F = n * s[:, None]
+    if vectoriel.any():
+        Gx[vectoriel] = k[vectoriel, None, None] * I
+        Gv[vectoriel] = c[vectoriel, None, None] * I
+        F[vectoriel] = k[vectoriel, None] * D[vectoriel] + c[vectoriel, None] * Dv[vectoriel]
+        nul &= ~vectoriel
+    if nul.any():
+        Gx[nul] = 0.0
+        Gv[nul] = 0.0
+        F[nul] = 0.0
+
+    # Jacobiennes des points, A et B côte à côte (3 x 8) : dP/dq = dvP/dv = [I | r⊥],
+    # dvP/dθ = -ω r (W = [0 | ω r])
+    Jp = np.zeros((N, 3, 8))
+    Jp[:, :, 0:3] = I
+    Jp[:, :, 4:7] = I
+    Jp[:, :, 3::4] = np.swapaxes(rp, 1, 2)
+    W = np.zeros((N, 3, 8))
+    W[:, :, 3::4] = np.swapaxes(omega[:, :, None] * r, 1, 2)
+    signe = np.repeat([-1.0, 1.0], 4)                          # Δ = B - A
+    T = np.swapaxes(Jp, 1, 2) * -signe[:, None]                # A reçoit F, B reçoit -F
+    blocs = {'K': T @ ((Gx @ Jp - Gv @ W) * signe),            # dQ/dq
+             'C': T @ ((Gv @ Jp) * signe)}                     # dQ/dv
+    # Variation du bras de levier : d(r⊥.F)/dθ = -r.F pour A, +r.F pour B
+    blocs['K'][:, 3, 3] -= np.einsum('ij,ij->i', r[:, 0], F)
+    blocs['K'][:, 7, 7] += np.einsum('ij,ij->i', r[:, 1], F)
+
+    garde = (idx[:, :, None] >= 0) & (idx[:, None, :] >= 0)
+    lignes = np.broadcast_to(idx[:, :, None], garde.shape)[garde]
+    colonnes = np.broadcast_to(idx[:, None, :], garde.shape)[garde]
+    for nom in ('K', 'C'):
+        termes[nom][0].append(lignes)
+        termes[nom][1].append(colonnes)
+        termes[nom][2].append(blocs[nom][garde])
+
+
+def jacobiennes(systeme, q, v, dense=False):
+    """
+    Assemble K = dF/dq et C = dF/dv des générateurs raides : matrices creuses
+    (scipy.sparse, format CSR), ou tableaux NumPy si dense est vrai
+    """
+    n = len(q)
+    termes = {'K': ([], [], []), 'C': ([], [], [])}       # (lignes, colonnes, valeurs)
+    presents = set(systeme.entites)
+    ressorts = []
+    for g in systeme.generators:
+        if not getattr(g, 'stiff', False) or not g.active:
+            continue
+        sujets = [e for e in dict.fromkeys(g.getSubjects()) if e in presents]
+        if not sujets:
+            continue
+        if g.ressort is not None:
+            r = g.ressort()
+            if all(isinstance(e, V3D) or e in presents for e in (r[0], r[2])):
+                ressorts.append(r)
+                continue
+        idx = np.concatenate([systeme.dofs(e) for e in sujets])
+        qe, ve = q[idx], v[idx]
+
+        def evaluer():
+            j = 0
+            for e in sujets:
+                m = len(systeme.dofs(e))
+                systeme.setEntity(e, qe[j:j + m], ve[j:j + m])
+                j += m
+            return systeme.forceLocale(g, sujets)
+
+        f0 = evaluer()
+        for k in range(len(idx)):
+            for x, nom in ((qe, 'K'), (ve, 'C')):
+                eps = 1e-7 * max(1.0, abs(x[k]))
+                x0 = x[k]
+                x[k] = x0 + eps
+                df = (evaluer() - f0) / eps
+                x[k] = x0
+                nz = np.nonzero(df)[0]
+                lignes, colonnes, valeurs = termes[nom]
+                lignes.append(idx[nz])
+                colonnes.append(np.full(len(nz), idx[k]))
+                valeurs.append(df[nz])
+        evaluer()                                   # Remet les sujets dans l'état (q, v)
+    if ressorts:
+        _ressorts(systeme, q, v, ressorts, termes)
+
+    def assembler(lignes, colonnes, valeurs):
+        if dense:
+            M = np.zeros(n * n)
+            if valeurs:
+                np.add.at(M, np.concatenate(lignes) * n + np.concatenate(colonnes), np.concatenate(valeurs))
+            return M.reshape(n, n)
+        from scipy.sparse import coo_matrix, csr_matrix
+        if not valeurs:
+            return csr_matrix((n, n))
+        return coo_matrix((np.concatenate(valeurs), (np.concatenate(lignes), np.concatenate(colonnes))),
+                          shape=(n, n)).tocsr()
+
+    return assembler(*termes['K']), assembler(*termes['C'])
+
+
+# Au-delà de cette taille (degrés de liberté), le système est assemblé et résolu en creux ;
+# en deçà, le coût des structures creuses dépasse celui d'une résolution dense.
+IMPLICITE_DENSE_MAX = 300
+
+
+def implicitEuler(systeme, step):
+    """Euler implicite linéarisé (une résolution linéaire par pas), stable pour les ressorts raides"""
+    h = step
+    q, v = systeme.getState()
+    a = systeme.accelerations(q, v)
+    F = a * systeme.mass                            # Forces généralisées (nulles si fixe)
+    dense = len(q) <= IMPLICITE_DENSE_MAX
+    K, C = jacobiennes(systeme, q, v, dense)
+
+    b = h * (F + h * (K @ v))
+    # Degrés de liberté fixes : dv = 0
+    libres = ~systeme.fix
+    b[systeme.fix] = 0.0
+    if dense:
+        A = -h * C - h * h * K
+        A[np.diag_indices_from(A)] += systeme.mass
+        A[systeme.fix] = 0.0
+        A[systeme.fix, systeme.fix] = 1.0
+        dv = np.linalg.solve(A, b) if len(b) else b
+    else:
+        from scipy.sparse import diags
+        from scipy.sparse.linalg import spsolve
+        A = (diags(systeme.mass) - h * C - h * h * K).tolil()
+        for i in np.nonzero(systeme.fix)[0]:
+            A.rows[i], A.data[i] = [i], [1.0]
+        dv = spsolve(A.tocsc(), b) if len(b) else b
+    dv[systeme.fix] = 0.0
+
+    v = v + dv
+    q = q + h * v
+    systeme.commit(q, v, np.where(libres, dv / h, 0.0))
+
+
+# === Pas adaptatif : Dormand-Prince 5(4) ===
+# Tableau de Butcher (c, a), solution d'ordre 5 (b) et écart avec l'ordre 4 (e = b - b*)
+_DP_C = (0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1)
+_DP_A = ((),
+         (1 / 5,),
+         (3 / 40, 9 / 40),
+         (44 / 45, -56 / 15, 32 / 9),
+         (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+         (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656))
+_DP_B = (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84)
+_DP_E = (71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+
+def dormandPrince(systeme, h, rtol, atol, min_step=0.0, max_step=float('inf'), evenement=None):
+    """
+    Un pas adaptatif (Dormand-Prince 5(4), 7 évaluations par essai) sur y = (q, v).
+
+    L'erreur estimée est comparée à atol + rtol * |y| (norme quadratique moyenne) :
+    le pas est réduit et recommencé tant qu'elle dépasse 1, sauf à min_step où il est
+    accepté. Renvoie (pas effectué, pas proposé pour la suite).
+
+    evenement() est appelé le système placé en fin de pas : s'il renvoie True (contact
+    franchi), le pas est divisé par deux jusqu'à min_step pour localiser l'instant du contact.
+    """
+    q0, v0 = systeme.getState()
+    a0 = systeme.accelerations(q0, v0)
+    while True:
+        kq, kv = [v0], [a0]
+        for i in range(1, 6):
+            q = q0 + h * sum(c * k for c, k in zip(_DP_A[i], kq))
+            v = v0 + h * sum(c * k for c, k in zip(_DP_A[i], kv))
+            kq.append(v)
+            kv.append(systeme.accelerations(q, v))
+        q1 = q0 + h * sum(b * k for b, k in zip(_DP_B, kq))
+        v1 = v0 + h * sum(b * k for b, k in zip(_DP_B, kv))
+        kq.append(v1)
+        kv.append(systeme.accelerations(q1, v1))          # Laisse le système en fin de pas
+
+        if evenement is not None and h > min_step and evenement():
+            h = max(h / 2, min_step)
+            continue
+
+        eq = h * sum(e * k for e, k in zip(_DP_E, kq))
+        ev = h * sum(e * k for e, k in zip(_DP_E, kv))
+        sq = atol + rtol * np.maximum(np.abs(q0), np.abs(q1))
+        sv = atol + rtol * np.maximum(np.abs(v0), np.abs(v1))
+        n = len(q0) + len(v0)
+        err = np.sqrt((np.sum((eq / sq)**2) + np.sum((ev / sv)**2)) / n) if n else 0.0
+
+        # Facteur de pas classique, borné entre 0.2 et 5
+        facteur = 5.0 if err == 0 else min(5.0, max(0.2, 0.9 * err**-0.2))
+        if err <= 1 or h <= min_step:
+            systeme.commit(q1, v1, a0)
+            return h, min(max(h * facteur, min_step), max_step)
+        h = max(h * facteur, min_step)
+
+
+# 'explicit' : schéma historique de Particule.pfd / Barre.pfd (entités mises à jour une à une)
+INTEGRATEURS = {'explicit': None, 'symplectic_euler': symplecticEuler, 'verlet': verlet, 'rk4': rk4,
+                'implicit_euler': implicitEuler}
+
+
+def getIntegrateur(nom):
+    """Renvoie le schéma associé au nom (None pour 'explicit'), ValueError sinon"""
+    if nom not in INTEGRATEURS:
+        raise ValueError("intégrateur inconnu : %r (attendu %s)" % (nom, ', '.join(map(repr, INTEGRATEURS))))
+    return INTEGRATEURS[nom]
+
+
+class SystemeObjets:
+    """
+    Vue « état généralisé » des particules et barres d'un univers (moteur objet),
+    utilisée par les schémas d'intégration.
+
+    q = [positions des particules (3 par particule), positions des barres (3 par barre),
+         angles des barres (1 par barre)] ; v et a suivent la même disposition.
+    Les états intermédiaires sont placés dans la valeur courante (`last`) des historiques
+    le temps d'évaluer les forces ; seul commit enregistre un nouveau pas.
+    """
+
+    def __init__(self, univers):
+        self.univers = univers
+        self.particules = list(univers.population)
+        self.barres = list(univers.barres)
+        P, B = self.particules, self.barres
+        self.i_barres = 3 * len(P)                  # Indice des positions des barres dans q
+        self.i_angles = self.i_barres + 3 * len(B)  # Indice des angles des barres dans q
+
+        self.mass = np.concatenate([np.repeat([p.mass for p in P], 3),
+                                    np.repeat([b.mass for b in B], 3),
+                                    [b.getInertia() for b in B]]).astype(np.float64)
+        self.fix = np.concatenate([np.repeat([bool(p.fix) for p in P], 3),
+                                   np.repeat([bool(b.fix) for b in B], 3),
+                                   [bool(b.fix) for b in B]]).astype(bool)
+        self.impulsions = True      # False : forces impulsionnelles ignorées (pas adaptatif)
+
+        # Degrés de liberté de chaque entité dans q (pour les jacobiennes locales)
+        self.generators = univers.generators
+        self.entites = P + B
+        self._dofs = {}
+        for i, p in enumerate(P):
+            self._dofs[p] = np.arange(3 * i, 3 * i + 3)
+        for i, b in enumerate(B):
+            j = self.i_barres + 3 * i
+            self._dofs[b] = np.array([j, j + 1, j + 2, self.i_angles + i])
+
+    def getState(self):
+        P, B = self.particules, self.barres
+        q = [c for p in P for c in self._xyz(p.position.last)]
+        q += [c for b in B for c in self._xyz(b.position.last)]
+        q += [b.theta.last for b in B]
+        v = [c for p in P for c in self._xyz(p.speed.last)]
+        v += [c for b in B for c in self._xyz(b.speed.last)]
+        v += [b.omega.last for b in B]
+        q = np.array(q, dtype=np.float64)
+        v = np.array(v, dtype=np.float64)
+        v[self.fix] = 0.0                         # Les entités fixes ne bougent pas
+        return q, v
+
+    @staticmethod
+    def _xyz(u):
+        return (u.x, u.y, u.z)
+
+    def _setState(self, q, v):
+        """Place les valeurs courantes des historiques dans l'état (q, v)"""
+        qs, vs = q.tolist(), v.tolist()
+        nb = self.i_angles
+        for i, p in enumerate(self.particules):
+            j = 3 * i
+            p.position.last = V3D(qs[j], qs[j + 1], qs[j + 2])
+            p.speed.last = V3D(vs[j], vs[j + 1], vs[j + 2])
+        for i, b in enumerate(self.barres):
+            j = self.i_barres + 3 * i
+            b.position.last = V3D(qs[j], qs[j + 1], qs[j + 2])
+            b.speed.last = V3D(vs[j], vs[j + 1], vs[j + 2])
+            b.theta.last = qs[nb + i]
+            b.omega.last = vs[nb + i]
+
+    def accelerations(self, q, v):
+        self._setState(q, v)
+        self.univers.applyForces(self.impulsions)
+
+        # Lecture puis remise à zéro des accumulateurs de forces
+        F = []
+        for p in self.particules:
+            F += self._xyz(p.forces)
+            p.forces.set(0, 0, 0)
+        moments = []
+        for b in self.barres:
+            F += self._xyz(b.forces)
+            fp = b.forces_pts
+            theta = b.theta.last
+            moments.append((b.L / 2) * (cos(theta) * fp.y - sin(theta) * fp.x))
+            b.forces.set(0, 0, 0)
+            fp.set(0, 0, 0)
+
+        a = np.array(F + moments, dtype=np.float64) / self.mass
+        a[self.fix] = 0.0
+        return a
+
+    def dofs(self, e):
+        return self._dofs[e]
+
+    def setEntity(self, e, qe, ve):
+        """Place une seule entité dans l'état (qe, ve) (3 composantes, plus l'angle pour une barre)"""
+        e.position.last = V3D(qe[0], qe[1], qe[2])
+        e.speed.last = V3D(ve[0], ve[1], ve[2])
+        if len(qe) == 4:
+            e.theta.last = qe[3]
+            e.omega.last = ve[3]
+
+    def forceLocale(self, g, sujets):
+        """Forces généralisées exercées par le seul générateur g sur ses sujets"""
+        for e in sujets:
+            e.forces.set(0, 0, 0)
+            if len(self._dofs[e]) == 4:
+                e.forces_pts.set(0, 0, 0)
+        if hasattr(g, 'applyPair'):
+            g.applyPair(sujets)
+        else:
+            for e in sujets:
+                g.setForce(e)
+        f = []
+        for e in sujets:
+            f += self._xyz(e.forces)
+            e.forces.set(0, 0, 0)
+            if len(self._dofs[e]) == 4:
+                fp = e.forces_pts
+                theta = e.theta.last
+                f.append((e.L / 2) * (cos(theta) * fp.y - sin(theta) * fp.x))
+                fp.set(0, 0, 0)
+        return np.array(f, dtype=np.float64)
+
+    def amend(self, q, v):
+        """Remplace positions et vitesses du dernier pas enregistré (liaisons, voir Contraintes.py)"""
+        qs, vs = q.tolist(), v.tolist()
+        nb = self.i_angles
+        for i, p in enumerate(self.particules):
+            j = 3 * i
+            p.position[-1] = V3D(qs[j], qs[j + 1], qs[j + 2])
+            p.speed[-1] = V3D(vs[j], vs[j + 1], vs[j + 2])
+        for i, b in enumerate(self.barres):
+            j = self.i_barres + 3 * i
+            b.position[-1] = V3D(qs[j], qs[j + 1], qs[j + 2])
+            b.speed[-1] = V3D(vs[j], vs[j + 1], vs[j + 2])
+            b.theta[-1] = qs[nb + i]
+            b.omega[-1] = vs[nb + i]
+
+    def commit(self, q, v, a):
+        """Enregistre le nouveau pas dans les historiques (remplace l'état des étages)"""
+        qs, vs, acc = q.tolist(), v.tolist(), a.tolist()
+        nb = self.i_angles
+        for i, p in enumerate(self.particules):
+            j = 3 * i
+            p.acceleration.append(V3D(acc[j], acc[j + 1], acc[j + 2]))
+            p.speed.append(V3D(vs[j], vs[j + 1], vs[j + 2]))
+            p.position.append(V3D(qs[j], qs[j + 1], qs[j + 2]))
+        for i, b in enumerate(self.barres):
+            j = self.i_barres + 3 * i
+            b.acceleration.append(V3D(acc[j], acc[j + 1], acc[j + 2]))
+            b.speed.append(V3D(vs[j], vs[j + 1], vs[j + 2]))
+            b.position.append(V3D(qs[j], qs[j + 1], qs[j + 2]))
+            b.alpha.append(acc[nb + i])
+            b.omega.append(vs[nb + i])
+            b.theta.append(qs[nb + i])
@@ -1,10 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import pygame
 from vector3D import Vector3D as v
 
 # === Classe représentant un moteur à courant continu (CC) ===
 class MoteurCC:
+    # États internes enregistrés par Univers.checkpoint
+    checkpointFields = ('i', 'Omega', 'Gamma', 'position')
+
     def __init__(self, R, L, k_c, k_e, J, f, p=v()):
         # === Caractéristiques physiques ===
         self.R = R       # Résistance (Ohm)
@@ -95,10 +96,12 @@ class MoteurCC:
 
     # === Affichage graphique avec pygame ===
     def gameDraw(self, scale, screen):
+        import pygame
+
         X = self.x * scale
         Y = self.y * scale
         pygame.draw.circle(screen, (0, 0, 0), (int(X), int(Y)), 20)        # Centre noir
-        pygame.draw.circle(screen, (0, 0, 128), (int(X), int(Y)), 40, 2)   # Anneau bleu
+        return pygame.draw.circle(screen, (0, 0, 128), (int(X), int(Y)), 40, 2)   # Anneau bleu (zone dessinée)
 
     # === Solution analytique de la vitesse angulaire ===
     def solution_analytique(self, time, Um, R, k_c, k_e, J, f):
@@ -1,16 +1,18 @@
-from vector3D import Vector3D as V3D
+from vector3D import Vector3D as V3D, ZERO
+from Historique import HistoriqueV3D
 from math import pi, atan2
 
 class Particule(object):
     
-    def __init__(self, mass=1, p0=V3D(), v0=V3D(), a0=V3D(), fix=False, name="paf", color='red'):
+    def __init__(self, mass=1, p0=ZERO, v0=ZERO, a0=ZERO, fix=False, name="paf", color='red', history=None):
         self.mass = mass                     # Masse de la particule (en kg)
-        self.position = [p0]                 # Liste des positions successives
-        self.speed = [v0]                    # Liste des vitesses successives
-        self.acceleration = [a0]             # Liste des accélérations successives
+        self.history = history               # Politique d'historique (None : celle de l'univers)
+        self.position = HistoriqueV3D(p0, policy=history)      # Historique des positions successives
+        self.speed = HistoriqueV3D(v0, policy=history)         # Historique des vitesses successives
+        self.acceleration = HistoriqueV3D(a0, policy=history)  # Historique des accélérations successives
         self.name = name                     # Nom de la particule (affichage/debug)
         self.color = color                   # Couleur utilisée pour l'affichage
-        self.forces = V3D()                  # Force résultante appliquée (initialement nulle)
+        self.forces = V3D()                  # Force résultante appliquée (accumulée en place)
         self.fix = fix                       # Booléen : True si la particule est fixe
 
     def __str__(self):
@@ -21,72 +23,96 @@ class Particule(object):
         return str(self)
 
     def applyForce(self, *args):
-        # Ajoute les forces externes à la force résultante
+        # Ajoute les forces externes à la force résultante (en place, sans allocation)
         for f in args:
             self.forces += f
 
+    def applyScaledForce(self, f, s):
+        # Ajoute s * f à la force résultante sans créer de vecteur temporaire
+        self.forces.add_scaled(f, s)
+
+    def setHistory(self, policy):
+        # Change la politique d'historique : 'all', 'none', 'every=N' ou 'last=K'
+        self.history = policy
+        for h in (self.position, self.speed, self.acceleration):
+            h.setPolicy(policy)
+
     def simulate(self, step):
         # Applique un pas de simulation via le PFD
         self.pfd(step)
         
     def pfd(self, step):
         # Applique le Principe Fondamental de la Dynamique pour calculer a, v, p
-        
+        v_old = self.speed.last
+
         if not(self.fix):  # Si la particule est mobile
             a = self.forces * (1/self.mass)                     # Accélération = F / m
-            v = self.speed[-1] + a * step                       # Vitesse = v + a*dt
+            v = v_old.copy().add_scaled(a, step)                # Vitesse = v + a*dt
         else:  # Si la particule est fixe
-            a = V3D()
-            v = V3D()
+            a = ZERO
+            v = ZERO
 
         # Position = p + v*dt + 0.5*a*dt²
-        p = self.position[-1] + 0.5 * a * step**2 + self.speed[-1] * step
+        p = self.position.last.copy()
+        p.add_scaled(a, 0.5 * step**2)
+        p.add_scaled(v_old, step)
 
         # Enregistrement des nouvelles valeurs
         self.acceleration.append(a)
         self.speed.append(v)
         self.position.append(p)
 
-        # Réinitialisation des forces (prêtes pour le prochain cycle)
-        self.forces = V3D()
+        # Réinitialisation des forces en place (prêtes pour le prochain cycle)
+        self.forces.set(0, 0, 0)
 
     def plot(self):
         # Trace la trajectoire de la particule avec matplotlib
         from pylab import plot
-        X = []
-        Y = []
-        for p in self.position:
-            X.append(p.x)
-            Y.append(p.y)
-    
-        return plot(X, Y, color=self.color, label=self.name) + plot(X[-1], Y[-1], 'o', color=self.color)    
+        P = self.positions
+        return plot(P[:, 0], P[:, 1], color=self.color, label=self.name) + plot(P[-1, 0], P[-1, 1], 'o', color=self.color)
+
+    # Trajectoires complètes sous forme de tableaux NumPy (T, 3), sans copie
+    @property
+    def positions(self):
+        return self.position.array
+
+    @property
+    def speeds(self):
+        return self.speed.array
+
+    @property
+    def accelerations(self):
+        return self.acceleration.array
 
     def getPosition(self):
         # Retourne la dernière position connue
-        return self.position[-1]
+        return self.position.last
     
     def getSpeed(self):
         # Retourne la dernière vitesse connue
-        return self.speed[-1]
+        return self.speed.last
     
+    def gameColor(self):
+        # Couleur pour pygame (supporte RGB normalisé ou nom)
+        if type(self.color) is tuple:
+            return (self.color[0]*255, self.color[1]*255, self.color[2]*255)
+        return self.color
+
     def gameDraw(self, scale, screen):
         import pygame
         
         # Conversion coordonnées physiques -> écran
-        X = int(scale * self.getPosition().x)
-        Y = int(scale * self.getPosition().y)
+        p, v = self.getPosition(), self.getSpeed()
+        X = int(scale * p.x)
+        Y = int(scale * p.y)
         
-        VX = int(scale * self.getSpeed().x)
-        VY = int(scale * self.getSpeed().y) 
+        VX = int(scale * v.x)
+        VY = int(scale * v.y)
         size = 3
-        
-        # Gestion de la couleur (supporte RGB normalisé ou nom)
-        if type(self.color) is tuple:
-            color = (self.color[0]*255, self.color[1]*255, self.color[2]*255)
-        else:
-            color = self.color
+        color = self.gameColor()
             
-        # Dessin du point et du vecteur vitesse
-        pygame.draw.circle(screen, color, (X, Y), size * 2)
-        pygame.draw.line(screen, color, (X, Y), (X + VX, Y + VY), size)
+        # Dessin du point et du vecteur vitesse (renvoie la zone dessinée, voir Rendu)
+        # (Rendu.dessinerEtat dessine de même toute une population en un lot)
+        zone = pygame.draw.circle(screen, color, (X, Y), size * 2)
+        return zone.union(pygame.draw.line(screen, color, (X, Y), (X + VX, Y + VY), size))
 
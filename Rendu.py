@@ -0,0 +1,308 @@
+from collections import OrderedDict
+import numpy as np
+import pygame
+
+
+# === Caches partagés (vidés par pygame.quit : polices et surfaces deviennent invalides) ===
+
+_polices = {}               # (nom, taille, système) -> pygame.font.Font
+_textes = OrderedDict()     # (chaîne, police, couleur, fond) -> Surface, du moins au plus récent
+_fonds = {}                 # paramètres de fondGrille -> Surface
+_sprites = {}               # (couleur, rayon) -> disque pré-dessiné
+MAX_TEXTES = 256            # Surfaces de texte gardées (les moins récemment utilisées sont oubliées)
+_session = [False]          # _vider enregistré auprès de pygame.quit pour la session en cours
+
+
+def _vider():
+    _polices.clear()
+    _textes.clear()
+    _fonds.clear()
+    _sprites.clear()
+    _session[0] = False
+
+
+def _enregistrer():
+    # pygame.quit oublie les fonctions enregistrées après les avoir appelées :
+    # réenregistrer à chaque session qui remplit les caches
+    if not _session[0]:
+        pygame.register_quit(_vider)
+        _session[0] = True
+
+
+def police(taille, nom=None, systeme=False):
+    """
+    Police pygame créée une seule fois : pygame.font.Font(nom, taille), ou
+    pygame.font.SysFont(nom, taille) avec systeme=True.
+    """
+    cle = (nom, taille, systeme)
+    f = _polices.get(cle)
+    if f is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        _enregistrer()
+        f = _polices[cle] = pygame.font.SysFont(nom, taille) if systeme else pygame.font.Font(nom, taille)
+    return f
+
+
+def texte(chaine, font, couleur=(0, 0, 0), fond=None):
+    """Surface du texte rendu (font.render), réutilisée tant que le même texte est demandé"""
+    cle = (chaine, font, couleur if isinstance(couleur, str) else tuple(couleur),
+           fond if fond is None or isinstance(fond, str) else tuple(fond))
+    s = _textes.get(cle)
+    if s is None:
+        _enregistrer()
+        s = _textes[cle] = font.render(chaine, True, couleur, fond)
+        if len(_textes) > MAX_TEXTES:
+            _textes.popitem(last=False)
+    else:
+        _textes.move_to_end(cle)
+    return s
+
+
+def fondGrille(taille, scale, espacement=10, couleur=(255, 255, 255), grille=(200, 200, 200)):
+    """
+    Fond blanc quadrillé (une ligne tous les `espacement` unités de simulation),
+    dessiné une seule fois par taille et échelle. Ne pas dessiner dessus : copy().
+    """
+    cle = (tuple(taille), scale, espacement, couleur, grille)
+    s = _fonds.get(cle)
+    if s is None:
+        _enregistrer()
+        W, H = taille
+        s = pygame.Surface((W, H))
+        if pygame.display.get_surface() is not None:
+            s = s.convert()                       # Format de l'écran : blit plus rapide
+        s.fill(couleur)
+        pas = max(1, int(espacement * scale))
+        for x in range(0, W, pas):
+            pygame.draw.line(s, grille, (x, 0), (x, H), 1)
+        for y in range(0, H, pas):
+            pygame.draw.line(s, grille, (0, y), (W, y), 1)
+        _fonds[cle] = s
+    return s
+
+
+def sprite(couleur, rayon):
+    """Disque plein pré-dessiné (centre en (rayon, rayon)), comme pygame.draw.circle"""
+    cle = (couleur if isinstance(couleur, str) else tuple(couleur), rayon)
+    s = _sprites.get(cle)
+    if s is None:
+        _enregistrer()
+        s = pygame.Surface((2 * rayon + 1, 2 * rayon + 1))
+        if pygame.display.get_surface() is not None:
+            s = s.convert()
+        # Fond transparent par couleur clé (copie plus rapide qu'une transparence par pixel)
+        fond = (255, 0, 255) if pygame.Color(couleur)[:3] != (255, 0, 255) else (0, 255, 0)
+        s.fill(fond)
+        pygame.draw.circle(s, couleur, (rayon, rayon), rayon)
+        s.set_colorkey(fond, pygame.RLEACCEL)
+        _sprites[cle] = s
+    return s
+
+
+def _standard(e, cls):
+    # Entité dessinée par le gameDraw de sa classe de base (sans surcharge)
+    return type(e).gameDraw is cls.gameDraw and 'gameDraw' not in e.__dict__
+
+
+class Rendu:
+    """
+    Affichage incrémental d'une scène pygame.
+
+    Le fond (grille et éléments fixes, voir statique) est une surface dessinée une fois.
+    À chaque image, seules les zones dessinées à l'image précédente sont effacées (en
+    y recopiant le fond) et seules les zones modifiées sont envoyées à l'écran
+    (pygame.display.update(rects)) : le coût d'une image dépend de ce qui bouge, pas
+    de la taille de la fenêtre.
+
+    Les gameDraw des entités renvoient le rectangle qu'ils ont dessiné. Si l'un d'eux
+    renvoie None (dessin personnalisé), le rendu repasse en mode complet : fond entier
+    et display.flip à chaque image. Une image dont les zones sont trop nombreuses
+    (plus de MAX_ZONES) est aussi effacée et envoyée en entier, ce qui coûte alors moins.
+
+    Une image : image(), puis dessiner / blit, puis afficher().
+    """
+
+    MAX_ZONES = 500
+    SEUIL_PIXELS = 200
+
+    def __init__(self, screen, scale, fond=None):
+        self.screen = screen
+        self.scale = scale
+        self.fond = (fondGrille(screen.get_size(), scale) if fond is None else fond).copy()
+        self.complet = False         # True : chaque image redessine et envoie tout l'écran
+        self._sales = []             # Zones dessinées à l'image précédente
+        self._nouvelles = []         # Zones dessinées à l'image en cours
+        self._tout = True            # Prochaine image entière (première image, fond modifié)
+        self._large = False          # Image en cours dessinée hors des zones notées (pixels)
+
+    def statique(self, surface, position):
+        """Ajoute au fond un élément fixe (texte d'aide...), dessiné une seule fois"""
+        rect = self.fond.blit(surface, position)
+        self._tout = True
+        return rect
+
+    def invalider(self):
+        """Force l'envoi de tout l'écran à la prochaine image"""
+        self._tout = True
+
+    def image(self):
+        """Début d'une image : efface ce qui a été dessiné à la précédente"""
+        if self._tout or self.complet:
+            self.screen.blit(self.fond, (0, 0))
+        else:
+            for r in self._sales:
+                self.screen.blit(self.fond, r, r)
+        self._nouvelles = []
+        self._large = False
+
+    def dessiner(self, objets):
+        """Appelle gameDraw(scale, screen) de chaque objet et note les zones dessinées"""
+        scale, screen, zones = self.scale, self.screen, self._nouvelles
+        for o in objets:
+            r = o.gameDraw(scale, screen)
+            if r is None:
+                self.complet = True
+            else:
+                zones.append(r.inflate(2, 2))    # Marge pour les bords des traits épais
+
+    def dessinerEtat(self, etat, univers):
+        """
+        Dessine les particules et barres de l'univers dans l'état `etat`
+        (TempsReel.Instantane), même rendu que leurs gameDraw.
+
+        Les entités au gameDraw standard sont dessinées en lot : coordonnées écran de
+        toute la population en une opération NumPy, disques pré-dessinés (sprite)
+        copiés en un appel Surface.blits, traits (barres, vecteurs vitesse) tracés par
+        _segments. Les autres entités passent par leur gameDraw.
+        """
+        from Particule import Particule
+        from Barre2D import Barre
+
+        P, B = univers.population, univers.barres
+        if len(etat.p_pos) != len(P) or len(etat.b_pos) != len(B):
+            return self.dessiner(etat.vues(univers))   # Entités ajoutées depuis la capture
+        screen, scale = self.screen, self.scale
+        autres = []
+
+        # === Particules : disque de rayon 6, vecteur vitesse d'épaisseur 3 ===
+        ip = [i for i, p in enumerate(P) if _standard(p, Particule)]
+        if len(ip) < len(P):
+            autres += [v for v in etat.vues(univers)[:len(P)] if not _standard(v._entite, Particule)]
+        if ip:
+            if len(ip) == len(P):
+                ip = slice(None)                         # Toutes : vues au lieu de copies
+            couleurs = [p.gameColor() for p in (P if isinstance(ip, slice) else [P[i] for i in ip])]
+            xy = (scale * etat.p_pos[ip, :2]).astype(int)
+            vxy = (scale * etat.p_vel[ip, :2]).astype(int)
+            cles = [c if isinstance(c, str) else tuple(c) for c in couleurs]
+            sprites = {}
+            for c, cle in zip(couleurs, cles):
+                if cle not in sprites:
+                    sprites[cle] = sprite(c, 6)
+            self._zones(screen.blits([(sprites[c], (x - 6, y - 6)) for c, (x, y) in zip(cles, xy.tolist())]))
+            self._segments(xy, xy + vxy, couleurs, 3)
+
+        # === Barres : trait d'épaisseur 4, disque de rayon 5, vitesse en bleu ===
+        ib = [i for i, b in enumerate(B) if _standard(b, Barre)]
+        if len(ib) < len(B):
+            autres += [v for v in etat.vues(univers)[len(P):] if not _standard(v._entite, Barre)]
+        if ib:
+            pos = etat.b_pos[ib]
+            demi = np.array([B[i].L for i in ib], dtype=np.float64) / 2
+            theta = etat.b_theta[ib]
+            hx, hy = demi * np.cos(theta), demi * np.sin(theta)
+            gauche = np.stack(((pos[:, 0] - hx) * scale, (pos[:, 1] - hy) * scale), axis=1).astype(int)
+            droite = np.stack(((pos[:, 0] + hx) * scale, (pos[:, 1] + hy) * scale), axis=1).astype(int)
+            centres = (pos[:, :2] * scale).astype(int)
+            vxy = (scale * etat.b_vel[ib, :2]).astype(int)
+            couleurs = [pygame.Color(B[i].color) for i in ib]
+            self._segments(gauche, droite, couleurs, 4, vides=True)
+            self._zones(screen.blits([(sprite(c, 5), (x - 5, y - 5)) for c, (x, y) in zip(couleurs, centres.tolist())]))
+            self._segments(centres, centres + vxy, ['blue'] * len(ib), 3)
+
+        if autres:
+            self.dessiner(autres)
+
+    def _zones(self, rects):
+        if not self._large:
+            self._nouvelles += rects
+
+    def _segments(self, debut, fin, couleurs, largeur, vides=False):
+        """
+        Traits (N, 2) -> (N, 2) en pixels. Les traits de longueur nulle sont omis
+        (cachés par le disque de l'entité) sauf avec vides=True.
+
+        Jusqu'à SEUIL_PIXELS traits : pygame.draw.line, trait par trait. Au-delà, les
+        traits sont rastérisés en NumPy et écrits directement dans les pixels de
+        l'écran (surfarray) ; l'image est alors envoyée en entier.
+        """
+        if not vides:
+            garde = (debut != fin).any(axis=1)
+            if not garde.all():
+                debut, fin = debut[garde], fin[garde]
+                couleurs = [c for c, g in zip(couleurs, garde.tolist()) if g]
+        if not len(debut):
+            return
+        if len(debut) <= self.SEUIL_PIXELS or self.screen.get_bytesize() not in (2, 4):
+            draw, screen = pygame.draw.line, self.screen
+            for c, a, b in zip(couleurs, debut.tolist(), fin.tolist()):
+                r = draw(screen, c, a, b, largeur)
+                self._zones([r.inflate(2, 2)])
+            return
+
+        # Points de chaque trait (un par pixel sur l'axe principal), en une opération
+        x0, y0 = debut[:, 0], debut[:, 1]
+        dx, dy = fin[:, 0] - x0, fin[:, 1] - y0
+        n = np.maximum(np.abs(dx), np.abs(dy)) + 1
+        seg = np.repeat(np.arange(len(n)), n)
+        k = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        t = k / np.maximum(n - 1, 1)[seg]
+        xs = np.rint(x0[seg] + dx[seg] * t).astype(np.intp)
+        ys = np.rint(y0[seg] + dy[seg] * t).astype(np.intp)
+        horizontal = (np.abs(dx) >= np.abs(dy))[seg]    # Épaisseur perpendiculaire à l'axe principal
+
+        table = {}                                       # Couleur -> valeur de pixel de l'écran
+        for c in couleurs:
+            cle = c if isinstance(c, str) else tuple(c)
+            if cle not in table:
+                table[cle] = self.screen.map_rgb(pygame.Color(c) if isinstance(c, str) else tuple(int(x) for x in c))
+        valeurs = np.array([table[c if isinstance(c, str) else tuple(c)] for c in couleurs], dtype=np.int64)
+        W, H = self.screen.get_size()
+        pixels = pygame.surfarray.pixels2d(self.screen)
+        try:
+            for o in range(-(largeur // 2), largeur - largeur // 2):
+                px = np.where(horizontal, xs, xs + o)
+                py = np.where(horizontal, ys + o, ys)
+                ok = (px >= 0) & (px < W) & (py >= 0) & (py < H)
+                pixels[px[ok], py[ok]] = valeurs[seg[ok]]
+        finally:
+            del pixels                                   # Déverrouille l'écran
+        self._large = True
+
+    def blit(self, surface, position):
+        r = self.screen.blit(surface, position)
+        self._nouvelles.append(r)
+        return r
+
+    def terminer(self):
+        """
+        Fin d'une image sans l'envoyer (surface hors écran) : liste des zones
+        modifiées depuis l'image précédente, ou None si toute la surface l'est.
+        """
+        plein = self._large or len(self._nouvelles) > self.MAX_ZONES
+        if plein or self._tout or self.complet or len(self._sales) + len(self._nouvelles) > self.MAX_ZONES:
+            zones = None
+        else:
+            zones = self._sales + self._nouvelles
+        self._tout = plein                               # Image suivante : effacement complet
+        self._sales = [] if plein else self._nouvelles
+        return zones
+
+    def afficher(self):
+        """Fin d'une image : envoie à l'écran les zones effacées et redessinées"""
+        zones = self.terminer()
+        if zones is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(zones)
@@ -26,7 +26,7 @@ if __name__ == '__main__':
     P = V3D(50, 50, 0)  # Position du moteur sur le plan 2D
 
     # === Création de l’univers de simulation ===
-    monUnivers = Univers(game=True)  # Mode temps réel activé (affichage Pygame)
+    monUnivers = Univers(game=True, history='none')  # Mode temps réel activé (affichage Pygame), sans historique
 
     # === Création des entités ===
     particule = Particule(p0=V3D(40, 50, 0))         # Particule placée à gauche du moteur
@@ -22,7 +22,7 @@ if __name__ == "__main__":
     clock = pygame.time.Clock()
 
     # === Création de l’univers de simulation ===
-    U = Univers(game=True, gameDimensions=(WIDTH, HEIGHT))
+    U = Univers(game=True, gameDimensions=(WIDTH, HEIGHT), history='none')  # Temps réel : état courant seulement
 
     # === Entités physiques ===
     p1 = Particule(p0=V3D(50, 60), fix=True)           # Point fixe
@@ -4,16 +4,10 @@ from vector3D import Vector3D as V3D
 from Forces import *
 import matplotlib.pyplot as plt
 from Particule import Particule
-from math import atan2, degrees
 from scipy.signal import find_peaks
 import numpy as np
 
 if __name__ == "__main__":
-    # Listes pour stocker les angles mesurés et le temps
-    theta_p2p3 = []     # Angle du pendule (formé par les particules A et B)
-    theta_barre = []    # Angle de la barre rigide
-    time_tab = []       # Temps associé à chaque mesure
-
     # Création de l’univers de simulation avec affichage Pygame
     U = Univers(game=True)
 
@@ -45,18 +39,15 @@ if __name__ == "__main__":
     for _ in range(15000):  # Durée de simulation (~15 s avec step = 0.001)
         U.simulateAll()
 
-        # Vecteurs position pour calcul des angles
-        v1 = B.getPosition() - A.getPosition()
-        v2 = b1.getPosition() - C.getPosition()
-
-        # Calcul des angles (en degrés) par rapport à la verticale
-        theta1 = degrees(atan2(v1.x, v1.y))     # Pendule particules
-        theta2 = degrees(atan2(v2.x, v2.y))     # Barre rigide
+    # Vecteurs position pour calcul des angles, directement sur les trajectoires enregistrées
+    # (on ignore l'état initial : une mesure par pas simulé)
+    v1 = B.positions[1:] - A.positions[1:]
+    v2 = b1.positions[1:] - C.positions[1:]
 
-        # Enregistrement des données
-        theta_p2p3.append(theta1)
-        theta_barre.append(theta2)
-        time_tab.append(U.time[-1])
+    # Calcul des angles (en degrés) par rapport à la verticale
+    theta_p2p3 = np.degrees(np.arctan2(v1[:, 0], v1[:, 1]))    # Pendule particules
+    theta_barre = np.degrees(np.arctan2(v2[:, 0], v2[:, 1]))   # Barre rigide
+    time_tab = np.array(U.time[1:])                            # Temps associé à chaque mesure
 
     # === Affichage des courbes des angles en fonction du temps ===
     plt.figure(figsize=(12, 8))
@@ -70,17 +61,13 @@ if __name__ == "__main__":
     plt.show()
 
     # === Analyse des périodes par détection des pics ===
-    theta1_array = np.array(theta_p2p3)
-    theta2_array = np.array(theta_barre)
-    time_array = np.array(time_tab)
-
     # Détection des pics (maxima locaux)
-    peaks1, _ = find_peaks(theta1_array)
-    peaks2, _ = find_peaks(theta2_array)
+    peaks1, _ = find_peaks(theta_p2p3)
+    peaks2, _ = find_peaks(theta_barre)
 
     # Extraction des temps associés
-    times1 = time_array[peaks1]
-    times2 = time_array[peaks2]
+    times1 = time_tab[peaks1]
+    times2 = time_tab[peaks2]
 
     # Calcul des périodes moyennes
     T1 = np.mean(np.diff(times1)) if len(times1) > 1 else float('nan')
@@ -5,12 +5,13 @@ from Forces import *
 from Particule import Particule
 from math import radians
 import pygame
+from Rendu import fondGrille, police, texte
 
 # === Initialisation Pygame
 pygame.init()
 WIDTH, HEIGHT = 1024, 600
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
-font = pygame.font.Font(None, 36)
+font = police(36)
 clock = pygame.time.Clock()
 
 # === Couleurs
@@ -38,7 +39,7 @@ buttons = [
 mode_selected = None
 
 # === Simulation setup
-U = Univers(game=True, gameDimensions=(WIDTH, HEIGHT))
+U = Univers(game=True, gameDimensions=(WIDTH, HEIGHT), history='none')  # Temps réel : état courant seulement
 
 # Barres
 b1 = Barre(mass=1, p0=V3D(0, 30, 0), fix=True, long=100)
@@ -101,7 +102,6 @@ U.gameInteraction = interaction
 # Boucle principale
 running = True
 while running:
-    screen.fill(WHITE)
     pygame.event.pump()
     keys = pygame.key.get_pressed()
     events = pygame.event.get()
@@ -125,13 +125,8 @@ while running:
         if hasattr(g, "postStep"):
             g.postStep()
 
-    # Dessin
-    screen.fill(WHITE)
-    grid_spacing = int(10 * U.scale)
-    for x in range(0, WIDTH, grid_spacing):
-        pygame.draw.line(screen, GRAY, (x, 0), (x, HEIGHT))
-    for y in range(0, HEIGHT, grid_spacing):
-        pygame.draw.line(screen, GRAY, (0, y), (WIDTH, y))
+    # Dessin (grille pré-dessinée)
+    screen.blit(fondGrille((WIDTH, HEIGHT), U.scale, couleur=WHITE, grille=GRAY), (0, 0))
 
     for p in U.population:
         if hasattr(p, 'gameDraw'):
@@ -144,7 +139,7 @@ while running:
         color = BLUE if mode_selected == i else GRAY
         pygame.draw.rect(screen, color, button["rect"])
         pygame.draw.rect(screen, (0, 0, 0), button["rect"], 2)
-        text = font.render(button["label"], True, (0, 0, 0))
+        text = texte(button["label"], font)
         screen.blit(text, text.get_rect(center=button["rect"].center))
 
     # Sliders UI
@@ -152,13 +147,12 @@ while running:
         pygame.draw.rect(screen, GRAY, (s["x"], s["y"], s["w"], s["h"]))
         knob_x = s["x"] + int((s["val"] / 100) * s["w"])
         pygame.draw.rect(screen, RED, (knob_x - 5, s["y"] - 5, 10, s["h"] + 10))
-        slider_text = font.render(f"{label} = {s['val']:.1f}", True, (0, 0, 0))
+        slider_text = texte(f"{label} = {s['val']:.1f}", font)
         screen.blit(slider_text, (s["x"] + s["w"] + 10, s["y"] - 5))
 
     # Instructions
-    font_obj = pygame.font.Font(None, 24)
     instruction_text = "Sélectionner le mode et appuyer sur ESPACE pour l'activer"
-    text_surface = font_obj.render(instruction_text, True, (0, 0, 0))
+    text_surface = texte(instruction_text, police(24))
     text_rect = text_surface.get_rect()
     text_rect.midbottom = (WIDTH // 2, 100)
     screen.blit(text_surface, text_rect)
@@ -6,12 +6,13 @@ from Forces import *                       # Import de toutes les forces (gravit
 from Particule import Particule            # Classe de particule ponctuelle
 from math import radians                   # Conversion degré ↔ radian
 import pygame                              # Interface graphique Pygame
+from Rendu import fondGrille, police, texte  # Fond quadrillé, polices et textes mis en cache
 
 # === Initialisation Pygame ===
 pygame.init()
 WIDTH, HEIGHT = 1024, 780
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
-font = pygame.font.Font(None, 36)
+font = police(36)
 clock = pygame.time.Clock()
 
 # === Définition des couleurs utilisées ===
@@ -26,7 +27,7 @@ button2 = pygame.Rect(300, 50, 200, 50)    # Bouton pour Mode propre 2
 mode_selected = 0                          # Aucun mode sélectionné par défaut
 
 # === Création de l’univers et des entités ===
-U = Univers(game=True)
+U = Univers(game=True, history='none')  # Temps réel : état courant seulement
 
 # Particules fixes A et B
 A = Particule(fix=True, p0=V3D(30, 30, 0), color="blue")
@@ -73,7 +74,6 @@ U.gameInteraction = interaction
 # === Boucle principale Pygame ===
 running = True
 while running:
-    screen.fill(WHITE)
     pygame.event.pump()
     keys = pygame.key.get_pressed()
     events = pygame.event.get()
@@ -113,13 +113,8 @@ while running:
         if hasattr(g, "postStep"):
             g.postStep()
 
-    # === Dessin de la grille et des objets ===
-    screen.fill(WHITE)
-    grid_spacing = int(10 * U.scale)
-    for x in range(0, WIDTH, grid_spacing):
-        pygame.draw.line(screen, GRAY, (x, 0), (x, HEIGHT))
-    for y in range(0, HEIGHT, grid_spacing):
-        pygame.draw.line(screen, GRAY, (0, y), (WIDTH, y))
+    # === Dessin de la grille (pré-dessinée) et des objets ===
+    screen.blit(fondGrille((WIDTH, HEIGHT), U.scale, couleur=WHITE, grille=GRAY), (0, 0))
 
     # Affichage des particules et des barres
     for p in U.population:
@@ -132,13 +127,12 @@ while running:
     # === Dessin des boutons ===
     pygame.draw.rect(screen, BLUE if mode_selected == 1 else GRAY, button1)
     pygame.draw.rect(screen, RED if mode_selected == 2 else GRAY, button2)
-    screen.blit(font.render("Mode Propre 1", True, (0, 0, 0)), (button1.x + 20, button1.y + 10))
-    screen.blit(font.render("Mode Propre 2", True, (0, 0, 0)), (button2.x + 20, button2.y + 10))
+    screen.blit(texte("Mode Propre 1", font), (button1.x + 20, button1.y + 10))
+    screen.blit(texte("Mode Propre 2", font), (button2.x + 20, button2.y + 10))
 
     # === Instructions pour l’utilisateur ===
-    font_obj = pygame.font.Font(None, 24)
     instruction_text = "Sélectionner le mode et appuyer sur ESPACE pour l'activer"
-    text_surface = font_obj.render(instruction_text, True, (0, 0, 0))
+    text_surface = texte(instruction_text, police(24))
     text_rect = text_surface.get_rect()
     text_rect.midbottom = (WIDTH // 2, HEIGHT - 15)
     screen.blit(text_surface, text_rect)
@@ -0,0 +1,168 @@
+import numpy as np
+from vector3D import Vector3D as V3D
+
+
+# Format des points de reprise : archive NumPy (.npz, sans pickle) de tableaux nommés.
+# Le numéro de version est incrémenté à chaque changement incompatible du contenu.
+FORMAT = 'Univers-checkpoint'
+VERSION = 1
+
+_VECTEURS = ('position', 'speed', 'acceleration')   # Historiques V3D des particules et barres
+_ANGLES = ('theta', 'omega', 'alpha')               # Historiques scalaires des barres
+
+
+def _generateurs(univers):
+    # Générateurs et liaisons dans un ordre stable (ordre d'ajout)
+    return list(univers.generators) + list(univers.contraintes)
+
+
+def _compte(h):
+    # Nombre d'appels à append de l'historique (position dans la décimation 'every=N') ;
+    # en mode SoA, celui de l'historique commun
+    soa = getattr(h, '_soa', None)
+    return (soa.historiques[h._nom] if soa is not None else h)._count
+
+
+def _etatGenerateur(g):
+    return [float(getattr(g, 'active', True))] + [float(getattr(g, nom)) for nom in getattr(g, 'checkpointFields', ())]
+
+
+def checkpoint(univers, path, history=False):
+    """
+    Écrit l'état courant de l'univers dans le fichier `path` : particules, barres,
+    moteurs, générateurs à état (voir Force.checkpointFields) et temps.
+    Avec history=True, les trajectoires enregistrées sont ajoutées (tableaux bruts),
+    avec la position de chaque historique dans sa décimation.
+    """
+    P, B, M = univers.population, univers.barres, univers.motors
+    donnees = {'format': np.array(FORMAT), 'version': np.array(VERSION)}
+
+    t0, k, step = univers._horloge
+    donnees['temps'] = np.array([univers.time[-1], t0, k, step], dtype=np.float64)
+    donnees['particules'] = np.array([[c for nom in _VECTEURS for c in _xyz(getattr(p, nom).last)] for p in P],
+                                     dtype=np.float64).reshape(len(P), 9)
+    donnees['barres'] = np.array([[c for nom in _VECTEURS for c in _xyz(getattr(b, nom).last)] +
+                                  [getattr(b, nom).last for nom in _ANGLES] for b in B],
+                                 dtype=np.float64).reshape(len(B), 12)
+    donnees['moteurs'] = np.array([[getattr(m, nom) for nom in m.checkpointFields] for m in M],
+                                  dtype=np.float64).reshape(len(M), len(type(M[0]).checkpointFields) if M else 0)
+
+    etats = [_etatGenerateur(g) for g in _generateurs(univers)]
+    donnees['generateurs'] = np.array([x for e in etats for x in e], dtype=np.float64)
+    donnees['generateurs_tailles'] = np.array([len(e) for e in etats], dtype=np.int64)
+
+    if history:
+        donnees['h_temps'] = univers.time.array
+        donnees['h_temps_compte'] = np.array(_compte(univers.time), dtype=np.int64)
+        for prefixe, entites, noms in (('p', P, _VECTEURS), ('b', B, _VECTEURS + _ANGLES)):
+            for nom in noms:
+                tableaux = [getattr(e, nom).array for e in entites]
+                donnees['h_%s_%s' % (prefixe, nom)] = (np.concatenate(tableaux) if tableaux else np.empty(0))
+                donnees['h_%s_%s_tailles' % (prefixe, nom)] = np.array([len(a) for a in tableaux], dtype=np.int64)
+                donnees['h_%s_%s_comptes' % (prefixe, nom)] = np.array([_compte(getattr(e, nom)) for e in entites],
+                                                                       dtype=np.int64)
+
+    with open(path, 'wb') as f:                   # Fichier ouvert : savez n'ajoute pas d'extension
+        np.savez(f, **donnees)
+
+
+def restore(univers, path):
+    """
+    Replace l'univers dans l'état enregistré par checkpoint. L'univers doit avoir été
+    construit de la même façon (mêmes entités et générateurs, dans le même ordre) ;
+    ValueError sinon, ou si le fichier n'est pas un point de reprise lisible.
+    """
+    with np.load(path, allow_pickle=False) as f:
+        donnees = {nom: f[nom] for nom in f.files}
+    if str(donnees.get('format', '')) != FORMAT:
+        raise ValueError("%s n'est pas un point de reprise d'Univers" % (path,))
+    if int(donnees['version']) != VERSION:
+        raise ValueError("version de point de reprise non prise en charge : %d (attendu %d)"
+                         % (int(donnees['version']), VERSION))
+
+    P, B, M = univers.population, univers.barres, univers.motors
+    generateurs = _generateurs(univers)
+    tailles = donnees['generateurs_tailles'].tolist()
+    attendu = [len(_etatGenerateur(g)) for g in generateurs]
+    for nom, n, m in (('particules', len(donnees['particules']), len(P)), ('barres', len(donnees['barres']), len(B)),
+                      ('moteurs', len(donnees['moteurs']), len(M)), ('generateurs', len(tailles), len(generateurs))):
+        if n != m:
+            raise ValueError("point de reprise incompatible : %d %s enregistrés, %d dans l'univers" % (n, nom, m))
+    if tailles != attendu:
+        raise ValueError("point de reprise incompatible : générateurs différents")
+
+    historique = 'h_temps' in donnees
+    if univers.engine == 'soa':
+        _restoreSoA(univers._moteurSoA(), donnees, historique)   # Historiques communs à remplir
+    else:
+        _restoreObjets(P, B, donnees, historique)
+    for m, valeurs in zip(M, donnees['moteurs'].tolist()):
+        for nom, x in zip(m.checkpointFields, valeurs):
+            setattr(m, nom, x)
+    j = 0
+    for g, n in zip(generateurs, tailles):
+        valeurs = donnees['generateurs'][j:j + n].tolist()
+        j += n
+        if hasattr(g, 'active'):
+            g.active = bool(valeurs[0])
+        for nom, x in zip(getattr(g, 'checkpointFields', ()), valeurs[1:]):
+            setattr(g, nom, type(getattr(g, nom))(x))   # Garde le type (booléen, flottant...)
+
+    t, t0, k, step = donnees['temps'].tolist()
+    if historique:
+        univers.time.setArray(donnees['h_temps'], _lireCompte(donnees, 'h_temps'))
+    univers.time[-1] = t                          # Valeur courante (non enregistrée si décimée)
+    univers._horloge = (t0, int(k), step)
+    univers._systeme = None                       # États généralisés reconstruits au prochain pas
+
+
+def _xyz(u):
+    return (u.x, u.y, u.z)
+
+
+def _lireCompte(donnees, cle, i=None):
+    # Comptes d'appels enregistrés (absents des fichiers plus anciens : None)
+    cle += '_compte' if i is None else '_comptes'
+    if cle not in donnees:
+        return None
+    return int(donnees[cle]) if i is None else int(donnees[cle][i])
+
+
+def _decouper(donnees, cle, n):
+    # Trajectoires concaténées -> une par entité
+    bornes = np.cumsum(donnees[cle + '_tailles'])[:-1] if n else []
+    return np.split(donnees[cle], bornes) if n else []
+
+
+def _restoreObjets(P, B, donnees, historique):
+    for prefixe, entites, etats in (('p', P, donnees['particules']), ('b', B, donnees['barres'])):
+        noms = _VECTEURS if prefixe == 'p' else _VECTEURS + _ANGLES
+        if historique:
+            for nom in noms:
+                cle = 'h_%s_%s' % (prefixe, nom)
+                for i, (e, a) in enumerate(zip(entites, _decouper(donnees, cle, len(entites)))):
+                    getattr(e, nom).setArray(a, _lireCompte(donnees, cle, i))
+        for e, ligne in zip(entites, etats.tolist()):
+            for i, nom in enumerate(_VECTEURS):
+                getattr(e, nom)[-1] = V3D(*ligne[3 * i:3 * i + 3])
+            for i, nom in enumerate(noms[3:]):
+                getattr(e, nom)[-1] = ligne[9 + i]
+
+
+def _restoreSoA(soa, donnees, historique):
+    # Moteur SoA : état dans les tableaux, trajectoires dans les historiques communs
+    Pe, Be = donnees['particules'], donnees['barres']
+    colonnes = {'p_pos': (Pe, 0), 'p_vel': (Pe, 3), 'p_acc': (Pe, 6), 'b_pos': (Be, 0), 'b_vel': (Be, 3),
+                'b_acc': (Be, 6), 'b_theta': (Be, 9), 'b_omega': (Be, 10), 'b_alpha': (Be, 11)}
+    noms = dict(zip(('pos', 'vel', 'acc', 'theta', 'omega', 'alpha'), _VECTEURS + _ANGLES))
+    for cle, (etats, j) in colonnes.items():
+        tableau = getattr(soa, cle)
+        tableau[:] = etats[:, j:j + 3] if tableau.ndim == 2 else etats[:, j]
+        bloc = soa.historiques[cle]
+        if historique:
+            prefixe, _, court = cle.partition('_')
+            h = 'h_%s_%s' % (prefixe, noms[court])
+            trajectoires = _decouper(donnees, h, len(tableau))
+            if trajectoires:
+                bloc.setArray(np.stack(trajectoires, axis=1), _lireCompte(donnees, h, 0))
+        bloc[-1] = tableau
@@ -0,0 +1,426 @@
+import numpy as np
+from copy import deepcopy
+from vector3D import Vector3D as V3D
+from Historique import HistoriqueBloc
+
+
+_TOUT = (slice(None), slice(None))     # Portée par défaut d'un champ global
+
+
+class VueLigne:
+    """
+    Vue d'une ligne (x, y, z) d'un tableau du moteur SoA, utilisée comme accumulateur
+    de forces d'une entité : `+=`, add_scaled et set écrivent directement dans le tableau.
+    """
+
+    def __init__(self, soa, nom, i):
+        self._soa = soa          # Moteur propriétaire des tableaux
+        self._nom = nom          # Nom du tableau (N, 3) visé
+        self._i = i              # Indice de l'entité
+
+    def _row(self):
+        return getattr(self._soa, self._nom)[self._i]
+
+    x = property(lambda self: float(self._row()[0]))
+    y = property(lambda self: float(self._row()[1]))
+    z = property(lambda self: float(self._row()[2]))
+
+    def __repr__(self):
+        return "VueLigne(%g, %g, %g)" % tuple(self._row())
+
+    def __iadd__(self, other):
+        self._row()[:] += (other.x, other.y, other.z)
+        return self
+
+    def __isub__(self, other):
+        self._row()[:] -= (other.x, other.y, other.z)
+        return self
+
+    def add_scaled(self, other, s):
+        self._row()[:] += (s * other.x, s * other.y, s * other.z)
+        return self
+
+    def set(self, x=0, y=0, z=0):
+        self._row()[:] = (x, y, z)
+        return self
+
+
+class VueHistorique:
+    """
+    Remplace l'historique d'une entité liée au moteur SoA.
+
+    L'état courant est lu et écrit dans les tableaux du moteur (h[-1], h[-1] = v, `last`),
+    la trajectoire est une vue de l'historique commun (`array` = bloc[:, i]).
+    Mêmes usages qu'un Historique : les scripts et les forces n'y voient pas de différence.
+    """
+
+    def __init__(self, soa, nom, i, vecteur=True):
+        self._soa = soa
+        self._nom = nom
+        self._i = i
+        self._vecteur = vecteur
+        self.policy = soa.policy
+
+    def _value(self, row):
+        if self._vecteur:
+            x, y, z = row.tolist()
+            return V3D(x, y, z)
+        return float(row)
+
+    @property
+    def last(self):
+        """Valeur courante, lue dans le tableau du moteur"""
+        return self._value(getattr(self._soa, self._nom)[self._i])
+
+    def _set(self, value):
+        arr = getattr(self._soa, self._nom)
+        arr[self._i] = (value.x, value.y, value.z) if self._vecteur else value
+
+    append = _set                                   # Un nouveau pas remplace l'état courant
+
+    def setPolicy(self, policy):
+        # La politique d'historique est celle de l'univers en mode SoA
+        pass
+
+    def __len__(self):
+        return len(self._soa.historiques[self._nom])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.array[i]
+        if i == -1:
+            return self.last
+        return self._value(self.array[i])
+
+    def __setitem__(self, i, value):
+        if i != -1:
+            raise IndexError("seul l'état courant (indice -1) est modifiable en mode SoA")
+        self._set(value)
+
+    def __iter__(self):
+        for row in self.array:
+            yield self._value(row)
+
+    @property
+    def array(self):
+        """Trajectoire de l'entité : vue (T, 3) ou (T,) dans l'historique commun"""
+        return self._soa.historiques[self._nom].array[:, self._i]
+
+
+class SimulationSoA:
+    """
+    Moteur « structure de tableaux » utilisé par Univers(engine='soa').
+
+    L'état de toutes les particules et barres est rangé dans des tableaux NumPy contigus
+    (masses, positions, vitesses, accumulateurs de forces, angles, inerties...) et un pas
+    de temps intègre tout en une seule mise à jour vectorisée.
+
+    Chaque pas :
+    1. les générateurs qui déclarent un `soaGroup` (Gravity, SpringDamper, Pivot...)
+       sont évalués en un appel NumPy par classe ;
+    2. les autres générateurs sont appelés entité par entité (setForce), comme avant :
+       les objets Particule / Barre sont liés au moteur et lisent / écrivent leurs
+       tableaux à travers des vues (VueHistorique, VueLigne) ;
+    3. intégration vectorisée, puis enregistrement de l'historique selon la politique
+       de l'univers.
+
+    Toutes les forces d'un pas sont calculées à partir de l'état du début du pas
+    (mise à jour de Jacobi). Le moteur objet fait de même pour les interactions
+    (applyPair) mais met à jour les entités l'une après l'autre : une force à un seul
+    sujet qui lit l'état d'une autre entité mobile peut donc différer d'un terme en O(step).
+    """
+
+    def __init__(self, univers, precedent=None):
+        self.policy = univers.history
+        P = self.particules = list(univers.population)
+        B = self.barres = list(univers.barres)
+        self.membres = set(P + B)
+
+        def vecs(values):
+            return np.array([(v.x, v.y, v.z) for v in values], dtype=np.float64).reshape(-1, 3)
+
+        # === Particules ===
+        self.p_index = {id(p): i for i, p in enumerate(P)}
+        self.p_mass = np.array([p.mass for p in P], dtype=np.float64)
+        self.p_fix = np.array([bool(p.fix) for p in P], dtype=bool)
+        self.p_pos = vecs(p.getPosition() for p in P)
+        self.p_vel = vecs(p.getSpeed() for p in P)
+        self.p_acc = vecs(p.acceleration[-1] for p in P)
+        self.p_F = vecs(p.forces for p in P)           # Forces déjà appliquées avant le premier pas
+
+        # === Barres ===
+        self.b_index = {id(b): i for i, b in enumerate(B)}
+        self.b_mass = np.array([b.mass for b in B], dtype=np.float64)
+        self.b_fix = np.array([bool(b.fix) for b in B], dtype=bool)
+        self.b_L = np.array([b.L for b in B], dtype=np.float64)
+        self.b_inertia = np.array([b.getInertia() for b in B], dtype=np.float64)
+        self.b_pos = vecs(b.getPosition() for b in B)
+        self.b_vel = vecs(b.getSpeed() for b in B)
+        self.b_acc = vecs(b.acceleration[-1] for b in B)
+        self.b_theta = np.array([b.getAngle() for b in B], dtype=np.float64)
+        self.b_omega = np.array([b.getAngularSpeed() for b in B], dtype=np.float64)
+        self.b_alpha = np.array([b.alpha[-1] for b in B], dtype=np.float64)
+        self.b_F = vecs(b.forces for b in B)
+        self.b_FP = vecs(b.forces_pts for b in B)
+
+        # === Historique commun (un bloc par grandeur) ===
+        self.historiques = {nom: HistoriqueBloc(getattr(self, nom).shape, getattr(self, nom), policy=self.policy)
+                            for nom in ('p_pos', 'p_vel', 'p_acc', 'b_pos', 'b_vel', 'b_acc',
+                                        'b_theta', 'b_omega', 'b_alpha')}
+        if precedent is not None:
+            # Reconstruction après un ajout d'entités : les trajectoires enregistrées par
+            # l'ancien moteur sont reprises (NaN pour les entités nouvelles avant leur ajout)
+            colonnes = {'p': [precedent.p_index.get(id(p), -1) for p in P],
+                        'b': [precedent.b_index.get(id(b), -1) for b in B]}
+            for nom, hist in precedent.historiques.items():
+                tableau = getattr(self, nom)
+                self.historiques[nom] = hist.reprendre(tableau.shape, colonnes[nom[0]], tableau)
+
+        # === Les entités deviennent des vues sur les tableaux ===
+        for i, p in enumerate(P):
+            p.position = VueHistorique(self, 'p_pos', i)
+            p.speed = VueHistorique(self, 'p_vel', i)
+            p.acceleration = VueHistorique(self, 'p_acc', i)
+            p.forces = VueLigne(self, 'p_F', i)
+        for i, b in enumerate(B):
+            b.position = VueHistorique(self, 'b_pos', i)
+            b.speed = VueHistorique(self, 'b_vel', i)
+            b.acceleration = VueHistorique(self, 'b_acc', i)
+            b.theta = VueHistorique(self, 'b_theta', i, vecteur=False)
+            b.omega = VueHistorique(self, 'b_omega', i, vecteur=False)
+            b.alpha = VueHistorique(self, 'b_alpha', i, vecteur=False)
+            b.forces = VueLigne(self, 'b_F', i)
+            b.forces_pts = VueLigne(self, 'b_FP', i)
+
+        self.generators = univers.generators
+        n = len(P)
+        self.i_barres = 3 * n                         # Disposition de l'état généralisé (voir getState)
+        self.i_angles = self.i_barres + 3 * len(B)
+        self.mass = np.concatenate([np.repeat(self.p_mass, 3), np.repeat(self.b_mass, 3), self.b_inertia])
+        self.fix = np.concatenate([np.repeat(self.p_fix, 3), np.repeat(self.b_fix, 3), self.b_fix])
+
+        self.impulsions = True         # False : forces impulsionnelles ignorées (pas adaptatif)
+        self.entites = P + B
+        self.portees = {}              # Champ global -> (tranche des particules, tranche des barres)
+                                       # qu'il vise, au lieu de tout le moteur (voir Ensemble)
+        self._version = None           # Version des générateurs (Generateurs.version) du plan
+        self._plan = None              # Groupes vectorisés et générateurs « objet »
+        self._ciblesCache = {}         # générateur -> entités visées
+
+    def __deepcopy__(self, memo):
+        # Copie (Univers.fork) : tableaux d'état copiés, historiques communs partagés
+        # (Historique.fork) ; index par id() recalculés pour les entités copiées
+        clone = object.__new__(SimulationSoA)
+        memo[id(self)] = clone
+        for nom, valeur in self.__dict__.items():
+            setattr(clone, nom, deepcopy(valeur, memo))
+        clone.p_index = {id(p): i for i, p in enumerate(clone.particules)}
+        clone.b_index = {id(b): i for i, b in enumerate(clone.barres)}
+        clone._version = None
+        clone._plan = None
+        clone._ciblesCache = {}
+        return clone
+
+    def _planifier(self, generators):
+        """
+        Regroupe les générateurs par noyau vectorisé (soaGroup). Les autres sont
+        associés aux entités du moteur qu'ils visent (getSubjects ; None : toutes).
+        """
+        groupes = {}
+        autres = []
+        for g in generators:
+            fn = getattr(type(g), 'soaGroup', None)
+            if fn is None:
+                autres.append(g)
+            else:
+                groupes.setdefault(fn, []).append(g)
+        return list(groupes.items()), autres
+
+    def portee(self, source):
+        """(particules, barres) visées par un champ global : des tranches des tableaux"""
+        return self.portees.get(source, _TOUT)
+
+    def _cibles(self, source):
+        """Entités du moteur visées par un générateur appliqué entité par entité"""
+        subjects = source.getSubjects()
+        if subjects is None:
+            ip, ib = self.portee(source)
+            return self.particules[ip] + self.barres[ib]
+        return [e for e in dict.fromkeys(subjects) if id(e) in self.p_index or id(e) in self.b_index]
+
+    def applyForces(self, generators):
+        """Accumule dans p_F / b_F / b_FP les forces de tous les générateurs"""
+        if self._version != generators.version:
+            self._version = generators.version
+            self._plan = self._planifier(generators)
+            self._ciblesCache = {}
+        groupes, autres = self._plan
+
+        # Noyaux vectorisés : chaque groupe renvoie les générateurs qu'il n'a pas pu traiter
+        restants = list(autres)
+        for fn, gens in groupes:
+            restants.extend(fn(self, gens))
+
+        # Chemin objet, à travers les vues : applyPair pour les interactions,
+        # setForce sur les entités visées pour les autres
+        cache = self._ciblesCache
+        for source in restants:
+            if source.impulsive and not self.impulsions:
+                continue
+            if hasattr(source, 'applyPair'):
+                source.applyPair(self.membres)
+                continue
+            cibles = cache.get(source)
+            if cibles is None:
+                cibles = cache[source] = self._cibles(source)
+            for e in cibles:
+                source.setForce(e)
+
+    def integrate(self, step):
+        """Intègre toutes les particules et barres en une mise à jour vectorisée"""
+        h = 0.5 * step**2
+
+        # === Particules : mêmes formules que Particule.pfd ===
+        if len(self.p_mass):
+            a = self.p_F / self.p_mass[:, None]
+            a[self.p_fix] = 0.0
+            self.p_pos += a * h
+            self.p_pos += self.p_vel * step
+            self.p_vel += a * step
+            self.p_vel[self.p_fix] = 0.0
+            self.p_acc[:] = a
+            self.p_F[:] = 0.0
+
+        # === Barres : mêmes formules que Barre.pfd ===
+        if len(self.b_mass):
+            fix = self.b_fix
+            moment = (self.b_L / 2) * (np.cos(self.b_theta) * self.b_FP[:, 1] - np.sin(self.b_theta) * self.b_FP[:, 0])
+            a = self.b_F / self.b_mass[:, None]
+            a[fix] = 0.0
+            alpha = moment / self.b_inertia
+            alpha[fix] = 0.0
+
+            self.b_pos += np.where(fix[:, None], 0.0, self.b_vel * step)
+            self.b_pos += a * h
+            self.b_vel += a * step
+            self.b_vel[fix] = 0.0
+            self.b_acc[:] = a
+
+            self.b_theta += np.where(fix, 0.0, self.b_omega * step)
+            self.b_theta += alpha * h
+            self.b_omega += alpha * step
+            self.b_omega[fix] = 0.0
+            self.b_alpha[:] = alpha
+
+            self.b_F[:] = 0.0
+            self.b_FP[:] = 0.0
+
+        self._record()
+
+    def _record(self):
+        """Enregistre l'état courant dans les historiques"""
+        for nom, hist in self.historiques.items():
+            hist.append(getattr(self, nom))
+
+    # === État généralisé pour les schémas d'intégration (voir Integrateurs.py) ===
+    # q = [positions des particules, positions des barres, angles des barres] (tableau plat)
+
+    def getState(self):
+        q = np.concatenate([self.p_pos.ravel(), self.b_pos.ravel(), self.b_theta])
+        v = np.concatenate([self.p_vel.ravel(), self.b_vel.ravel(), self.b_omega])
+        v[self.fix] = 0.0
+        return q, v
+
+    def _setState(self, q, v):
+        ib, ia = self.i_barres, self.i_angles
+        self.p_pos.ravel()[:] = q[:ib]
+        self.b_pos.ravel()[:] = q[ib:ia]
+        self.b_theta[:] = q[ia:]
+        self.p_vel.ravel()[:] = v[:ib]
+        self.b_vel.ravel()[:] = v[ib:ia]
+        self.b_omega[:] = v[ia:]
+
+    def accelerations(self, q, v):
+        self._setState(q, v)
+        self.applyForces(self.generators)
+        moment = (self.b_L / 2) * (np.cos(self.b_theta) * self.b_FP[:, 1] - np.sin(self.b_theta) * self.b_FP[:, 0])
+        a = np.concatenate([self.p_F.ravel(), self.b_F.ravel(), moment]) / self.mass
+        a[self.fix] = 0.0
+        self.p_F[:] = 0.0
+        self.b_F[:] = 0.0
+        self.b_FP[:] = 0.0
+        return a
+
+    # === Accès par entité (jacobiennes locales de l'intégrateur implicite) ===
+
+    def dofs(self, e):
+        i = self.p_index.get(id(e))
+        if i is not None:
+            return np.arange(3 * i, 3 * i + 3)
+        j = self.b_index[id(e)]
+        k = self.i_barres + 3 * j
+        return np.array([k, k + 1, k + 2, self.i_angles + j])
+
+    def setEntity(self, e, qe, ve):
+        i = self.p_index.get(id(e))
+        if i is not None:
+            self.p_pos[i] = qe
+            self.p_vel[i] = ve
+        else:
+            j = self.b_index[id(e)]
+            self.b_pos[j] = qe[:3]
+            self.b_vel[j] = ve[:3]
+            self.b_theta[j] = qe[3]
+            self.b_omega[j] = ve[3]
+
+    def forceLocale(self, g, sujets):
+        """Forces généralisées exercées par le seul générateur g sur ses sujets"""
+        lignes = [(self.p_index.get(id(e)), self.b_index.get(id(e))) for e in sujets]
+        for i, j in lignes:
+            if i is not None:
+                self.p_F[i] = 0.0
+            else:
+                self.b_F[j] = 0.0
+                self.b_FP[j] = 0.0
+        if hasattr(g, 'applyPair'):
+            g.applyPair(sujets)
+        else:
+            for e in sujets:
+                g.setForce(e)
+        f = []
+        for i, j in lignes:
+            if i is not None:
+                f.extend(self.p_F[i].tolist())
+                self.p_F[i] = 0.0
+            else:
+                fp = self.b_FP[j]
+                theta = self.b_theta[j]
+                f.extend(self.b_F[j].tolist())
+                f.append((self.b_L[j] / 2) * (np.cos(theta) * fp[1] - np.sin(theta) * fp[0]))
+                self.b_F[j] = 0.0
+                self.b_FP[j] = 0.0
+        return np.array(f, dtype=np.float64)
+
+    def amend(self, q, v):
+        """Remplace positions et vitesses du dernier pas enregistré (liaisons, voir Contraintes.py)"""
+        self._setState(q, v)
+        for nom in ('p_pos', 'p_vel', 'b_pos', 'b_vel', 'b_theta', 'b_omega'):
+            self.historiques[nom][-1] = getattr(self, nom)
+
+    def amendParticules(self):
+        """Enregistre au dernier pas les positions et vitesses des particules modifiées en place (parois)"""
+        self.historiques['p_pos'][-1] = self.p_pos
+        self.historiques['p_vel'][-1] = self.p_vel
+
+    def commit(self, q, v, a):
+        self._setState(q, v)
+        ib, ia = self.i_barres, self.i_angles
+        self.p_acc.ravel()[:] = a[:ib]
+        self.b_acc.ravel()[:] = a[ib:ia]
+        self.b_alpha[:] = a[ia:]
+        self._record()
+
+    def simulate(self, step, generators):
+        """Un pas complet : forces puis intégration"""
+        self.applyForces(generators)
+        self.integrate(step)
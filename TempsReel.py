@@ -0,0 +1,298 @@
+import threading
+import time
+from collections import deque
+from math import sqrt, inf
+import numpy as np
+from vector3D import Vector3D as V3D
+
+
+class Instantane:
+    """
+    État affichable de l'univers à un instant : temps, positions et vitesses des
+    particules, positions, vitesses et angles des barres (tableaux NumPy, dans
+    l'ordre de population / barres). Copie figée : le thread physique peut
+    continuer à simuler pendant que l'affichage la lit.
+    """
+
+    def __init__(self, t, p_pos, p_vel, b_pos, b_vel, b_theta):
+        self.t = t
+        self.p_pos, self.p_vel = p_pos, p_vel
+        self.b_pos, self.b_vel, self.b_theta = b_pos, b_vel, b_theta
+
+    @classmethod
+    def capturer(cls, univers):
+        """Copie de l'état courant (à appeler entre deux pas)"""
+        soa = univers._soa
+        if soa is not None:                       # Moteur SoA : copie directe des tableaux
+            return cls(univers.time[-1], soa.p_pos.copy(), soa.p_vel.copy(),
+                       soa.b_pos.copy(), soa.b_vel.copy(), soa.b_theta.copy())
+
+        def vecs(values):
+            return np.array([(v.x, v.y, v.z) for v in values], dtype=np.float64).reshape(-1, 3)
+
+        P, B = univers.population, univers.barres
+        return cls(univers.time[-1], vecs(p.getPosition() for p in P), vecs(p.getSpeed() for p in P),
+                   vecs(b.getPosition() for b in B), vecs(b.getSpeed() for b in B),
+                   np.array([b.getAngle() for b in B], dtype=np.float64))
+
+    def interpoler(self, suivant, alpha):
+        """État entre self (alpha = 0) et suivant (alpha = 1), interpolé linéairement"""
+        if alpha <= 0 or suivant is self:
+            return self
+        if alpha >= 1:
+            return suivant
+
+        def mix(a, b):
+            return a + (b - a) * alpha
+
+        return Instantane(mix(self.t, suivant.t), mix(self.p_pos, suivant.p_pos), mix(self.p_vel, suivant.p_vel),
+                          mix(self.b_pos, suivant.b_pos), mix(self.b_vel, suivant.b_vel),
+                          mix(self.b_theta, suivant.b_theta))
+
+    def vues(self, univers):
+        """Particules et barres vues dans cet état (VueEtat), pour leur gameDraw"""
+        P, B = univers.population, univers.barres
+        vues = []
+        if len(self.p_pos) == len(P):
+            for e, p, v in zip(P, self.p_pos.tolist(), self.p_vel.tolist()):
+                vues.append(VueEtat(e, V3D(*p), V3D(*v)))
+        if len(self.b_pos) == len(B):
+            for e, p, v, theta in zip(B, self.b_pos.tolist(), self.b_vel.tolist(), self.b_theta.tolist()):
+                vues.append(VueEtat(e, V3D(*p), V3D(*v), theta))
+        return vues                               # Entités ajoutées depuis la capture : ignorées
+
+
+class VueEtat:
+    """
+    Entité affichée dans l'état d'un instantané : getPosition, getSpeed et getAngle
+    renvoient les valeurs capturées, les autres attributs (couleur, longueur...)
+    sont ceux de l'entité. `gameDraw` est celui de la classe de l'entité.
+    """
+
+    def __init__(self, entite, position, speed, theta=None):
+        self._entite = entite
+        self._position = position
+        self._speed = speed
+        self._theta = theta
+
+    def __getattr__(self, nom):
+        return getattr(self._entite, nom)
+
+    def getPosition(self):
+        return self._position
+
+    def getSpeed(self):
+        return self._speed
+
+    def getAngle(self):
+        return self._theta
+
+    def gameDraw(self, scale, screen):
+        dessin = getattr(type(self._entite), 'gameDraw', None)
+        if dessin is not None:
+            return dessin(self, scale, screen)
+
+
+class DoubleTampon:
+    """
+    Les deux derniers instantanés publiés par le thread physique, et l'heure
+    (time.perf_counter) de publication du plus récent. Publication et lecture
+    échangent des références sous un verrou : l'affichage lit toujours une paire
+    cohérente, sans attendre la fin d'un pas.
+    """
+
+    def __init__(self, instantane):
+        self._verrou = threading.Lock()
+        self._paire = (instantane, instantane, time.perf_counter())
+
+    def publier(self, instantane):
+        with self._verrou:
+            self._paire = (self._paire[1], instantane, time.perf_counter())
+
+    def lire(self):
+        """(précédent, courant, heure de publication du courant)"""
+        with self._verrou:
+            return self._paire
+
+    def etat(self, maintenant=None):
+        """
+        Instantané à afficher : l'affichage a un instantané de retard et avance de
+        l'un à l'autre au rythme du temps réel (interpolation linéaire).
+        """
+        precedent, courant, publie = self.lire()
+        duree = courant.t - precedent.t
+        if duree <= 0:
+            return courant
+        maintenant = time.perf_counter() if maintenant is None else maintenant
+        return precedent.interpoler(courant, (maintenant - publie) / duree)
+
+
+def pasStable(univers):
+    """
+    Estimation du plus grand pas stable des schémas explicites : 1 / ω_max (moitié de
+    la limite 2 / ω), où ω² = k / m_effective pour chaque force raide (Force.stiff)
+    ayant une raideur k. Infini sans force raide ou avec l'intégrateur implicite.
+    """
+    if univers.integrator == 'implicit_euler':
+        return inf
+    w2 = 0.0
+    for g in univers.generators:
+        k = getattr(g, 'k', None)
+        if not getattr(g, 'stiff', False) or not k:
+            continue
+        sujets = g.getSubjects() or ()
+        points = g.getPoints() if hasattr(g, 'getPoints') else (getattr(g, 'point', 0.0),) * len(sujets)
+        inv = 0.0                                 # Inverse de la masse effective au point d'attache
+        for e, point in zip(sujets, points):
+            if getattr(e, 'fix', False) or not getattr(e, 'mass', 0):
+                continue
+            inv += 1 / e.mass
+            if hasattr(e, 'getInertia'):          # Barre : rotation autour du centre
+                h = point * e.L / 2
+                inv += h * h / e.getInertia()
+        w2 = max(w2, k * inv)
+    return 1 / sqrt(w2) if w2 else inf
+
+
+class Gouverneur:
+    """
+    Suit le facteur temps réel de simulateRealTime et réagit quand la physique
+    prend du retard.
+
+    Sur une fenêtre glissante (`fenetre` secondes de temps réel) :
+    - rtf : temps simulé / temps réel (1 : temps réel, 0.5 : deux fois plus lent) ;
+    - charge : part du temps réel passée à calculer des pas.
+
+    Politiques (`policy`) quand la physique est en retard :
+    - 'slow' : le temps simulé ralentit (retard au-delà de max_catch_up abandonné) ;
+    - 'coarsen' : le pas est augmenté (x1.5 par ajustement) tant que la physique est en
+      retard, sans dépasser max_step (4 pas initiaux par défaut) ni pasStable(univers),
+      puis rediminué vers le pas initial quand la charge le permet ;
+    - 'skip' : l'affichage ne dessine plus qu'une image sur `saut`, ce qui laisse le
+      temps de calcul à la physique.
+    """
+
+    POLITIQUES = ('slow', 'coarsen', 'skip')
+
+    def __init__(self, univers, policy='slow', max_step=None, fenetre=1.0, saut=4):
+        if policy not in self.POLITIQUES:
+            raise ValueError("politique inconnue : %r (attendu %s)" % (policy, ', '.join(map(repr, self.POLITIQUES))))
+        self.policy = policy
+        self.base = univers.step                  # Pas demandé par l'utilisateur
+        pas_max = 4 * self.base if max_step is None else max_step
+        self.max_step = max(self.base, min(pas_max, pasStable(univers)))
+        self.fenetre = fenetre
+        self.saut = saut
+        self.rtf = 1.0
+        self.charge = 0.0
+        self._mesures = deque()                   # (temps réel, temps simulé, calcul cumulé)
+        self._calcul = 0.0
+        self._image = 0
+
+    def mesurer(self, maintenant, t, calcul):
+        """Ajoute une tranche : heure de fin, temps simulé atteint, durée de calcul"""
+        self._calcul += calcul
+        m = self._mesures
+        m.append((maintenant, t, self._calcul))
+        while len(m) > 2 and maintenant - m[1][0] >= self.fenetre:
+            m.popleft()
+        duree = maintenant - m[0][0]
+        if duree > 0:
+            self.rtf = (t - m[0][1]) / duree
+            self.charge = (self._calcul - m[0][2]) / duree
+
+    @property
+    def enRetard(self):
+        return self.rtf < 0.95
+
+    def ajuster(self, univers):
+        """Politique 'coarsen' : nouveau pas de l'univers selon la charge (appelé entre deux tranches)"""
+        if self.policy != 'coarsen' or len(self._mesures) < 2:
+            return
+        pas = univers.step
+        if self.enRetard and pas < self.max_step:
+            pas = min(pas * 1.5, self.max_step)
+        elif pas > self.base and not self.enRetard and self.charge * 1.5 < 0.7:
+            pas = max(pas / 1.5, self.base)
+        if pas != univers.step:
+            univers.step = pas
+            self._mesures.clear()                 # Nouvelle mesure avec le nouveau pas
+
+    def dessiner(self):
+        """Politique 'skip' : faut-il dessiner cette image ?"""
+        self._image += 1
+        if self.policy != 'skip' or not self.enRetard:
+            return True
+        return self._image % self.saut == 0
+
+    def etiquette(self, univers):
+        """Texte affiché à côté du temps"""
+        texte = 'RTF: %.2f' % self.rtf
+        if univers.step != self.base:
+            texte += '  step: %g' % univers.step
+        return texte
+
+
+class BouclePhysique(threading.Thread):
+    """
+    Thread physique de simulateRealTime : pas fixe (univers.step) piloté par un
+    accumulateur de temps réel.
+
+    Le temps réel écoulé est ajouté à l'accumulateur, qui est consommé par pas
+    entiers (simulateSteps). L'accumulateur est plafonné à `max_catch_up` secondes :
+    si la physique est plus lente que le temps réel, le retard au-delà est abandonné
+    (la simulation ralentit au lieu de s'emballer). Les pas sont faits par tranches
+    d'environ une image (1 / univers.gameFPS) de temps simulé, sous `verrou`, et
+    chaque tranche publie un instantané dans `tampon`. Une tranche est aussi limitée
+    à une demi-image de calcul (coût d'un pas mesuré) : le verrou est rendu assez
+    souvent pour que l'affichage ne l'attende pas. Chaque tranche est mesurée par
+    `gouverneur` (Gouverneur), qui peut changer le pas de l'univers.
+    """
+
+    def __init__(self, univers, tampon, verrou, max_catch_up=0.25, gouverneur=None):
+        super().__init__(name='physique-%s' % univers.name, daemon=True)
+        if max_catch_up < univers.step:
+            raise ValueError("max_catch_up doit couvrir au moins un pas de temps")
+        self.univers = univers
+        self.tampon = tampon
+        self.verrou = verrou                      # Partagé avec l'affichage (gameInteraction)
+        self.max_catch_up = max_catch_up
+        self.gouverneur = Gouverneur(univers) if gouverneur is None else gouverneur
+        self.erreur = None                        # Exception du thread, relancée par simulateRealTime
+        self._arret = threading.Event()
+
+    def arreter(self):
+        self._arret.set()
+
+    def run(self):
+        U = self.univers
+        budget = 0.5 / U.gameFPS                  # Durée de calcul maximale d'une tranche
+        cout = 0.0                                # Coût mesuré d'un pas (secondes)
+        accu = 0.0
+        avant = time.perf_counter()
+        try:
+            while not self._arret.is_set():
+                pas = U.step                      # (peut être changé par le gouverneur)
+                tranche = max(1, round(1 / (U.gameFPS * pas)))   # Pas par instantané (environ une image)
+                seuil = min(tranche * pas, self.max_catch_up)
+                maintenant = time.perf_counter()
+                accu = min(accu + (maintenant - avant), self.max_catch_up)
+                avant = maintenant
+                if accu < seuil:
+                    self._arret.wait(seuil - accu)
+                    continue
+                n = min(int(accu / pas), tranche)
+                if cout > 0:
+                    n = max(1, min(n, int(budget / cout)))
+                with self.verrou:
+                    debut = time.perf_counter()
+                    U.simulateSteps(n)
+                    fin = time.perf_counter()
+                    cout = (fin - debut) / n
+                    instantane = Instantane.capturer(U)
+                    self.gouverneur.mesurer(fin, instantane.t, fin - debut)
+                    self.gouverneur.ajuster(U)
+                accu -= n * pas
+                self.tampon.publier(instantane)
+        except BaseException as e:
+            self.erreur = e
@@ -1,26 +1,52 @@
 from random import random,randint
 from vector3D import Vector3D as V3D
 from Particule import Particule
-import pygame
-from pygame.locals import *
 from types import MethodType
 from MoteurCC import MoteurCC
 from Forces import *
 from Barre2D import Barre
+from Historique import Historique
+from SoA import SimulationSoA
+from Generateurs import Generateurs
+from Integrateurs import getIntegrateur, SystemeObjets, dormandPrince
+from Contraintes import resoudre
+import Sauvegarde
 import math
+from copy import deepcopy
+import numpy as np
 
 
 class Univers(object):
-    def __init__(self, name='ici', t0=0, step=0.001, dimensions=(100, 100), game=False, gameDimensions=(1024, 780), fps=60):
+    def __init__(self, name='ici', t0=0, step=0.001, dimensions=(100, 100), game=False, gameDimensions=(1024, 780), fps=60, history=None, engine='objects', integrator='explicit', joints='springs'):
         self.name = name                              # Nom de l'univers
-        self.time = [t0]                              # Temps initial
+        self.history = history                        # Politique d'historique : 'all', 'none', 'every=N', 'last=K'
+        self.time = Historique(t0, policy=history)    # Temps initial (puis un instant par pas)
         self.population = []                          # Liste des particules
         self.bars = []                                # (Optionnel) Liste alternative de barres
         self.motors = []                              # Liste des moteurs
         self.barres = []                              # Liste des barres rigides
-        self.generators = []                          # Liste des forces (générateurs)
+        self.generators = Generateurs()               # Forces (générateurs), indexées par entité visée
+        self._membres = set()                         # Entités de l'univers (cibles des interactions)
         self.step = step                              # Pas de temps de simulation
 
+        if engine not in ('objects', 'soa'):
+            raise ValueError("moteur inconnu : %r (attendu 'objects' ou 'soa')" % (engine,))
+        self.engine = engine                          # 'objects' : une méthode par entité ; 'soa' : tableaux NumPy
+        self._soa = None                              # Moteur SoA, construit au premier pas
+        self._soaPrecedent = None                     # Moteur SoA remplacé (ajout d'entités) : historiques repris
+
+        self.integrator = integrator                  # 'explicit', 'symplectic_euler', 'verlet', 'rk4' ou 'implicit_euler'
+        self._integrateur = getIntegrateur(integrator)
+        self._systeme = None                          # État généralisé (moteur objet), construit au premier pas
+        self._h = None                                # Dernier pas proposé par le pas adaptatif
+        self._horloge = (t0, 0, step)                 # Temps t0 + k * step : (t0, k, step)
+        self._plan = None                             # Méthodes liées du noyau objet (voir _planObjets)
+
+        if joints not in ('springs', 'constraints'):
+            raise ValueError("liaisons inconnues : %r (attendu 'springs' ou 'constraints')" % (joints,))
+        self.joints = joints                          # 'constraints' : liaisons imposées exactement
+        self.contraintes = []                         # Liaisons rigides (voir Contraintes.py)
+
         self.dimensions = dimensions                  # Dimensions logiques de l'univers
 
         self.game = game                              # Mode interactif activé ou non
@@ -31,13 +57,23 @@ class Univers(object):
 
     
     def __str__(self):
-        return 'Univers (%s,%g,%g)' % (self.name, self.time[0], self.step)
+        return 'Univers (%s,%g,%g)' % (self.name, self._horloge[0], self.step)
 
     def __repr__(self):
         return str(self)
     
     def addEntity(self, *entity):
+        if self._soa is not None:                          # Le moteur SoA sera reconstruit au prochain pas,
+            self._soaPrecedent = self._soa                 # en reprenant ses historiques
+        self._soa = None
+        self._systeme = None
+        self._plan = None
         for e in entity:                                   
+            if getattr(e, 'history', 0) is None and self.history is not None:
+                e.setHistory(self.history)                 # L'entité hérite de la politique de l'univers
+
+            self._membres.add(e)
+
             if isinstance(e, Particule):                   # Si c'est une particule
                 self.population.append(e)                  # Ajoute à la liste des particules
 
@@ -50,32 +86,274 @@ class Univers(object):
 
     def addGenerators(self, *members):
         for g in members:                   # Parcourt chaque générateur de force passé en argument
-            self.generators.append(g)      # L'ajoute à la liste des générateurs de l'univers
-
+            if hasattr(g, 'projeter'):
+                self._domaine(g)
+                self.contraintes.append(g)  # Parois (Planes), collisions : imposées après chaque pas
+            elif self.joints == 'constraints' and hasattr(g, 'contrainte'):
+                self.contraintes.append(g.contrainte())  # Liaison : imposée exactement
+            else:
+                self.generators.append(g)  # L'ajoute à la liste des générateurs de l'univers
+
+    def addConstraints(self, *contraintes):
+        """Ajoute des liaisons rigides, imposées après chaque pas (voir Contraintes.py)"""
+        for c in contraintes:
+            self._domaine(c)
+        self.contraintes.extend(contraintes)
+
+    def _domaine(self, c):
+        # Contraintes construites sans domaine (dimensions=None : BoundaryBox, Collisions) : celui de l'univers
+        if getattr(c, 'dimensions', False) is None:
+            c.setDimensions(self.dimensions)
+
+    def _contraindre(self, step):
+        # Projection de l'état sur les liaisons, après le pas non contraint
+        if not self.contraintes:
+            return
+        if self.engine == 'soa':
+            systeme = self._soa
+        else:
+            if self._systeme is None:
+                self._systeme = SystemeObjets(self)
+            systeme = self._systeme
+        resoudre(systeme, self.contraintes, step)
+
+
+    def applyForces(self, impulsions=True):
+        """
+        Applique tous les générateurs aux particules et barres, sans les intégrer.
+        impulsions=False ignore les forces impulsionnelles (rebonds, voir Force.impulsive).
+        """
+        broadcast = self.generators.broadcast
+        parSujet = self.generators.parSujet
+        for source in self.generators.paires:
+            source.applyPair(self._membres)
+        for e in self.population + self.barres:
+            for source in broadcast:
+                if impulsions or not source.impulsive:
+                    source.setForce(e)
+            for source in parSujet.get(e, ()):
+                if impulsions or not source.impulsive:
+                    source.setForce(e)
 
     def simulateAll(self):
-        for p in self.population:                       # Pour chaque particule de l’univers
-            for source in self.generators:              # Applique toutes les forces disponibles
-                source.setForce(p)
-            p.simulate(self.step)                       # Met à jour son état (position, vitesse...)
-
-        for m in self.motors:                           # Pour chaque moteur
-            m.simulate(self.step)                       # Met à jour son état interne
-
-        for b in self.barres:                           # Pour chaque barre
-            for source in self.generators:              # Applique toutes les forces disponibles
-                source.setForce(b)
-            b.simulate(self.step)                       # Met à jour son état (position, angle...)
-
-        self.time.append(self.time[-1] + self.step)     # Avance le temps de la simulation
-
-
-    def simulateFor(self,duration):
-        # On calcule autant de pas que nécessaire pendant duration
-        while duration > 0:
-            self.simulateAll()
-            duration -= self.step
+        """Avance la simulation d'un pas"""
+        self.simulateSteps(1)
+
+    def simulateSteps(self, n):
+        """
+        Avance la simulation de n pas de self.step.
+
+        Les listes d'entités, de générateurs et les méthodes liées sont résolues une
+        fois pour les n pas ; les n instants sont enregistrés en une fois à la fin,
+        calculés par un compteur entier (t0 + k * step) sans cumul d'arrondis.
+        """
+        n = int(n)
+        if n <= 0:
+            return
+        if self.engine == 'soa':
+            pas = self._pasSoA
+        elif self._integrateur is not None:
+            pas = self._pasIntegrateur
+        else:
+            pas = None
+        if pas is None:
+            self._noyauObjets(n)
+        else:
+            for _ in range(n):
+                pas()
+        self._avancerTemps(n)
+
+    def _avancerTemps(self, n):
+        # Enregistre les n instants suivants, t0 + k * step (compteur entier)
+        t0, k, step = self._horloge
+        if step != self.step or t0 + k * step != self.time[-1]:
+            t0, k, step = self.time[-1], 0, self.step           # Pas changé ou temps avancé ailleurs (pas adaptatif)
+        if n == 1:
+            self.time.append(t0 + (k + 1) * step)
+        else:
+            self.time.extend((t0 + step * np.arange(k + 1, k + n + 1)).tolist())
+        self._horloge = (t0, k + n, step)
+
+    def _noyauObjets(self, n):
+        # Moteur objet, intégration historique (Particule.pfd / Barre.pfd) : n pas sans
+        # relire les attributs de l'univers ni les index de générateurs à chaque pas
+        step = self.step
+        membres = self._membres
+        debuts, paires, particules, moteurs, barres = self._planObjets()
+        contraintes = bool(self.contraintes)
+
+        for _ in range(n):
+            for beginStep in debuts:                    # État interne des générateurs (PID...)
+                beginStep()
+            for applyPair in paires:                    # Interactions : une évaluation, +F / -F
+                applyPair(membres)
+            for p, forces, simulate in particules:      # Particules : forces puis position, vitesse...
+                for setForce in forces:
+                    setForce(p)
+                simulate(step)
+            for simulate in moteurs:                    # Moteurs : état interne
+                simulate(step)
+            for b, forces, simulate in barres:          # Barres : forces puis position, angle...
+                for setForce in forces:
+                    setForce(b)
+                simulate(step)
+            if contraintes:
+                self._contraindre(step)                 # Liaisons rigides (joints='constraints')
+
+    def _planObjets(self):
+        # Méthodes liées du noyau objet, recalculées si les générateurs ou les entités changent
+        version = self.generators.version
+        if self._plan is not None and self._plan[0] == version:
+            return self._plan[1]
+        broadcast = list(self.generators.broadcast)     # Forces globales (gravité...)
+        parSujet = self.generators.parSujet             # Forces propres à chaque entité
+
+        def plan(entites):
+            # (entité, forces qui la concernent, intégration) pour chaque entité
+            return [(e, [source.setForce for source in broadcast] +
+                        [source.setForce for source in parSujet.get(e, ())], e.simulate) for e in entites]
+
+        noyau = ([source.beginStep for source in self.generators.etats],
+                 [source.applyPair for source in self.generators.paires], plan(self.population),
+                 [m.simulate for m in self.motors], plan(self.barres))
+        self._plan = (version, noyau)
+        return noyau
+
+    def _debutPas(self):
+        # État interne des générateurs (Force.beginStep) : une mise à jour par pas, quel
+        # que soit le nombre d'évaluations des forces du schéma d'intégration
+        for source in self.generators.etats:
+            source.beginStep()
+
+    def _pasIntegrateur(self):
+        # Schéma d'intégration global : toutes les entités avancent ensemble
+        self._debutPas()
+        if self._systeme is None:
+            self._systeme = SystemeObjets(self)
+        self._integrateur(self._systeme, self.step)
+        self._contraindre(self.step)
+        for m in self.motors:
+            m.simulate(self.step)
+
+    def _moteurSoA(self):
+        # Moteur SoA, (re)construit si besoin : les trajectoires déjà enregistrées
+        # par le moteur précédent sont reprises et prolongées
+        if self._soa is None:
+            self._soa = SimulationSoA(self, self._soaPrecedent)
+            self._soaPrecedent = None
+        return self._soa
+
+    def _pasSoA(self):
+        # Particules et barres intégrées en un seul appel vectorisé (voir SoA.py)
+        self._debutPas()
+        self._moteurSoA()
+        if self._integrateur is None:
+            self._soa.simulate(self.step, self.generators)
+        else:
+            self._integrateur(self._soa, self.step)
+        self._contraindre(self.step)
+
+        for m in self.motors:                           # Les moteurs gardent leur propre intégration
+            m.simulate(self.step)
+
+
+    def simulateFor(self, duration, adaptive=False, rtol=1e-6, atol=1e-6, min_step=None, max_step=None):
+        """
+        Avance la simulation de `duration` secondes.
+
+        Par défaut : pas fixes de self.step. Avec adaptive=True, le pas est choisi par
+        un schéma Dormand-Prince 5(4) à contrôle d'erreur (rtol, atol) entre min_step
+        (self.step / 1000 par défaut) et max_step (duration par défaut) ; le dernier pas
+        est raccourci pour arriver exactement à t + duration. Les forces impulsionnelles
+        (rebonds) sont alors appliquées comme des sauts de vitesse entre deux pas.
+        """
+        if adaptive:
+            self._simulateAdaptive(duration, rtol, atol, min_step, max_step)
+            return
+
+        # Autant de pas entiers que nécessaire pour couvrir duration
+        self.simulateSteps(math.ceil(duration / self.step - 1e-9))
+
+    def _simulateAdaptive(self, duration, rtol, atol, min_step, max_step):
+        if min_step is None:
+            min_step = self.step / 1000
+        if max_step is None:
+            max_step = duration
+        if self.engine == 'soa':
+            systeme = self._moteurSoA()
+        else:
+            if self._systeme is None:
+                self._systeme = SystemeObjets(self)
+            systeme = self._systeme
+        impulsives = [g for g in self.generators if g.impulsive]
+        entites = self.population + self.barres
+
+        def contact():
+            return any(g.touches(e) for g in impulsives for e in entites)
+
+        t = self.time[-1]
+        t_fin = t + duration
+        h = min(self._h or self.step, max_step)
+        systeme.impulsions = False
+        try:
+            while t_fin - t > 1e-12 * max(1.0, abs(t_fin)):
+                reste = t_fin - t
+                dernier = h >= reste                                     # Pas raccourci pour finir à t_fin
+                h_essai = h
+                self._debutPas()                                         # Une fois par pas, essais refusés compris
+                h_fait, h = dormandPrince(systeme, min(h, reste), rtol, atol, min(min_step, reste), max_step,
+                                          contact if impulsives else None)
+                t = t_fin if dernier and h_fait == reste else t + h_fait   # Arrivée exacte
+                self._contraindre(h_fait)
+                if dernier:
+                    h = max(h, h_essai)                                  # Ne pas garder le pas raccourci
+
+                # Les moteurs gardent leur propre intégration, en sous-pas d'au plus self.step
+                n = max(1, math.ceil(h_fait / self.step - 1e-9))
+                for m in self.motors:
+                    for _ in range(n):
+                        m.simulate(h_fait / n)
+                for g in impulsives:
+                    for e in entites:
+                        g.applyImpulse(e)
+                self.time.append(t)
+                self._h = h
+        finally:
+            systeme.impulsions = True
         
+    def fork(self):
+        """
+        Copie indépendante de l'univers, pour essayer plusieurs suites depuis le même état.
+        Entités, moteurs et générateurs sont copiés (état courant seulement) ; les
+        historiques sont partagés avec l'original, en copie à l'écriture (Historique.fork) :
+        le coût ne dépend pas de la durée déjà simulée.
+        """
+        memo = {id(self._systeme): None, id(self._plan): None}   # Caches reconstruits au prochain pas
+        return deepcopy(self, memo)
+
+    def checkpoint(self, path, history=False):
+        """
+        Enregistre l'état courant (entités, moteurs, générateurs à état, temps) dans un
+        fichier binaire versionné ; history=True y ajoute les trajectoires (voir Sauvegarde.py).
+        """
+        Sauvegarde.checkpoint(self, path, history)
+
+    def restore(self, path):
+        """Reprend l'état enregistré par checkpoint (univers construit à l'identique)"""
+        Sauvegarde.restore(self, path)
+
+    def renderOffscreen(self, duration, output, every=1, size=None, label=True, max_queue=8):
+        """
+        Rendu sans fenêtre pour exporter une animation : simule `duration` secondes à
+        pleine vitesse, dessine l'état tous les `every` pas (visuels de gameDraw) dans
+        une surface hors écran et l'écrit depuis un thread : suite de PNG, commande
+        recevant la vidéo brute (ffmpeg...), fichier ou fonction recevant des tableaux
+        NumPy (voir Export.Ecrivain). size : (largeur, hauteur), gameDimensions par
+        défaut. Renvoie le nombre d'images écrites.
+        """
+        from Export import exporter
+        return exporter(self, duration, output, every, size, label, max_queue)
+
     def plot(self):
         from pylab import figure, legend, show          # Import des fonctions pour les tracés matplotlib
 
@@ -95,67 +373,77 @@ class Univers(object):
         # Fonction qui sera surchargée par le client pour définir ses intéractions
         pass
 
-    def simulateRealTime(self):
+    def simulateRealTime(self, max_catch_up=0.25, behind='slow', max_step=None):
+        """
+        Simulation interactive (pygame) : la physique tourne dans un thread à pas fixe
+        (TempsReel.BouclePhysique), l'affichage reste à gameFPS images par seconde.
+
+        Le temps simulé suit le temps réel : un accumulateur est consommé par pas de
+        `step`, plafonné à `max_catch_up` secondes de retard (au-delà, la simulation
+        ralentit). Chaque image dessine l'état interpolé entre les deux derniers
+        instantanés publiés par la physique. gameInteraction est appelé entre deux
+        tranches de pas (sous le verrou de la physique) : il peut modifier l'univers.
+
+        Le facteur temps réel (RTF) est affiché à côté du temps. Quand la physique est
+        en retard, `behind` choisit la réaction (voir TempsReel.Gouverneur) : 'slow'
+        (ralentir le temps simulé), 'coarsen' (augmenter le pas, jusqu'à max_step et
+        dans la limite de stabilité estimée) ou 'skip' (sauter des images).
+        """
         import pygame
+        import threading
+        from TempsReel import Instantane, DoubleTampon, BouclePhysique, Gouverneur
+        from Rendu import Rendu, police
+
+        verrou = threading.Lock()
+        tampon = DoubleTampon(Instantane.capturer(self))
+        gouverneur = Gouverneur(self, behind, max_step)
+        physique = BouclePhysique(self, tampon, verrou, max_catch_up, gouverneur)
+
         pygame.init()
         W, H = self.gameDimensions
         screen = pygame.display.set_mode((W, H))
         clock = pygame.time.Clock()
+        rendu = Rendu(screen, self.scale)             # Grille pré-dessinée, mise à jour incrémentale
+        font_obj = police(12, 'freesansbold.ttf')
+        moteurs = [m for m in self.motors if hasattr(m, 'gameDraw')]
         running = self.game
 
-        while running:
-            screen.fill((255, 255, 255))
-            pygame.event.pump()
-            keys = pygame.key.get_pressed()
-            events = pygame.event.get()
-
-            if keys[pygame.K_ESCAPE]:
-                running = False
+        physique.start()
+        try:
+            while running and physique.erreur is None:
+                pygame.event.pump()
+                keys = pygame.key.get_pressed()
+                events = pygame.event.get()
 
-            for event in events:
-                if event.type == pygame.QUIT:
+                if keys[pygame.K_ESCAPE]:
                     running = False
 
-            self.gameInteraction(events, keys)
-            self.simulateFor(1 / self.gameFPS)
-
-        # === DRAW GRID ===
-            grid_color = (200, 200, 200)  # light gray
-            grid_spacing = 10  # 10 units in simulation space
-            pixel_spacing = int(grid_spacing * self.scale)
-
-            # Vertical lines
-            for x in range(0, W, pixel_spacing):
-                pygame.draw.line(screen, grid_color, (x, 0), (x, H), 1)
-
-            # Horizontal lines
-            for y in range(0, H, pixel_spacing):
-                pygame.draw.line(screen, grid_color, (0, y), (W, y), 1)
-
-        # === DRAW OBJECTS ===
-            for p in self.population:
-                if hasattr(p, 'gameDraw'):
-                    p.gameDraw(self.scale, screen)
-
-            for m in self.motors:
-                if hasattr(m, 'gameDraw'):
-                    m.gameDraw(self.scale, screen)
-            
-            for b in self.barres : 
-                if hasattr(b,'gameDraw'):
-                    b.gameDraw(self.scale,screen)
-
-            # Draw time
-            font_obj = pygame.font.Font('freesansbold.ttf', 12)
-            text_surface_obj = font_obj.render(('time: %.2f' % self.time[-1]), True, 'black', (255, 255, 255))
-            text_rect_obj = text_surface_obj.get_rect()
-            text_rect_obj.topleft = (0, 0)
-            screen.blit(text_surface_obj, text_rect_obj)
-
-            pygame.display.flip()
-            clock.tick(self.gameFPS)
-
-        pygame.quit()
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        running = False
+
+                with verrou:
+                    self.gameInteraction(events, keys)
+                if not gouverneur.dessiner():
+                    clock.tick(self.gameFPS)
+                    continue
+                etat = tampon.etat()
+
+                # Objets dans l'état interpolé, puis temps et facteur temps réel
+                rendu.image()
+                rendu.dessinerEtat(etat, self)
+                rendu.dessiner(moteurs)
+                rendu.blit(font_obj.render('time: %.2f  %s' % (etat.t, gouverneur.etiquette(self)),
+                                           True, 'black', (255, 255, 255)), (0, 0))
+                rendu.afficher()
+                clock.tick(self.gameFPS)
+        finally:
+            physique.arreter()
+            physique.join()
+            self.step = gouverneur.base           # Pas initial rétabli ('coarsen')
+            pygame.quit()
+        if physique.erreur is not None:
+            raise physique.erreur
 
 
 
@@ -10,7 +10,7 @@ import numpy as np
 
 if __name__ == "__main__":
 
-    U = Univers(game=True)
+    U = Univers(game=True, history='none')  # Temps réel : état courant seulement
 
     b1 = Barre(mass=1, p0= V3D(45,40), fix = True)
     b2 = Barre(mass=1, p0=V3D(50,40), t0=np.radians(0))
@@ -0,0 +1,33 @@
+import time
+import pytest
+from Univers_Officiel import Univers
+from Particule import Particule
+from vector3D import Vector3D as V3D
+from Forces import Gravity
+from Balayage import sweep, Echec
+
+
+def construire(n):
+    U = Univers(history='none')
+    U.addEntity(*[Particule(p0=V3D(i, 50, 0)) for i in range(n)])
+    U.addGenerators(Gravity())
+    return U
+
+
+def hauteur(U):
+    return U.population[0].getPosition().y
+
+
+def test_delai_depasse():
+    # Un scénario trop long est arrêté près de son délai et signalé par un Echec
+    debut = time.perf_counter()
+    resultats = sweep(construire, {'n': [1, 1000]}, 1e6, hauteur, workers=1, timeout=0.3)
+    assert time.perf_counter() - debut < 1.5          # 1000 pas de ce scénario : plusieurs secondes
+    assert all(isinstance(r, Echec) for r in resultats)
+    assert resultats[1].params == {'n': 1000}
+
+
+def test_resultats_dans_l_ordre_de_la_grille():
+    resultats = sweep(construire, {'n': [1, 2, 3]}, 0.1, hauteur, workers=1, timeout=30)
+    assert resultats == [pytest.approx(resultats[0])] * 3
+    assert not any(isinstance(r, Echec) for r in resultats)
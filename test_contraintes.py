@@ -0,0 +1,69 @@
+import pytest
+from Univers_Officiel import Univers
+from Particule import Particule
+from Barre2D import Barre
+from vector3D import Vector3D as V3D
+from Forces import Collisions, BoundaryBox, Gravity, Pivot
+
+
+def _choc(**kw):
+    U = Univers(**kw)
+    a = Particule(p0=V3D(10, 50, 0), v0=V3D(5, 0, 0))
+    b = Particule(p0=V3D(14, 50, 0), v0=V3D(-5, 0, 0))
+    U.addEntity(a, b)
+    U.addGenerators(Collisions(radius=1, restitution=1))
+    return U, a, b
+
+
+@pytest.mark.parametrize('engine', ['objects', 'soa'])
+@pytest.mark.parametrize('integrator', ['explicit', 'symplectic_euler', 'verlet', 'rk4', 'implicit_euler'])
+def test_choc_elastique_quel_que_soit_le_schema(engine, integrator):
+    # Les collisions sont résolues une fois par pas accepté : même choc pour tous les schémas
+    U, a, b = _choc(engine=engine, integrator=integrator)
+    U.simulateFor(0.5)
+    assert a.getSpeed().x == pytest.approx(-5)
+    assert b.getSpeed().x == pytest.approx(5)
+    assert (b.getPosition() - a.getPosition()).mod() > 2
+
+
+def test_choc_elastique_pas_adaptatif():
+    U, a, b = _choc()
+    U.simulateFor(0.5, adaptive=True, max_step=0.01)
+    assert a.getSpeed().x == pytest.approx(-5)
+    assert b.getSpeed().x == pytest.approx(5)
+
+
+def test_domaine_de_l_univers():
+    U = Univers(dimensions=(300, 40))
+    c = Collisions()
+    U.addGenerators(c)
+    assert c in U.contraintes
+    assert c.dimensions == (300, 40)
+    assert Collisions(dimensions=(10, 20)).dimensions == (10, 20)
+
+
+@pytest.mark.parametrize('engine', ['objects', 'soa'])
+def test_boite_aux_dimensions_de_l_univers(engine):
+    U = Univers(dimensions=(30, 20), engine=engine)
+    p = Particule(p0=V3D(25, 10, 0), v0=V3D(40, 15, 0))
+    boite = BoundaryBox()
+    U.addEntity(p)
+    U.addGenerators(boite)
+    assert boite.dimensions == (30, 20)
+    U.simulateFor(1)
+    x, y = p.position.array[:, 0], p.position.array[:, 1]
+    assert (0 <= x).all() and (x <= 30).all() and (0 <= y).all() and (y <= 20).all()
+
+
+@pytest.mark.parametrize('engine', ['objects', 'soa'])
+def test_pivot_sur_ancre_hors_univers(engine):
+    # Le point fixe du Pivot n'est pas ajouté à l'univers : il reste une ancre immobile
+    U = Univers(engine=engine, joints='constraints')
+    A = Particule(fix=True, p0=V3D(50, 50, 0))
+    b = Barre(mass=1, p0=V3D(55, 50, 0), t0=0, long=10)
+    U.addEntity(b)
+    U.addGenerators(Gravity(), Pivot(b, A, -1))
+    U.simulateFor(1)
+    assert A.getPosition() == V3D(50, 50, 0)
+    assert (b.getPoint(-1) - A.getPosition()).mod() == pytest.approx(5, abs=1e-6)
+    assert b.getAngle() != 0
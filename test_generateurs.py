@@ -0,0 +1,24 @@
+import pytest
+from Generateurs import Generateurs
+from Forces import Gravity
+
+
+def test_ordre_d_ajout():
+    a, b, c = Gravity(), Gravity(), Gravity()
+    g = Generateurs([a, b, c])
+    assert list(g) == [a, b, c] and len(g) == 3
+    g.remove(b)
+    g.append(b)
+    assert list(g) == [a, c, b]
+
+
+def test_doublon_refuse():
+    a, b = Gravity(), Gravity()
+    g = Generateurs([a, b])
+    with pytest.raises(ValueError):
+        g.append(a)
+    assert list(g) == [a, b]
+    g.remove(a)
+    assert a not in g and list(g.broadcast) == [b]
+    with pytest.raises(ValueError):
+        g.remove(a)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from Historique import Historique, HistoriqueV3D
+from Univers_Officiel import Univers
+from vector3D import Vector3D as V3D
+
+
+@pytest.mark.parametrize('policy', ['all', 'every=3'])
+def test_forks_successifs(policy):
+    # Chaque fork ne fige que la suite enregistrée depuis le précédent : le préfixe reste partagé
+    h = Historique(0.0, policy=policy)
+    ref = Historique(0.0, policy=policy)
+    clones = []
+    for i in range(1, 40):
+        h.append(float(i))
+        ref.append(float(i))
+        if i % 10 == 0:
+            clones.append((h.fork(), ref.array.copy()))
+    premier = h._bases[0]
+    assert all(c._bases[0] is premier for c, _ in clones)
+    assert len(h._bases) == len(clones)
+
+    for c, attendu in clones:
+        c.append(-1.0)
+        assert np.array_equal(c.array[:len(attendu)], attendu)
+    assert np.array_equal(h.array, ref.array)
+    assert h[-1] == 39.0
+
+
+def test_fork_v3d():
+    h = HistoriqueV3D(V3D(0, 0, 0))
+    for i in range(5):
+        h.append(V3D(i, 2 * i, 0))
+    f = h.fork()
+    h.append(V3D(9, 9, 9))
+    g = h.fork()
+    f.append(V3D(-1, -1, -1))
+    assert len(f) == len(g) == 7
+    assert f[5] == V3D(4, 8, 0) and g[5] == V3D(4, 8, 0)
+    assert f[-1] == V3D(-1, -1, -1) and g[-1] == V3D(9, 9, 9)
+
+
+@pytest.mark.parametrize('history', ['all', 'last=2', 'none'])
+def test_str_univers_affiche_t0(history):
+    U = Univers(name='u', t0=1.5, step=0.1, history=history)
+    U.simulateSteps(5)
+    assert str(U) == 'Univers (u,1.5,0.1)'
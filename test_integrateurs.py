@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+import Integrateurs
+from Univers_Officiel import Univers
+from Barre2D import Barre
+from vector3D import Vector3D as V3D
+from Particule import Particule
+from MoteurCC import MoteurCC
+from Forces import (ForceCorrecteur, ForceMoteur, SpringDamperMoteur, Gravity, Pivot, PivotBarre,
+                    SpringDamper, SpringDamperBarre, GlissiereBarreParticule)
+
+
+@pytest.mark.parametrize('engine', ['objects', 'soa'])
+@pytest.mark.parametrize('integrator', ['explicit', 'symplectic_euler', 'verlet', 'rk4'])
+def test_etat_des_generateurs_une_fois_par_pas(engine, integrator):
+    # L'intégrale du PID avance d'un pas par pas, quel que soit le nombre d'étages
+    U = Univers(engine=engine, integrator=integrator)
+    pendule = Barre(mass=1, p0=V3D(50, 40), t0=0.1, fix=True)
+    base = Barre(mass=1, p0=V3D(45, 40))
+    pid = ForceCorrecteur(pendule, base, Ki=1)
+    U.addEntity(base, pendule)
+    U.addGenerators(pid)
+    U.simulateSteps(5)
+    assert pid.integral_error == pytest.approx(0.5)
+
+
+def test_etat_des_generateurs_pas_adaptatif():
+    U = Univers()
+    pendule = Barre(mass=1, p0=V3D(50, 40), t0=0.01, fix=True)
+    base = Barre(mass=1, p0=V3D(45, 40))
+    pid = ForceCorrecteur(pendule, base, Ki=1)
+    U.addEntity(base, pendule)
+    U.addGenerators(pid)
+    U.simulateFor(0.05, adaptive=True)
+    assert pid.integral_error == pytest.approx(0.01 * (len(U.time) - 1))
+
+
+def _moteur(**kw):
+    # Scène de Run_d(w).py : particule reliée à un moteur CC par un ressort
+    U = Univers(**kw)
+    particule = Particule(p0=V3D(40, 50, 0))
+    moteur = MoteurCC(1.0, 0.001, 0.01, 0.01, 0.01, 0.1, p=V3D(50, 50, 0))
+    moteur.setVoltage(100)
+    U.addEntity(particule, moteur)
+    U.addGenerators(ForceMoteur(moteur, particule), SpringDamperMoteur(moteur, particule, k=50, c=1))
+    return U, particule, moteur
+
+
+@pytest.mark.parametrize('engine', ['objects', 'soa'])
+def test_implicite_avec_moteur(engine):
+    U, particule, moteur = _moteur(engine=engine, integrator='implicit_euler', step=0.01)
+    U.simulateFor(2)
+    R, particule_ref, moteur_ref = _moteur(engine=engine)
+    R.simulateFor(2)
+    d = (particule.getPosition() - moteur.p).mod()
+    d_ref = (particule_ref.getPosition() - moteur_ref.p).mod()
+    assert d == pytest.approx(d_ref, rel=0.05)
+
+
+@pytest.mark.parametrize('engine', ['objects', 'soa'])
+def test_jacobiennes_analytiques(engine, monkeypatch):
+    # Les blocs analytiques des ressorts et pivots coïncident avec les différences finies
+    U = Univers(engine=engine, integrator='implicit_euler')
+    A = Particule(fix=True, p0=V3D(50, 80, 0))
+    b1 = Barre(mass=1, p0=V3D(55, 80, 0), t0=0.3, long=10)
+    b2 = Barre(mass=1, p0=V3D(65, 80, 0), t0=-0.4, long=10)
+    b3 = Barre(mass=2, p0=V3D(60, 70, 0), t0=1.2, long=8)
+    P = Particule(p0=V3D(75, 78, 0))
+    moteur = MoteurCC(1.0, 0.001, 0.01, 0.01, 0.01, 0.1, p=V3D(80, 70, 0))
+    U.addEntity(A, P, b1, b2, b3, moteur)
+    U.addGenerators(Gravity(), Pivot(b1, A, -1), PivotBarre(b1, 1, b2, -1), SpringDamper(P, b2, k=200, c=3, l0=4),
+                    SpringDamperBarre(b2, 0.5, b3, -1, k=50, c=2), SpringDamperMoteur(moteur, P, k=80, c=1),
+                    GlissiereBarreParticule(b3, P, k=300, c=5))
+    U.simulateSteps(20)
+
+    systeme = U._moteurSoA() if engine == 'soa' else U._systeme
+    q, v = systeme.getState()
+    systeme.accelerations(q, v)
+    K, C = Integrateurs.jacobiennes(systeme, q, v, dense=True)
+    for cls in (SpringDamper, Pivot, PivotBarre, SpringDamperBarre, SpringDamperMoteur):
+        monkeypatch.setattr(cls, 'ressort', None)
+    K_df, C_df = Integrateurs.jacobiennes(systeme, q, v, dense=True)
+    assert np.allclose(K, K_df, rtol=1e-4, atol=1e-4 * abs(K_df).max())
+    assert np.allclose(C, C_df, rtol=1e-4, atol=1e-4 * abs(C_df).max())
@@ -0,0 +1,39 @@
+import pytest
+from Univers_Officiel import Univers
+from Particule import Particule
+from vector3D import Vector3D as V3D
+from Forces import NBodyForce
+
+
+@pytest.mark.parametrize('engine', ['objects', 'soa'])
+def test_charges_relues_a_chaque_pas(engine):
+    # Une charge modifiée en cours de simulation agit dès le pas suivant
+    U = Univers(engine=engine)
+    a = Particule(p0=V3D(40, 50, 0))
+    b = Particule(p0=V3D(60, 50, 0))
+    a.q = b.q = 1.0
+    U.addEntity(a, b)
+    U.addGenerators(NBodyForce(G=-100, charge='q'))
+    U.simulateSteps(20)
+    assert a.getSpeed().x < 0 < b.getSpeed().x          # Répulsion
+    b.q = 0.0
+    U.simulateSteps(1)
+    va, vb = a.getSpeed(), b.getSpeed()
+    U.simulateSteps(20)
+    assert a.getSpeed() == va and b.getSpeed() == vb    # Plus aucune force
+
+
+def test_masse_modifiee_en_cours_de_simulation():
+    U = Univers()
+    a = Particule(p0=V3D(40, 50, 0))
+    b = Particule(p0=V3D(60, 50, 0))
+    U.addEntity(a, b)
+    U.addGenerators(NBodyForce(G=10))
+    U.simulateSteps(10)
+    v0 = a.getSpeed().x
+    U.simulateSteps(10)
+    dv_leger = a.getSpeed().x - v0
+    b.mass = 1000
+    v1 = a.getSpeed().x
+    U.simulateSteps(10)
+    assert a.getSpeed().x - v1 > 100 * dv_leger
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from Univers_Officiel import Univers
+from Particule import Particule
+from Barre2D import Barre
+from vector3D import Vector3D as V3D
+from Forces import Gravity, Pivot
+
+
+def _scene(**kw):
+    U = Univers(**kw)
+    A = Particule(fix=True, p0=V3D(50, 50, 0))
+    P = Particule(p0=V3D(10, 10, 0), v0=V3D(1, 2, 0))
+    b = Barre(mass=1, p0=V3D(55, 50, 0), t0=0.2, long=10)
+    U.addEntity(A, P, b)
+    U.addGenerators(Gravity(), Pivot(b, A, -1))
+    return U, P, b
+
+
+@pytest.mark.parametrize('engine', ['objects', 'soa'])
+@pytest.mark.parametrize('history', ['all', 'every=3', 'last=4'])
+def test_reprise_avec_historique(engine, history, tmp_path):
+    # Reprise en cours de décimation : la suite enregistrée est celle d'une simulation continue
+    U, P, b = _scene(engine=engine, history=history)
+    U.simulateSteps(10)
+    chemin = tmp_path / 'reprise.npz'
+    U.checkpoint(chemin, history=True)
+    U.simulateSteps(10)
+
+    R, P_r, b_r = _scene(engine=engine, history=history)
+    R.restore(chemin)
+    assert R.time[-1] == pytest.approx(10 * R.step)
+    R.simulateSteps(10)
+
+    assert np.array_equal(R.time.array, U.time.array)
+    assert np.allclose(P_r.position.array, P.position.array)
+    assert np.allclose(b_r.theta.array, b.theta.array)
+    assert R.time[-1] == U.time[-1]
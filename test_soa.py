@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from Univers_Officiel import Univers
+from Particule import Particule
+from vector3D import Vector3D as V3D
+from Forces import Gravity
+
+
+@pytest.mark.parametrize('history', ['all', 'every=3', 'last=5', 'none'])
+def test_ajout_entite_en_cours_de_simulation(history):
+    # Les trajectoires déjà enregistrées survivent à la reconstruction du moteur SoA
+    U = Univers(engine='soa', history=history)
+    A = Particule(p0=V3D(10, 10, 0), v0=V3D(1, 0, 0))
+    U.addEntity(A)
+    U.addGenerators(Gravity())
+    U.simulateSteps(10)
+    B = Particule(p0=V3D(50, 10, 0))
+    U.addEntity(B)
+    U.simulateSteps(10)
+
+    R = Univers(engine='soa', history=history)
+    A_ref = Particule(p0=V3D(10, 10, 0), v0=V3D(1, 0, 0))
+    R.addEntity(A_ref)
+    R.addGenerators(Gravity())
+    R.simulateSteps(20)
+
+    assert np.array_equal(A.position.array, A_ref.position.array)
+    assert np.array_equal(U.time.array, R.time.array)
+    assert len(B.position.array) == len(U.time.array)
+    t_ajout = U.time.array <= 10 * U.step + 1e-12
+    assert np.isnan(B.position.array[t_ajout & (U.time.array < 10 * U.step - 1e-12)]).all()
+    assert np.isfinite(B.position.array[~t_ajout]).all()
+    assert B.getPosition().y > 10                     # B tombe aussi
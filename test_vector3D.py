@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from vector3D import Vector3D as V3D, Vector3DArray
+
+
+def _tableau():
+    return Vector3DArray([V3D(i, 10 * i, -i) for i in range(5)])
+
+
+@pytest.mark.parametrize('i', [2, np.int64(2), np.intp(2), -3])
+def test_indice_entier(i):
+    v = _tableau()[i]
+    assert isinstance(v, V3D) and v == V3D(2, 20, -2)
+
+
+@pytest.mark.parametrize('i', [[0, 2], np.array([0, 2]), np.array([True, False, True, False, False])])
+def test_indices_multiples(i):
+    a = _tableau()[i]
+    assert isinstance(a, Vector3DArray)
+    assert a.toVectors() == [V3D(0, 0, 0), V3D(2, 20, -2)]
+
+
+def test_tranche_est_une_vue():
+    t = _tableau()
+    a = t[1:3]
+    assert isinstance(a, Vector3DArray) and len(a) == 2
+    a[0] = V3D(7, 7, 7)
+    assert t[1] == V3D(7, 7, 7)
+
+
+def test_affectation():
+    t = _tableau()
+    t[np.int64(0)] = V3D(1, 2, 3)
+    assert t[0] == V3D(1, 2, 3)
+    t[np.array([1, 2])] = Vector3DArray([V3D(-1, -1, -1), V3D(-2, -2, -2)])
+    assert t[1] == V3D(-1, -1, -1) and t[2] == V3D(-2, -2, -2)
+    t[t.x > 3] = np.zeros(3)
+    assert t[4] == V3D(0, 0, 0)
+    t[[3]] = V3D(5, 5, 5)
+    assert t[3] == V3D(5, 5, 5)
+
+
+def test_taille_entiere_numpy():
+    assert len(Vector3DArray(np.int64(4))) == 4
+    assert np.array_equal(Vector3DArray(np.int32(2)).data, np.zeros((2, 3)))
@@ -1,5 +1,12 @@
+from math import sqrt
+from numbers import Integral
+
+
 class Vector3D():
     """Classe pour un vecteur 3D (x, y, z)"""
+    # Pas de __dict__ par instance : objet compact, création et accès plus rapides
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x=0, y=0, z=0):
         """Constructeur avec des valeurs par défaut nulles"""
         self.x = x
@@ -24,11 +31,11 @@ class Vector3D():
 
     def __sub__(self, other):
         """Soustraction de deux vecteurs"""
-        return self + (-other)
+        return Vector3D(self.x - other.x, self.y - other.y, self.z - other.z)
 
     def __mul__(self, other):
         """Produit vectoriel entre deux vecteurs (*) ou multiplication par un scalaire"""
-        if type(other) is Vector3D:
+        if isinstance(other, Vector3D):
             # Produit vectoriel
             X = self.y * other.z - self.z * other.y
             Y = self.z * other.x - self.x * other.z
@@ -47,7 +54,7 @@ class Vector3D():
 
     def __pow__(self, other):
         """Produit scalaire entre deux vecteurs (**) ou exponentiation par un scalaire"""
-        if type(other) is Vector3D:
+        if isinstance(other, Vector3D):
             # Produit scalaire
             return (self.x * other.x + self.y * other.y + self.z * other.z)
         else:
@@ -61,15 +68,71 @@ class Vector3D():
         """Exponentiation inverse (scalaire ** vecteur)"""
         return self ** other
 
+    # === Opérateurs en place : modifient le vecteur sans créer de nouvel objet ===
+    # Attention : ne jamais les appliquer à un vecteur partagé (historique, ZERO...)
+
+    def __iadd__(self, other):
+        """Addition en place (v += w)"""
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+
+    def __isub__(self, other):
+        """Soustraction en place (v -= w)"""
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+
+    def __imul__(self, other):
+        """Produit vectoriel en place (v *= w) ou multiplication par un scalaire (v *= s)"""
+        if isinstance(other, Vector3D):
+            X = self.y * other.z - self.z * other.y
+            Y = self.z * other.x - self.x * other.z
+            Z = self.x * other.y - self.y * other.x
+            self.x = X
+            self.y = Y
+            self.z = Z
+        else:
+            self.x = other * self.x
+            self.y = other * self.y
+            self.z = other * self.z
+        return self
+
     def __eq__(self, other):
         """Vérifie si deux vecteurs sont égaux"""
         if not isinstance(other, Vector3D):
             return False
         return self.x == other.x and self.y == other.y and self.z == other.z
 
+    def set(self, x=0, y=0, z=0):
+        """Affecte les trois composantes en place (remise à zéro par défaut)"""
+        self.x = x
+        self.y = y
+        self.z = z
+        return self
+
+    def add_scaled(self, other, s):
+        """Ajoute s * other en place (v += s*w) sans vecteur temporaire"""
+        self.x += s * other.x
+        self.y += s * other.y
+        self.z += s * other.z
+        return self
+
+    def dot(self, other):
+        """Produit scalaire (équivalent à **)"""
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def cross(self, other):
+        """Produit vectoriel (équivalent à * entre deux vecteurs)"""
+        return Vector3D(self.y * other.z - self.z * other.y,
+                        self.z * other.x - self.x * other.z,
+                        self.x * other.y - self.y * other.x)
+
     def mod(self):
         """Norme (magnitude) du vecteur"""
-        return (self ** self) ** .5
+        return sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
 
     def norm(self):
         """Vecteur normalisé"""
@@ -81,10 +144,12 @@ class Vector3D():
 
     def rotZ(self, theta):
         """Rotation du vecteur autour de l'axe Z d'un angle theta"""
-        from numpy import cos, sin
+        from math import cos, sin
 
-        x = cos(theta) * self.x - sin(theta) * self.y
-        y = cos(theta) * self.y + sin(theta) * self.x
+        c = cos(theta)
+        s = sin(theta)
+        x = c * self.x - s * self.y
+        y = c * self.y + s * self.x
 
         self.x = x
         self.y = y
@@ -112,3 +177,207 @@ class Vector3D():
         return Vector3D(self.x, self.y, self.z)
 
 
+class _ConstVector3D(Vector3D):
+    """Vecteur non modifiable, utilisé pour la constante partagée ZERO"""
+    __slots__ = ()
+
+    def __init__(self, x=0, y=0, z=0):
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+        object.__setattr__(self, 'z', z)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Vecteur constant : utiliser .copy() avant de le modifier")
+
+    def __reduce__(self):
+        # pickle / copy renvoient la même instance partagée
+        return 'ZERO'
+
+
+# Vecteur nul partagé (valeur par défaut sans allocation, jamais modifié)
+ZERO = _ConstVector3D()
+Vector3D.ZERO = ZERO
+
+
+class Vector3DArray():
+    """
+    Tableau de N vecteurs 3D stockés dans un seul buffer NumPy contigu (N, 3) en float64.
+    Mêmes opérateurs que Vector3D, appliqués à toutes les lignes en un seul appel NumPy :
+    + et - (addition), * (produit vectoriel ou par un scalaire), ** (produit scalaire).
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data=0):
+        """Construit à partir d'un nombre N (vecteurs nuls), d'un tableau (N, 3) ou d'une liste de Vector3D"""
+        import numpy as np
+        if isinstance(data, Integral):
+            self.data = np.zeros((data, 3))
+        elif isinstance(data, np.ndarray):
+            # Pas de copie si le tableau est déjà en float64 (vue partagée)
+            self.data = data.reshape(-1, 3) if data.dtype == np.float64 else data.astype(np.float64).reshape(-1, 3)
+        else:
+            vecs = list(data)
+            self.data = np.array([(v.x, v.y, v.z) for v in vecs], dtype=np.float64).reshape(len(vecs), 3)
+
+    @classmethod
+    def fromVectors(cls, vecs):
+        """Construit le tableau à partir d'une séquence de Vector3D"""
+        return cls(vecs)
+
+    def toVectors(self):
+        """Retourne la liste des Vector3D correspondants (copies)"""
+        return [Vector3D(x, y, z) for (x, y, z) in self.data.tolist()]
+
+    def __str__(self):
+        return "Vector3DArray(%d)" % len(self.data)
+
+    def __repr__(self):
+        return "Vector3DArray(%r)" % self.data.tolist()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        for (x, y, z) in self.data.tolist():
+            yield Vector3D(x, y, z)
+
+    # === Accès aux éléments ===
+
+    def __getitem__(self, i):
+        """
+        Un entier (int ou entier NumPy) renvoie un Vector3D ; une tranche renvoie une vue
+        Vector3DArray (sans copie), une liste, un tableau d'indices ou un masque booléen
+        un Vector3DArray (copie).
+        """
+        if isinstance(i, Integral) and not isinstance(i, bool):
+            x, y, z = self.data[i].tolist()
+            return Vector3D(x, y, z)
+        return Vector3DArray(self.data[i])
+
+    def __setitem__(self, i, value):
+        """Accepte un Vector3D, un Vector3DArray ou un tableau NumPy compatible"""
+        if isinstance(value, Vector3D):
+            self.data[i] = (value.x, value.y, value.z)
+        elif isinstance(value, Vector3DArray):
+            self.data[i] = value.data
+        else:
+            self.data[i] = value
+
+    @property
+    def x(self):
+        return self.data[:, 0]
+
+    @property
+    def y(self):
+        return self.data[:, 1]
+
+    @property
+    def z(self):
+        return self.data[:, 2]
+
+    # === Opérations vectorisées ===
+
+    @staticmethod
+    def _operand(other):
+        """Convertit l'opérande en tableau NumPy diffusable sur (N, 3)"""
+        if isinstance(other, Vector3DArray):
+            return other.data
+        if isinstance(other, Vector3D):
+            import numpy as np
+            return np.array((other.x, other.y, other.z))
+        return other
+
+    @staticmethod
+    def _scalar(s):
+        """Scalaire ou tableau (N,) de scalaires, diffusé sur les lignes"""
+        import numpy as np
+        s = np.asarray(s, dtype=np.float64)
+        return s[:, None] if s.ndim == 1 else s
+
+    def __add__(self, other):
+        return Vector3DArray(self.data + self._operand(other))
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Vector3DArray(-self.data)
+
+    def __sub__(self, other):
+        return Vector3DArray(self.data - self._operand(other))
+
+    def __rsub__(self, other):
+        return Vector3DArray(self._operand(other) - self.data)
+
+    def __mul__(self, other):
+        """Produit vectoriel ligne à ligne (*) ou multiplication par un (ou N) scalaire(s)"""
+        import numpy as np
+        if isinstance(other, (Vector3D, Vector3DArray)):
+            return Vector3DArray(np.cross(self.data, self._operand(other)))
+        return Vector3DArray(self.data * self._scalar(other))
+
+    def __rmul__(self, other):
+        import numpy as np
+        if isinstance(other, Vector3D):
+            return Vector3DArray(np.cross(self._operand(other), self.data))
+        return Vector3DArray(self.data * self._scalar(other))
+
+    def __pow__(self, other):
+        """Produit scalaire ligne à ligne (**) : renvoie un tableau (N,)"""
+        return (self.data * self._operand(other)).sum(axis=1)
+
+    def __iadd__(self, other):
+        self.data += self._operand(other)
+        return self
+
+    def __isub__(self, other):
+        self.data -= self._operand(other)
+        return self
+
+    def __imul__(self, other):
+        import numpy as np
+        if isinstance(other, (Vector3D, Vector3DArray)):
+            self.data[...] = np.cross(self.data, self._operand(other))
+        else:
+            self.data *= self._scalar(other)
+        return self
+
+    def add_scaled(self, other, s):
+        """Ajoute s * other en place (s scalaire ou tableau (N,))"""
+        self.data += self._scalar(s) * self._operand(other)
+        return self
+
+    def dot(self, other):
+        """Produit scalaire ligne à ligne (équivalent à **)"""
+        return self ** other
+
+    def cross(self, other):
+        """Produit vectoriel ligne à ligne (équivalent à *)"""
+        import numpy as np
+        return Vector3DArray(np.cross(self.data, self._operand(other)))
+
+    def mod(self):
+        """Normes des N vecteurs : tableau (N,)"""
+        import numpy as np
+        return np.sqrt((self.data * self.data).sum(axis=1))
+
+    def norm(self):
+        """Vecteurs normalisés (les vecteurs nuls restent nuls)"""
+        import numpy as np
+        m = self.mod()
+        inv = np.divide(1.0, m, out=np.zeros_like(m), where=m != 0)
+        return Vector3DArray(self.data * inv[:, None])
+
+    def rotZ(self, theta):
+        """Rotation en place autour de l'axe Z d'un angle theta (scalaire ou tableau (N,))"""
+        import numpy as np
+        c = np.cos(theta)
+        s = np.sin(theta)
+        x = c * self.data[:, 0] - s * self.data[:, 1]
+        y = c * self.data[:, 1] + s * self.data[:, 0]
+        self.data[:, 0] = x
+        self.data[:, 1] = y
+        return self
+
+    def copy(self):
+        """Retourne une copie indépendante du tableau"""
+        return Vector3DArray(self.data.copy())